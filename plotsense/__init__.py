@@ -1,5 +1,6 @@
 from plotsense.exceptions import PlotSenseError, PlotSenseAPIError, PlotSenseDataError, PlotSenseConfigError
-from plotsense.visual_suggestion.suggestions import recommender, VisualizationRecommender
+from plotsense.visual_suggestion.suggestions import recommender, arecommender, VisualizationRecommender
+from plotsense.visual_suggestion.batch import recommend_many
 from plotsense.explanations.explanations import explainer, PlotExplainer
 from plotsense.plot_generator.generator import plotgen, PlotGenerator
 
@@ -9,6 +10,8 @@ __all__ = [
     "PlotSenseDataError",
     "PlotSenseConfigError",
     "recommender",
+    "arecommender",
+    "recommend_many",
     "VisualizationRecommender",
     "explainer",
     "PlotExplainer",
@@ -7,10 +7,16 @@ from groq import Groq
 import warnings
 import builtins
 from plotsense.exceptions import PlotSenseAPIError, PlotSenseDataError, PlotSenseConfigError
+from plotsense.ratelimit import RateLimiter, estimate_tokens, get_default_limiter
+from plotsense.resilience import CircuitOpenError, ResilientCaller, get_default_caller
+from plotsense.runtime import PlotSenseRuntime, get_default_runtime
 
 
 load_dotenv()
 
+# Rough token cost of the attached plot image, used for rate limiting
+IMAGE_TOKENS = 1000
+
 
 class PlotExplainer:
     """
@@ -25,7 +31,10 @@ class PlotExplainer:
             api_keys: Optional[Dict[str, str]] = None,
             max_iterations: int = 3,
             interactive: bool = True,
-            timeout: int = 30
+            timeout: int = 30,
+            resilience: Optional[ResilientCaller] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            runtime: Optional[PlotSenseRuntime] = None
     ):
         # Default to empty dict if None
         api_keys = api_keys or {}
@@ -46,6 +55,12 @@ class PlotExplainer:
         self.available_models = []
         # Set max iterations for refinement
         self.max_iterations = max_iterations
+        # Retry policy and per-model circuit breaker shared with the recommender
+        self.resilience = resilience or get_default_caller()
+        # Request/token budgets shared with the recommender
+        self.rate_limiter = rate_limiter or get_default_limiter()
+        # Connection pool shared with the recommender
+        self.runtime = runtime or get_default_runtime()
 
         # Validate API keys and initialize clients
         self._validate_keys()
@@ -86,7 +101,9 @@ class PlotExplainer:
         self.clients = {}
         if self.api_keys.get('groq'):
             try:
-                self.clients['groq'] = Groq(api_key=self.api_keys['groq'])
+                # Retries are handled by self.resilience
+                self.clients['groq'] = Groq(
+                    api_key=self.api_keys['groq'], max_retries=0, http_client=self.runtime.http_client())
             except Exception as e:
                 warnings.warn(f"Could not initialize Groq client: {e}", ImportWarning)
                 raise PlotSenseAPIError(f"Groq client initialization error: {e}")
@@ -150,32 +167,39 @@ class PlotExplainer:
                     'temperature': 0.7
                 }
                 generation_params = {**default_params, **(custom_parameters or {})}
-
-                response = client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": [
-                                {"type": "text", "text": prompt},
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/jpeg;base64,{base64_image}"
+                tokens = estimate_tokens(prompt) + IMAGE_TOKENS + generation_params.get('max_tokens', 0)
+
+                def attempt():
+                    self.rate_limiter.acquire(model, tokens)
+                    return client.chat.completions.create(
+                        model=model,
+                        messages=[
+                            {
+                                "role": "user",
+                                "content": [
+                                    {"type": "text", "text": prompt},
+                                    {
+                                        "type": "image_url",
+                                        "image_url": {
+                                            "url": f"data:image/jpeg;base64,{base64_image}"
+                                        }
                                     }
-                                }
-                            ]
-                        }
-                    ],
-                    **generation_params
-                )
+                                ]
+                            }
+                        ],
+                        **generation_params
+                    )
+
+                response = self.resilience.call(model, attempt)
 
                 return response.choices[0].message.content
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
-            if "503" in str(e):
-                print(f"Groq service temporarily unavailable, retrying... Error: {e}")
-                raise  # This will trigger retry
+            if self.resilience.retry.is_retryable(e):
+                # Retries are exhausted; surface the outage rather than explain it away
+                raise PlotSenseAPIError(f"Groq service unavailable for {model}: {e}") from e
             error_message = f"Model querying error for {model}: {str(e)}"
             warnings.warn(error_message)
             return error_message
@@ -199,7 +223,7 @@ class PlotExplainer:
             current_explanation = None
 
             for iteration in range(self.max_iterations):
-                current_model = self.available_models[iteration % len(self.available_models)]
+                current_model = self._select_model(iteration)
 
                 if current_explanation is None:
                     current_explanation = self._generate_initial_explanation(
@@ -221,6 +245,13 @@ class PlotExplainer:
             if os.path.exists(image_path):
                 os.remove(image_path)
 
+    def _select_model(self, iteration: int) -> str:
+        """Rotate through the available models, skipping any whose circuit breaker is open."""
+        healthy = [m for m in self.available_models if not self.resilience.breaker.is_open(m)]
+        if not healthy:
+            raise PlotSenseAPIError("All models are unavailable (circuit breaker open)")
+        return healthy[iteration % len(healthy)]
+
     def _generate_initial_explanation(
         self,
         model: str,
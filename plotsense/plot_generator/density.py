@@ -0,0 +1,174 @@
+from typing import Optional, Tuple, Union
+import numpy as np
+
+
+NORMALIZATIONS = ("linear", "log", "eq_hist")
+
+# Grid cells along x and y
+DEFAULT_BINS = (400, 300)
+
+# Points binned per pass, which bounds the temporary index arrays
+CHUNK_SIZE = 1_000_000
+
+# Colorbar label per normalization
+_LABELS = {
+    "linear": "Count",
+    "log": "log(1 + count)",
+    "eq_hist": "Count percentile",
+}
+
+Bins = Union[int, Tuple[int, int]]
+
+
+class DensityGrid:
+    """
+    Point counts on a fixed-resolution grid over fixed bounds.
+
+    Points are binned with one vectorized ``bincount`` per chunk, so chunks
+    of a dataset too large for memory (``pd.read_csv(chunksize=...)``,
+    parquet row groups) can be added one at a time. Memory and rendering
+    cost depend on the grid size only, not on the number of points.
+    """
+
+    def __init__(self,
+                 x_range: Tuple[float, float],
+                 y_range: Tuple[float, float],
+                 bins: Bins = DEFAULT_BINS):
+        """
+        Args:
+            x_range: (min, max) of x covered by the grid
+            y_range: (min, max) of y covered by the grid
+            bins: Number of cells along both axes, or (x cells, y cells)
+        """
+        nx, ny = (bins, bins) if isinstance(bins, int) else bins
+        if nx < 1 or ny < 1:
+            raise ValueError("bins must be at least 1")
+        self.x_range = _widen(x_range)
+        self.y_range = _widen(y_range)
+        self.bins = (nx, ny)
+        self.counts = np.zeros((nx, ny), dtype=np.int64)
+        self.total = 0
+
+    @classmethod
+    def from_arrays(cls,
+                    x,
+                    y,
+                    bins: Bins = DEFAULT_BINS,
+                    x_range: Optional[Tuple[float, float]] = None,
+                    y_range: Optional[Tuple[float, float]] = None,
+                    chunk_size: int = CHUNK_SIZE) -> "DensityGrid":
+        """Grid covering the finite points of ``x`` and ``y`` (unless ranges are given), filled from them."""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        finite = np.isfinite(x) & np.isfinite(y)
+        if (x_range is None or y_range is None) and not finite.any():
+            raise ValueError("No finite points to bin")
+        if x_range is None:
+            x_range = (x[finite].min(), x[finite].max())
+        if y_range is None:
+            y_range = (y[finite].min(), y[finite].max())
+
+        grid = cls(x_range, y_range, bins)
+        for start in range(0, len(x), chunk_size):
+            grid.add(x[start:start + chunk_size], y[start:start + chunk_size])
+        return grid
+
+    def add(self, x, y) -> "DensityGrid":
+        """
+        Bin a chunk of points into the grid.
+
+        Points outside the grid bounds or with a missing coordinate are
+        skipped; points on the upper bound fall into the last cell.
+
+        Returns:
+            DensityGrid: self, for chaining
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(x) != len(y):
+            raise ValueError("x and y must have the same length")
+
+        nx, ny = self.bins
+        (x0, x1), (y0, y1) = self.x_range, self.y_range
+        inside = (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+        ix = np.minimum(((x[inside] - x0) * (nx / (x1 - x0))).astype(np.int64), nx - 1)
+        iy = np.minimum(((y[inside] - y0) * (ny / (y1 - y0))).astype(np.int64), ny - 1)
+        self.counts += np.bincount(ix * ny + iy, minlength=nx * ny).reshape(nx, ny)
+        self.total += len(ix)
+        return self
+
+    def merge(self, other: "DensityGrid") -> "DensityGrid":
+        """Add the counts of a grid with the same bounds and bins (e.g. filled by another worker)."""
+        if (other.x_range, other.y_range, other.bins) != (self.x_range, self.y_range, self.bins):
+            raise ValueError("Grids must have the same bounds and bins to merge")
+        self.counts += other.counts
+        self.total += other.total
+        return self
+
+    @property
+    def extent(self) -> Tuple[float, float, float, float]:
+        """Bounds in the order ``imshow(extent=...)`` expects."""
+        return (*self.x_range, *self.y_range)
+
+
+def normalize(counts: np.ndarray, norm: str = "eq_hist") -> np.ndarray:
+    """
+    Map counts to color values; empty cells become NaN so they render transparent.
+
+    Args:
+        counts: Cell counts
+        norm: 'linear', 'log' (log1p of the count) or 'eq_hist' (share of
+            non-empty cells with at most this count, so every color is used
+            by about the same number of cells, however skewed the counts)
+
+    Returns:
+        np.ndarray: Float array with the shape of ``counts``
+    """
+    if norm not in NORMALIZATIONS:
+        raise ValueError(f"Unknown normalization '{norm}'. Use one of {list(NORMALIZATIONS)}")
+    values = np.full(counts.shape, np.nan)
+    occupied = counts > 0
+    if norm == "linear":
+        values[occupied] = counts[occupied]
+    elif norm == "log":
+        values[occupied] = np.log1p(counts[occupied])
+    elif occupied.any():
+        levels, inverse = np.unique(counts[occupied], return_inverse=True)
+        cdf = np.cumsum(np.bincount(inverse, minlength=len(levels))) / occupied.sum()
+        values[occupied] = cdf[inverse]
+    return values
+
+
+def render_density(ax, grid: DensityGrid, norm: str = "eq_hist", colorbar: bool = True, **kwargs):
+    """
+    Draw a density grid on ``ax`` as an image.
+
+    Args:
+        ax: Matplotlib axes
+        grid: Filled density grid
+        norm: Normalization passed to :func:`normalize`
+        colorbar: Add a colorbar labelled with the normalization
+        **kwargs: Additional arguments for ``ax.imshow`` (e.g. ``cmap``)
+
+    Returns:
+        The ``AxesImage``
+    """
+    kwargs.setdefault("cmap", "viridis")
+    kwargs.setdefault("interpolation", "nearest")
+    kwargs.setdefault("aspect", "auto")
+    # Cells are indexed [x, y]; images are [row, column] = [y, x]
+    image = ax.imshow(normalize(grid.counts, norm).T, origin="lower", extent=grid.extent, **kwargs)
+    if colorbar:
+        ax.figure.colorbar(image, ax=ax, label=_LABELS[norm])
+    return image
+
+
+def _widen(bounds: Tuple[float, float]) -> Tuple[float, float]:
+    # A zero-width range (constant column) still needs a cell to put points in
+    low, high = float(bounds[0]), float(bounds[1])
+    if not (np.isfinite(low) and np.isfinite(high)) or high < low:
+        raise ValueError(f"Invalid range {bounds}")
+    if high == low:
+        pad = abs(low) * 0.5 or 0.5
+        return low - pad, high + pad
+    return low, high
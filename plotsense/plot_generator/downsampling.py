@@ -0,0 +1,244 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple, Union
+import numpy as np
+
+
+# Points drawn by a scatter plot before it is downsampled
+DEFAULT_MAX_POINTS = 50_000
+
+# Robust z-score (distance from the median in scaled MADs) above which a
+# point counts as an outlier and is always drawn
+OUTLIER_Z = 3.5
+
+# Largest share of the point budget that may go to outliers
+OUTLIER_SHARE = 0.1
+
+# Cells per axis of the grid used by the "grid" strategy
+GRID_SIZE = 256
+
+# Points from which the median and MAD of the outlier test are estimated
+_ROBUST_SUBSET = 100_000
+
+# sampler(x, y, groups, budget, rng) -> positions of the points to keep.
+# x and y are finite float arrays, groups is an array of non-negative integer
+# codes or None, and at most ``budget`` distinct positions may be returned.
+Sampler = Callable[[np.ndarray, np.ndarray, Optional[np.ndarray], int, np.random.Generator], np.ndarray]
+
+
+@dataclass
+class SamplingInfo:
+    """How a plot's points were reduced; attached to the figure as ``plotsense_sampling``."""
+    strategy: str
+    total_points: int
+    shown_points: int
+    preserved_points: int
+
+    @property
+    def ratio(self) -> float:
+        """Share of the points that is drawn."""
+        return self.shown_points / self.total_points if self.total_points else 1.0
+
+
+def uniform_sample(x: np.ndarray,
+                   y: np.ndarray,
+                   groups: Optional[np.ndarray],
+                   budget: int,
+                   rng: np.random.Generator) -> np.ndarray:
+    """Simple random sample; keeps the overall density of the points."""
+    return rng.choice(len(x), size=min(budget, len(x)), replace=False)
+
+
+def stratified_sample(x: np.ndarray,
+                      y: np.ndarray,
+                      groups: Optional[np.ndarray],
+                      budget: int,
+                      rng: np.random.Generator) -> np.ndarray:
+    """
+    Random sample per group, proportional to group size.
+
+    Every group keeps at least one point, so rare color categories do not
+    vanish from the plot. Falls back to a uniform sample without groups or
+    with more groups than the budget.
+    """
+    if groups is None or len(groups) <= budget:
+        return uniform_sample(x, y, groups, budget, rng)
+    counts = np.bincount(groups)
+    present = counts > 0
+    if present.sum() > budget:
+        return uniform_sample(x, y, groups, budget, rng)
+
+    # One point per group first, the rest of the budget in proportion
+    spare = budget - present.sum()
+    quotas = np.minimum(counts, present + (counts - present) * spare // (len(groups) - present.sum()))
+    return _take_per_key(groups, quotas, rng)
+
+
+def grid_sample(x: np.ndarray,
+                y: np.ndarray,
+                groups: Optional[np.ndarray],
+                budget: int,
+                rng: np.random.Generator) -> np.ndarray:
+    """
+    Thin points on a ``GRID_SIZE`` x ``GRID_SIZE`` grid.
+
+    Each occupied cell keeps up to the same number of points, the largest
+    that fits the budget, so sparse regions are kept whole while dense
+    regions are thinned. This preserves the shape and spread of the cloud
+    rather than its density.
+    """
+    cells = _bin(x, GRID_SIZE) * GRID_SIZE + _bin(y, GRID_SIZE)
+    counts = np.bincount(cells)
+    occupied = counts[counts > 0]
+
+    if len(occupied) >= budget:
+        # Not even one point per cell fits: one per cell, then uniform
+        first = _take_per_key(cells, np.minimum(counts, 1), rng)
+        return rng.choice(first, size=budget, replace=False)
+
+    # Largest per-cell cap whose total stays within the budget
+    low, high = 1, int(occupied.max())
+    while low < high:
+        cap = (low + high + 1) // 2
+        if np.minimum(occupied, cap).sum() <= budget:
+            low = cap
+        else:
+            high = cap - 1
+    return _take_per_key(cells, np.minimum(counts, low), rng)
+
+
+STRATEGIES: Dict[str, Sampler] = {
+    'uniform': uniform_sample,
+    'stratified': stratified_sample,
+    'grid': grid_sample,
+}
+
+
+def downsample(x,
+               y,
+               max_points: int = DEFAULT_MAX_POINTS,
+               strategy: Union[str, Sampler] = 'auto',
+               groups: Optional[np.ndarray] = None,
+               keep_extremes: bool = True,
+               random_state: Optional[int] = 0) -> Tuple[np.ndarray, SamplingInfo]:
+    """
+    Choose at most ``max_points`` of the (x, y) points to draw.
+
+    The minimum and maximum of each axis, and the most extreme outliers (up
+    to ``OUTLIER_SHARE`` of the budget), are always kept, so the axis limits
+    and the points a reader most needs to see survive. The rest of the budget
+    is filled by the strategy. Points with a missing or infinite coordinate
+    are never drawn and are dropped first.
+
+    Args:
+        x: Numeric x coordinates
+        y: Numeric y coordinates
+        max_points: Point budget
+        strategy: 'uniform', 'stratified', 'grid', any other name in
+            ``STRATEGIES``, a sampler function, or 'auto' (stratified when
+            ``groups`` is given, otherwise uniform)
+        groups: Integer group code per point (negative for missing), e.g.
+            from ``pd.factorize`` of a color column
+        keep_extremes: Always keep extremes and outliers
+        random_state: Seed for the sampler, so redraws show the same points
+
+    Returns:
+        Tuple[np.ndarray, SamplingInfo]: Sorted positions of the points to
+        draw, and a summary of the reduction
+    """
+    if max_points < 1:
+        raise ValueError("max_points must be at least 1")
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    sampler, name = _resolve(strategy, groups)
+
+    candidates = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(candidates) <= max_points:
+        return candidates, SamplingInfo(name, len(x), len(candidates), 0)
+
+    preserved = np.empty(0, dtype=np.int64)
+    if keep_extremes:
+        preserved = candidates[_extremes(x[candidates], y[candidates], max_points)]
+    drawable = np.zeros(len(x), dtype=bool)
+    drawable[candidates] = True
+    drawable[preserved] = False
+    rest = np.flatnonzero(drawable)
+
+    codes = None
+    if groups is not None:
+        # Missing groups (-1 from factorize) become their own group 0
+        codes = np.asarray(groups, dtype=np.int64)[rest] + 1
+    rng = np.random.default_rng(random_state)
+    chosen = rest[sampler(x[rest], y[rest], codes, max_points - len(preserved), rng)]
+
+    positions = np.sort(np.concatenate([preserved, chosen]))
+    return positions, SamplingInfo(name, len(x), len(positions), len(preserved))
+
+
+def sampling_info(fig) -> Optional[SamplingInfo]:
+    """The downsampling summary attached to a figure, or None if all points were drawn."""
+    return getattr(fig, 'plotsense_sampling', None)
+
+
+def _resolve(strategy: Union[str, Sampler], groups: Optional[np.ndarray]) -> Tuple[Sampler, str]:
+    if callable(strategy):
+        return strategy, getattr(strategy, '__name__', 'custom')
+    if strategy == 'auto':
+        strategy = 'stratified' if groups is not None else 'uniform'
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown sampling strategy '{strategy}'. "
+                         f"Use 'auto' or one of {sorted(STRATEGIES)}")
+    return STRATEGIES[strategy], strategy
+
+
+def _extremes(x: np.ndarray, y: np.ndarray, budget: int) -> np.ndarray:
+    """Positions of the axis extremes plus the strongest outliers."""
+    keep = [x.argmin(), x.argmax(), y.argmin(), y.argmax()]
+    scores = np.maximum(_robust_z(x), _robust_z(y))
+    outliers = np.flatnonzero(scores > OUTLIER_Z)
+    limit = int(budget * OUTLIER_SHARE)
+    if len(outliers) > limit:
+        outliers = outliers[np.argpartition(scores[outliers], len(outliers) - limit)[len(outliers) - limit:]]
+    return np.unique(np.concatenate([np.asarray(keep, dtype=np.int64), outliers]))[:budget]
+
+
+def _robust_z(values: np.ndarray) -> np.ndarray:
+    # Median and MAD estimated from an evenly strided subset, which is
+    # accurate to well within the outlier threshold and avoids two full
+    # selections over millions of points
+    subset = values[::max(1, len(values) // _ROBUST_SUBSET)]
+    median = np.median(subset)
+    # 1.4826 scales the MAD to the standard deviation of a normal distribution
+    mad = 1.4826 * np.median(np.abs(subset - median))
+    if mad == 0:
+        return np.zeros(len(values))
+    return np.abs(values - median) / mad
+
+
+def _bin(values: np.ndarray, size: int) -> np.ndarray:
+    low, high = values.min(), values.max()
+    if high <= low:
+        return np.zeros(len(values), dtype=np.int64)
+    return np.minimum(((values - low) / (high - low) * size).astype(np.int64), size - 1)
+
+
+def _take_per_key(keys: np.ndarray, quotas: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Sorted positions of ``quotas[key]`` random elements of each key."""
+    counts = np.bincount(keys, minlength=len(quotas))
+    # Only ranking a random pre-selection of about twice each quota keeps the
+    # cost linear; a key ends up short only if a binomial draw falls below
+    # half its mean, and keys at or under their quota are taken whole
+    rates = np.minimum(1.0, (2 * quotas + 16) / np.maximum(counts, 1))
+    candidates = np.flatnonzero(rng.random(len(keys)) < rates[keys])
+    chosen = keys[candidates]
+    return candidates[_rank_within(chosen, rng) < quotas[chosen]]
+
+
+def _rank_within(keys: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Random rank of each element among the elements with the same key."""
+    order = rng.permutation(len(keys))
+    order = order[np.argsort(keys[order], kind='stable')]
+    counts = np.bincount(keys)
+    starts = np.cumsum(counts) - counts
+    ranks = np.empty(len(keys), dtype=np.int64)
+    ranks[order] = np.arange(len(keys)) - np.repeat(starts, counts)
+    return ranks
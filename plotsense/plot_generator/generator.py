@@ -1,7 +1,12 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-from typing import List, Dict, Optional, Union
+from typing import Any, List, Dict, Optional, Tuple, Union
+from plotsense.plot_generator.density import DEFAULT_BINS, Bins, DensityGrid, render_density
+from plotsense.plot_generator.downsampling import DEFAULT_MAX_POINTS, Sampler, SamplingInfo, downsample
+from plotsense.plot_generator.histogram import (
+    CHUNK_SIZE, DEFAULT_BINS as DEFAULT_HIST_BINS, StreamingHistogram, group_counts
+)
 
 
 class PlotGenerator:
@@ -10,29 +15,57 @@ class PlotGenerator:
     It uses matplotlib for plotting and can handle both univariate and bivariate cases.
     """
 
-    def __init__(self, data: pd.DataFrame, suggestions: Optional[pd.DataFrame] = None):
+    def __init__(self,
+                 data: pd.DataFrame,
+                 suggestions: Optional[pd.DataFrame] = None,
+                 max_points: Optional[int] = DEFAULT_MAX_POINTS,
+                 sampling: Union[str, Sampler] = 'auto'):
         """
         Initialize with data and plot suggestions.
 
+        The data is held by reference rather than copied: plot functions
+        only read the columns a suggestion names and never modify the
+        frame, so plotting costs memory for the plotted columns only.
+
         Args:
             data: DataFrame containing the actual data
             suggestions: DataFrame with plot suggestions
+            max_points: Most points a scatter plot draws before it is
+                downsampled (None to always draw every point); can be
+                overridden per plot with a ``max_points`` keyword
+            sampling: Downsampling strategy (see
+                :func:`plotsense.plot_generator.downsampling.downsample`);
+                can be overridden per plot with a ``sampling`` keyword
         """
-        if not isinstance(data, pd.DataFrame):
-            raise TypeError("Data must be a pandas DataFrame")
-        if data.empty:
-            raise ValueError("DataFrame is empty")
-        if not isinstance(suggestions, pd.DataFrame):
-            raise TypeError("Suggestions must be a pandas DataFrame")
-        if suggestions.empty:
-            raise ValueError("Suggestions DataFrame is empty")
-        if 'plot_type' not in suggestions.columns or 'variables' not in suggestions.columns:
-            raise ValueError("Suggestions DataFrame must contain 'plot_type' and 'variables' columns")
+        _validate_data(data)
+        _validate_suggestions(suggestions)
 
-        self.data = data.copy()
+        self.data = data
         self.suggestions = suggestions
+        self.max_points = max_points
+        self.sampling = sampling
         self.plot_functions = self._initialize_plot_functions()
 
+    def update_data(self, data: pd.DataFrame) -> bool:
+        """
+        Point the generator at ``data`` unless it already holds the same frame.
+
+        The check is object identity, which is O(1). In-place edits need no
+        detection: the generator holds the frame by reference and plots its
+        current contents.
+
+        Args:
+            data: DataFrame to plot from now on
+
+        Returns:
+            bool: True if the data changed
+        """
+        if data is self.data:
+            return False
+        _validate_data(data)
+        self.data = data
+        return True
+
     def generate_plot(self, suggestion_index: int, **kwargs) -> plt.Figure:
         """
         Generate a plot based on the suggestion at given index.
@@ -98,10 +131,19 @@ class PlotGenerator:
     def _create_scatter(self, variables: List[str], **kwargs) -> plt.Figure:
         if len(variables) < 2:
             raise ValueError("scatter requires at least 2 variables (x, y)")
+        max_points = kwargs.pop('max_points', self.max_points)
+        sampling = kwargs.pop('sampling', self.sampling)
+        if kwargs.pop('density', False):
+            return self._create_density(variables, **kwargs)
+        positions, sampling_info = self._downsample(variables, max_points, sampling)
+
         fig, ax = plt.subplots()
-        ax.scatter(self.data[variables[0]], self.data[variables[1]], **kwargs)
+        ax.scatter(self._column(variables[0], positions), self._column(variables[1], positions),
+                   **self._per_point(kwargs, positions))
         self._set_labels(ax, variables)
         ax.set_title(f"Scatter: {variables[0]} vs {variables[1]}")
+        if sampling_info is not None:
+            fig.plotsense_sampling = sampling_info
         return fig
 
     def _create_bar(self, variables: List[str], **kwargs) -> plt.Figure:
@@ -193,6 +235,8 @@ class PlotGenerator:
     # ========== Statistical Plot Functions ==========
 
     def _create_hist(self, variables: List[str], **kwargs) -> plt.Figure:
+        if kwargs.pop('streaming', False):
+            return self._create_streaming_hist(variables, **kwargs)
         fig, ax = plt.subplots()
         ax.hist(self.data[variables[0]], **kwargs)
         ax.set_xlabel(variables[0])
@@ -219,6 +263,69 @@ class PlotGenerator:
         ax.set_title(f"Violin plot of {variables[0]}")
         return fig
 
+    def _create_streaming_hist(self,
+                               variables: List[str],
+                               bins: Union[int, List[float]] = DEFAULT_HIST_BINS,
+                               density: bool = False,
+                               **kwargs) -> plt.Figure:
+        """
+        Histogram counted in chunks and drawn from the counts with ``ax.stairs``.
+
+        Used by hist when called with ``streaming=True``. Values are binned
+        ``CHUNK_SIZE`` at a time with ``bincount``, so besides the column only
+        the counts and one chunk of bin indices are held. With a second
+        (categorical) variable every group is counted over the same edges in
+        the same pass, so the groups are directly comparable.
+
+        Args:
+            variables: Numerical column, optionally followed by a grouping column
+            bins: Number of equal-width bins over the column's range, or the bin edges
+            density: Scale each histogram so that its area is 1
+            **kwargs: Additional arguments for ``ax.stairs``
+        """
+        if len(variables) < 1:
+            raise ValueError("Histogram requires at least 1 variable")
+        values = self.data[variables[0]]
+        if isinstance(bins, (int, np.integer)):
+            low, high = values.min(), values.max()
+            if pd.isna(low):
+                raise ValueError(f"No valid data remaining for {variables[0]}")
+            edges = StreamingHistogram.from_range(low, high, bins).edges
+        else:
+            edges = np.asarray(bins, dtype=float)
+
+        fig, ax = plt.subplots(figsize=(12, 8))
+        kwargs.setdefault('fill', True)
+        if len(variables) == 1:
+            hist = StreamingHistogram(edges)
+            for start in range(0, len(values), CHUNK_SIZE):
+                hist.add(values.iloc[start:start + CHUNK_SIZE])
+            hist.plot(ax, density=density, **kwargs)
+            ax.set_title(f"Histogram of {variables[0]}")
+        else:
+            codes, categories = pd.factorize(self.data[variables[1]])
+            counts = np.zeros((len(categories), len(edges) - 1), dtype=np.int64)
+            for start in range(0, len(values), CHUNK_SIZE):
+                stop = start + CHUNK_SIZE
+                counts += group_counts(values.iloc[start:stop], codes[start:stop], len(categories), edges)
+
+            if 'color' not in kwargs and 'colors' not in kwargs:
+                colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
+            else:
+                colors = [kwargs.pop('color')] * len(categories) if 'color' in kwargs else kwargs.pop('colors')
+            kwargs.setdefault('alpha', 0.5)
+
+            for i, cat in enumerate(categories):
+                group = StreamingHistogram(edges)
+                group.counts = counts[i]
+                group.plot(ax, density=density, label=str(cat), color=colors[i % len(colors)], **kwargs)
+            ax.set_title(f"Histogram of {variables[0]} by {variables[1]}")
+            ax.legend()
+
+        ax.set_xlabel(variables[0])
+        ax.set_ylabel('Density' if density else 'Frequency')
+        return fig
+
     # ========== Specialized Plot Functions ==========
 
     def _create_pie(self, variables: List[str], **kwargs) -> plt.Figure:
@@ -229,14 +336,88 @@ class PlotGenerator:
         return fig
 
     def _create_hexbin(self, variables: List[str], **kwargs) -> plt.Figure:
+        if kwargs.pop('density', False):
+            return self._create_density(variables, **kwargs)
         fig, ax = plt.subplots()
         ax.hexbin(self.data[variables[0]], self.data[variables[1]], **kwargs)
         self._set_labels(ax, variables)
         ax.set_title(f"Hexbin: {variables[0]} vs {variables[1]}")
         return fig
 
+    def _create_density(self,
+                        variables: List[str],
+                        density_bins: Bins = DEFAULT_BINS,
+                        density_norm: str = 'eq_hist',
+                        **kwargs) -> plt.Figure:
+        """
+        Rasterized point density of ``variables[1]`` against ``variables[0]``.
+
+        Used by scatter and hexbin when called with ``density=True``: points
+        are counted on a fixed grid in one vectorized pass and drawn as an
+        image, so the cost grows linearly with the rows and the output size
+        depends only on the grid. Further variables (color, size) are not
+        drawn.
+
+        Args:
+            variables: x and y columns
+            density_bins: Grid cells along both axes, or (x cells, y cells)
+            density_norm: 'eq_hist', 'log' or 'linear'
+            **kwargs: Additional arguments for ``ax.imshow``
+        """
+        if len(variables) < 2:
+            raise ValueError("density requires at least 2 variables (x, y)")
+        for var in variables[:2]:
+            if not pd.api.types.is_numeric_dtype(self.data[var]):
+                raise ValueError(f"Variable '{var}' must be numeric")
+
+        grid = DensityGrid.from_arrays(self.data[variables[0]].to_numpy(dtype=float, na_value=np.nan),
+                                       self.data[variables[1]].to_numpy(dtype=float, na_value=np.nan),
+                                       bins=density_bins)
+        fig, ax = plt.subplots()
+        render_density(ax, grid, norm=density_norm, **kwargs)
+        self._set_labels(ax, variables)
+        ax.set_title(f"Density: {variables[0]} vs {variables[1]}")
+        return fig
+
     # ========== Helper Methods ==========
 
+    def _downsample(self,
+                    variables: List[str],
+                    max_points: Optional[int],
+                    sampling: Union[str, Sampler],
+                    groups: Optional[np.ndarray] = None) -> Tuple[Optional[np.ndarray], Optional[SamplingInfo]]:
+        """
+        Rows to draw for a plot of ``variables[0]`` against ``variables[1]``.
+
+        Returns:
+            Positions of the rows to draw and the sampling summary, or
+            (None, None) when every row is drawn: the frame fits the budget,
+            the budget is None, or either axis is not numeric
+        """
+        if max_points is None or len(self.data) <= max_points:
+            return None, None
+        x, y = self.data[variables[0]], self.data[variables[1]]
+        if not (pd.api.types.is_numeric_dtype(x) and pd.api.types.is_numeric_dtype(y)):
+            return None, None
+        return downsample(x.to_numpy(dtype=float, na_value=np.nan),
+                          y.to_numpy(dtype=float, na_value=np.nan),
+                          max_points=max_points, strategy=sampling, groups=groups)
+
+    def _column(self, name: str, positions: Optional[np.ndarray]) -> pd.Series:
+        """A column of the data, restricted to ``positions`` when the plot is downsampled."""
+        column = self.data[name]
+        return column if positions is None else column.iloc[positions]
+
+    def _per_point(self, kwargs: Dict[str, Any], positions: Optional[np.ndarray]) -> Dict[str, Any]:
+        """``kwargs`` with per-point arrays (one value per row, e.g. ``c=`` or ``s=``) restricted to ``positions``."""
+        if positions is None:
+            return kwargs
+        restricted = dict(kwargs)
+        for key, value in kwargs.items():
+            if isinstance(value, (list, np.ndarray, pd.Series, pd.Index)) and len(value) == len(self.data):
+                restricted[key] = value.iloc[positions] if isinstance(value, pd.Series) else np.asarray(value)[positions]
+        return restricted
+
     def _set_labels(self, ax, variables: List[str]):
         """Set labels for x and y axes based on variables."""
         if len(variables) > 0:
@@ -245,6 +426,22 @@ class PlotGenerator:
             ax.set_ylabel(variables[1])
 
 
+def _validate_data(data: pd.DataFrame):
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("Data must be a pandas DataFrame")
+    if data.empty:
+        raise ValueError("DataFrame is empty")
+
+
+def _validate_suggestions(suggestions: pd.DataFrame):
+    if not isinstance(suggestions, pd.DataFrame):
+        raise TypeError("Suggestions must be a pandas DataFrame")
+    if suggestions.empty:
+        raise ValueError("Suggestions DataFrame is empty")
+    if 'plot_type' not in suggestions.columns or 'variables' not in suggestions.columns:
+        raise ValueError("Suggestions DataFrame must contain 'plot_type' and 'variables' columns")
+
+
 class SmartPlotGenerator(PlotGenerator):
     def _create_box(self, variables: List[str], **kwargs) -> plt.Figure:
         """Enhanced boxplot that handles both univariate and bivariate cases with NaN handling."""
@@ -333,6 +530,8 @@ class SmartPlotGenerator(PlotGenerator):
 
     def _create_hist(self, variables: List[str], **kwargs) -> plt.Figure:
         """Enhanced histogram that can handle grouping by a second variable."""
+        if kwargs.pop('streaming', False):
+            return self._create_streaming_hist(variables, **kwargs)
         fig, ax = plt.subplots(figsize=(12, 8))
 
         if len(variables) == 1:
@@ -395,6 +594,13 @@ class SmartPlotGenerator(PlotGenerator):
             - 4 variables: x, y, color, size
         size_scale : float
             Scaling factor for bubble sizes (default: 100)
+        max_points : int, optional
+            Point budget before downsampling (default: the generator's)
+        sampling : str or callable, optional
+            Downsampling strategy (default: the generator's)
+        density : bool, optional
+            Draw a rasterized density of x and y instead of markers
+            (see ``_create_density``)
 
         Returns:
         --------
@@ -410,27 +616,40 @@ class SmartPlotGenerator(PlotGenerator):
             if not np.issubdtype(self.data[var].dtype, np.number):
                 raise ValueError(f"Variable '{var}' must be numeric")
 
+        max_points = kwargs.pop('max_points', self.max_points)
+        sampling = kwargs.pop('sampling', self.sampling)
+        if kwargs.pop('density', False):
+            return self._create_density(variables, **kwargs)
+
+        # Categorical color codes come from the full column, so that
+        # stratified sampling keeps every category and colors do not depend
+        # on which rows were drawn
+        color_codes = None
+        if len(variables) >= 3 and not pd.api.types.is_numeric_dtype(self.data[variables[2]]):
+            color_codes = pd.factorize(self.data[variables[2]])[0]
+
+        positions, sampling_info = self._downsample(variables, max_points, sampling, groups=color_codes)
+
         fig, ax = plt.subplots()
         scatter_params = {
-            'x': self.data[variables[0]],
-            'y': self.data[variables[1]],
+            'x': self._column(variables[0], positions),
+            'y': self._column(variables[1], positions),
         }
 
         # Handle color (3rd variable)
         if len(variables) >= 3:
-            color_data = self.data[variables[2]]
-            if pd.api.types.is_numeric_dtype(color_data):
+            if color_codes is None:
                 # For numeric color data, use continuous colormap
-                scatter_params['c'] = color_data
+                scatter_params['c'] = self._column(variables[2], positions)
                 kwargs.setdefault('cmap', 'viridis')
             else:
                 # For categorical data, convert to numeric codes
-                scatter_params['c'] = pd.factorize(color_data)[0]
+                scatter_params['c'] = color_codes if positions is None else color_codes[positions]
                 kwargs.setdefault('cmap', 'tab10')
 
         # Handle size (4th variable)
         if len(variables) == 4:
-            size_data = self.data[variables[3]]
+            size_data = self._column(variables[3], positions)
             if not pd.api.types.is_numeric_dtype(size_data):
                 raise ValueError(f"Size variable '{variables[3]}' must be numeric")
 
@@ -440,7 +659,7 @@ class SmartPlotGenerator(PlotGenerator):
             scatter_params['s'] = sizes
 
         # Apply any additional kwargs
-        scatter_params.update(kwargs)
+        scatter_params.update(self._per_point(kwargs, positions))
 
         scatter = ax.scatter(**scatter_params)
 
@@ -455,6 +674,8 @@ class SmartPlotGenerator(PlotGenerator):
         if len(variables) == 4:
             title += f" (sized by {variables[3]})"
         ax.set_title(title)
+        if sampling_info is not None:
+            fig.plotsense_sampling = sampling_info
 
         return fig
 
@@ -497,8 +718,13 @@ def plotgen(
     if isinstance(suggestion, pd.Series):
         # Create a temporary single-row suggestions DataFrame
         temp_df = pd.DataFrame([suggestion])
-        # Initialize the plot generator with this single suggestion
-        _plot_generator_instance = SmartPlotGenerator(df, temp_df)
+        # Point the plot generator at this single suggestion, reusing it if it exists
+        if _plot_generator_instance is None:
+            _plot_generator_instance = SmartPlotGenerator(df, temp_df)
+        else:
+            _validate_suggestions(temp_df)
+            _plot_generator_instance.update_data(df)
+            _plot_generator_instance.suggestions = temp_df
 
         # Get the variables from the suggestion
         variables = [v.strip() for v in suggestion['variables'].split(',')]
@@ -530,8 +756,7 @@ def plotgen(
             _plot_generator_instance = SmartPlotGenerator(df, suggestions_df)
         else:
             # Update the data if the generator exists but the data changed
-            if not _plot_generator_instance.data.equals(df):
-                _plot_generator_instance.data = df
+            _plot_generator_instance.update_data(df)
 
         # Get the variables from the suggestion
         suggestion_row = suggestions_df.iloc[suggestion]
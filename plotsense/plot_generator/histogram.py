@@ -0,0 +1,307 @@
+from typing import Callable, Iterable, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+
+
+BINNINGS = ("uniform", "quantile")
+
+# Matplotlib's default number of histogram bins
+DEFAULT_BINS = 10
+
+# Values kept by a quantile sketch
+SKETCH_SIZE = 10_000
+
+# Values binned per pass when a whole in-memory column is histogrammed
+CHUNK_SIZE = 1_000_000
+
+Chunk = Union[pd.DataFrame, pd.Series, np.ndarray, Sequence[float]]
+
+
+class QuantileSketch:
+    """
+    Fixed-size uniform random sample of a stream of values, plus their exact
+    minimum and maximum.
+
+    Each value gets a random key and the ``capacity`` values with the
+    smallest keys are kept, so the sample is uniform over everything added
+    however it was chunked, and two sketches can be merged. Quantiles from
+    10,000 values are within about 1% (in rank) of the true quantiles.
+    """
+
+    def __init__(self, capacity: int = SKETCH_SIZE, random_state: Optional[int] = 0):
+        """
+        Args:
+            capacity: Number of values kept
+            random_state: Seed for the sampling keys
+        """
+        self.capacity = capacity
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._rng = np.random.default_rng(random_state)
+        self._keys = np.empty(0)
+        self._values = np.empty(0)
+
+    def add(self, values) -> "QuantileSketch":
+        """Add a chunk of values; missing and infinite values are ignored."""
+        values = _as_float(values)
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._keep(self._rng.random(len(values)), values)
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add the values sketched by ``other`` (e.g. from another worker)."""
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._keep(other._keys, other._values)
+        return self
+
+    def quantiles(self, q) -> np.ndarray:
+        """Approximate quantiles; 0 and 1 give the exact minimum and maximum."""
+        if self.count == 0:
+            raise ValueError("No values have been added to the sketch")
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        result = np.quantile(self._values, q)
+        result[q <= 0] = self.min
+        result[q >= 1] = self.max
+        return result
+
+    def edges(self, bins: int = DEFAULT_BINS, binning: str = "uniform") -> np.ndarray:
+        """
+        Bin edges spanning the sketched values.
+
+        Args:
+            bins: Number of bins
+            binning: 'uniform' for equal-width bins, or 'quantile' for bins
+                holding about the same number of values (ties can merge
+                bins, so there may be fewer)
+        """
+        if binning not in BINNINGS:
+            raise ValueError(f"Unknown binning '{binning}'. Use one of {list(BINNINGS)}")
+        if self.count == 0:
+            raise ValueError("No values have been added to the sketch")
+        if binning == "quantile":
+            edges = np.unique(self.quantiles(np.linspace(0, 1, bins + 1)))
+            if len(edges) > 1:
+                return edges
+        return _uniform_edges(self.min, self.max, bins)
+
+    def _keep(self, keys: np.ndarray, values: np.ndarray):
+        if len(self._keys) >= self.capacity:
+            # Only keys below the largest kept key can enter the sample
+            entering = keys < self._keys.max()
+            keys, values = keys[entering], values[entering]
+        keys = np.concatenate([self._keys, keys])
+        values = np.concatenate([self._values, values])
+        if len(keys) > self.capacity:
+            kept = np.argpartition(keys, self.capacity - 1)[:self.capacity]
+            keys, values = keys[kept], values[kept]
+        self._keys, self._values = keys, values
+
+
+class StreamingHistogram:
+    """
+    Histogram counts over fixed bin edges, accumulated chunk by chunk.
+
+    Each chunk is assigned to bins with ``searchsorted`` and counted with
+    ``bincount``; only the counts are kept, so columns larger than memory
+    can be histogrammed from ``pd.read_csv(chunksize=...)`` or parquet row
+    groups. Bins follow ``np.histogram``: half-open, except that the last
+    bin includes its right edge.
+    """
+
+    def __init__(self, edges):
+        """
+        Args:
+            edges: Increasing bin edges (bins + 1 values)
+        """
+        edges = np.asarray(edges, dtype=float)
+        if edges.ndim != 1 or len(edges) < 2:
+            raise ValueError("At least two bin edges are required")
+        if not np.all(np.isfinite(edges)) or np.any(np.diff(edges) <= 0):
+            raise ValueError("Bin edges must be finite and strictly increasing")
+        self.edges = edges
+        self.counts = np.zeros(len(edges) - 1, dtype=np.int64)
+        # Values that were missing, or outside the edges
+        self.missing = 0
+        self.outside = 0
+
+    @classmethod
+    def from_range(cls, low: float, high: float, bins: int = DEFAULT_BINS) -> "StreamingHistogram":
+        """Histogram with ``bins`` equal-width bins from ``low`` to ``high``."""
+        return cls(_uniform_edges(low, high, bins))
+
+    @property
+    def total(self) -> int:
+        """Number of values counted in a bin."""
+        return int(self.counts.sum())
+
+    def add(self, values) -> "StreamingHistogram":
+        """
+        Count a chunk of values.
+
+        Returns:
+            StreamingHistogram: self, for chaining
+        """
+        values = _as_float(values)
+        missing = np.isnan(values)
+        self.missing += int(missing.sum())
+        index = bin_index(values[~missing], self.edges)
+        inside = index >= 0
+        self.outside += int(len(index) - inside.sum())
+        self.counts += np.bincount(index[inside], minlength=len(self.counts))
+        return self
+
+    def merge(self, other: "StreamingHistogram") -> "StreamingHistogram":
+        """Add the counts of a histogram with the same edges."""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Histograms must have the same bin edges to merge")
+        self.counts += other.counts
+        self.missing += other.missing
+        self.outside += other.outside
+        return self
+
+    def plot(self, ax, density: bool = False, **kwargs):
+        """
+        Draw the histogram on ``ax`` with ``ax.stairs``.
+
+        Args:
+            ax: Matplotlib axes
+            density: Scale counts so that the area under the histogram is 1
+            **kwargs: Additional arguments for ``ax.stairs`` (filled unless
+                ``fill=False`` is given)
+
+        Returns:
+            The ``StepPatch``
+        """
+        kwargs.setdefault("fill", True)
+        return ax.stairs(_heights(self.counts, self.edges, density), self.edges, **kwargs)
+
+
+def bin_index(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Bin of each value for the given edges, or -1 for values outside them."""
+    index = np.searchsorted(edges, values, side="right") - 1
+    # The last bin is closed on the right
+    index[values == edges[-1]] = len(edges) - 2
+    index[(index < 0) | (index >= len(edges) - 1)] = -1
+    return index
+
+
+def group_counts(values, codes: np.ndarray, n_groups: int, edges: np.ndarray) -> np.ndarray:
+    """
+    Histogram counts per group over shared edges, in one ``bincount``.
+
+    Args:
+        values: Values to count
+        codes: Group code per value (negative values are skipped), e.g.
+            from ``pd.factorize``
+        n_groups: Number of groups
+        edges: Bin edges
+
+    Returns:
+        np.ndarray: Counts of shape (n_groups, bins)
+    """
+    values = _as_float(values)
+    bins = len(edges) - 1
+    index = bin_index(values, edges)
+    counted = (index >= 0) & (codes >= 0) & ~np.isnan(values)
+    flat = np.bincount(codes[counted] * bins + index[counted], minlength=n_groups * bins)
+    return flat.reshape(n_groups, bins)
+
+
+def hist_from_chunks(chunks: Union[Iterable[Chunk], Callable[[], Iterable[Chunk]]],
+                     column: Optional[str] = None,
+                     bins: Union[int, Sequence[float]] = DEFAULT_BINS,
+                     bin_range: Optional[Tuple[float, float]] = None,
+                     binning: str = "uniform",
+                     sketch_size: int = SKETCH_SIZE) -> StreamingHistogram:
+    """
+    Histogram of a column that arrives in chunks.
+
+    With explicit edges (``bins`` as a sequence) or a ``bin_range``, the chunks
+    are read once. Otherwise the edges come from the data: a first pass
+    feeds a :class:`QuantileSketch` and a second pass counts, so ``chunks``
+    must be re-iterable (a list) or a function returning a fresh iterator.
+
+    Args:
+        chunks: DataFrames, Series or arrays, or a function returning an
+            iterator over them, e.g.
+            ``lambda: pd.read_csv(path, usecols=["fare"], chunksize=1_000_000)``
+        column: Column to histogram when the chunks are DataFrames
+        bins: Number of bins, or the bin edges
+        bin_range: (min, max) covered by ``bins`` equal-width bins
+        binning: 'uniform' or 'quantile' edges, when they come from the data
+        sketch_size: Values kept by the sketch that chooses the edges
+
+    Returns:
+        StreamingHistogram: Counts over all chunks
+
+    Example:
+        hist = hist_from_chunks(lambda: pd.read_csv("trips.csv", chunksize=10**6),
+                                column="fare", bins=50)
+        fig, ax = plt.subplots()
+        hist.plot(ax)
+    """
+    if callable(chunks):
+        read = chunks
+    elif iter(chunks) is not chunks:
+        def read():
+            return chunks
+    else:
+        read = None
+
+    if not isinstance(bins, (int, np.integer)):
+        hist = StreamingHistogram(bins)
+    elif bin_range is not None:
+        hist = StreamingHistogram.from_range(bin_range[0], bin_range[1], bins)
+    elif read is None:
+        raise ValueError("Edges cannot be computed from a one-shot iterator; pass bin_range=, "
+                         "explicit bin edges, or a function returning a fresh iterator")
+    else:
+        sketch = QuantileSketch(capacity=sketch_size)
+        for chunk in read():
+            sketch.add(_chunk_values(chunk, column))
+        hist = StreamingHistogram(sketch.edges(bins, binning))
+
+    for chunk in (read() if read is not None else chunks):
+        hist.add(_chunk_values(chunk, column))
+    return hist
+
+
+def _heights(counts: np.ndarray, edges: np.ndarray, density: bool) -> np.ndarray:
+    if not density:
+        return counts
+    total = counts.sum()
+    return counts / (total * np.diff(edges)) if total else np.zeros(len(counts))
+
+
+def _uniform_edges(low: float, high: float, bins: int) -> np.ndarray:
+    if bins < 1:
+        raise ValueError("bins must be at least 1")
+    low, high = float(low), float(high)
+    if not (np.isfinite(low) and np.isfinite(high)) or high < low:
+        raise ValueError(f"Invalid range ({low}, {high})")
+    if high == low:
+        # Same widening as np.histogram for a constant column
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, bins + 1)
+
+
+def _chunk_values(chunk: Chunk, column: Optional[str]) -> np.ndarray:
+    if isinstance(chunk, pd.DataFrame):
+        if column is None:
+            raise ValueError("column is required when the chunks are DataFrames")
+        chunk = chunk[column]
+    return _as_float(chunk)
+
+
+def _as_float(values) -> np.ndarray:
+    if isinstance(values, pd.Series):
+        return values.to_numpy(dtype=float, na_value=np.nan)
+    return np.asarray(values, dtype=float)
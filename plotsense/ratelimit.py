@@ -0,0 +1,172 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of ``text`` (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``rate_per_minute``.
+
+    Reservations are taken immediately and may drive the bucket into debt;
+    the caller is told how long to wait until its reservation is covered.
+    Concurrent callers therefore queue in reservation order instead of
+    racing to retry.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate_per_minute: Sustained refill rate
+            capacity: Largest burst; defaults to one minute's worth
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, amount: float, now: Optional[float] = None) -> float:
+        """Take ``amount`` tokens and return the seconds until they are actually available."""
+        self._refill(time.monotonic() if now is None else now)
+        self.tokens -= amount
+        return max(0.0, -self.tokens / self.rate)
+
+    def refund(self, amount: float, now: Optional[float] = None):
+        """Give back ``amount`` tokens of a reservation that was not used."""
+        self._refill(time.monotonic() if now is None else now)
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """
+    Per-model request and token budgets.
+
+    Each model gets a requests-per-minute bucket and a tokens-per-minute
+    bucket; a call waits for whichever is further in debt. Models without
+    explicit limits use the limiter-wide defaults, and a limit of None means
+    unlimited.
+    """
+
+    def __init__(self,
+                 requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None):
+        """
+        Args:
+            requests_per_minute: Default request budget for every model
+            tokens_per_minute: Default token budget (prompt + completion) for every model
+        """
+        self.defaults = (requests_per_minute, tokens_per_minute)
+        self._limits: Dict[str, Tuple[Optional[float], Optional[float]]] = {}
+        self._buckets: Dict[str, Tuple[Optional[TokenBucket], Optional[TokenBucket]]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self,
+                  model: str,
+                  requests_per_minute: Optional[float] = None,
+                  tokens_per_minute: Optional[float] = None):
+        """Set the budgets of one model, replacing its current buckets."""
+        with self._lock:
+            self._limits[model] = (requests_per_minute, tokens_per_minute)
+            self._buckets.pop(model, None)
+
+    def reserve(self, model: str, tokens: int = 0) -> float:
+        """Reserve one request and ``tokens`` tokens; return the seconds to wait before sending."""
+        with self._lock:
+            request_bucket, token_bucket = self._get_buckets(model)
+            now = time.monotonic()
+            wait = 0.0
+            if request_bucket is not None:
+                wait = max(wait, request_bucket.reserve(1, now))
+            if token_bucket is not None and tokens:
+                wait = max(wait, token_bucket.reserve(tokens, now))
+            return wait
+
+    def release(self, model: str, tokens: int = 0):
+        """Refund a reservation made by :meth:`reserve` for a request that was never sent."""
+        with self._lock:
+            request_bucket, token_bucket = self._get_buckets(model)
+            now = time.monotonic()
+            if request_bucket is not None:
+                request_bucket.refund(1, now)
+            if token_bucket is not None and tokens:
+                token_bucket.refund(tokens, now)
+
+    def acquire(self, model: str, tokens: int = 0, cancelled: Optional[threading.Event] = None) -> float:
+        """
+        Block until the request may be sent. Returns the time waited.
+
+        Args:
+            model: Model the request is for
+            tokens: Tokens the request may use (prompt + completion)
+            cancelled: Event set when the request is no longer wanted (e.g.
+                a losing hedge); the reservation is then refunded and
+                ``concurrent.futures.CancelledError`` raised
+
+        Raises:
+            concurrent.futures.CancelledError: If ``cancelled`` is set before the request may be sent
+        """
+        wait = self.reserve(model, tokens)
+        if cancelled is not None:
+            if cancelled.wait(wait):
+                self.release(model, tokens)
+                raise concurrent.futures.CancelledError()
+        elif wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, model: str, tokens: int = 0) -> float:
+        """Async version of :meth:`acquire`; cancelling the waiting task refunds the reservation."""
+        wait = self.reserve(model, tokens)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.release(model, tokens)
+                raise
+        return wait
+
+    def reset(self):
+        """Refill every bucket."""
+        with self._lock:
+            self._buckets.clear()
+
+    def _get_buckets(self, model: str) -> Tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+        if model not in self._buckets:
+            rpm, tpm = self._limits.get(model, self.defaults)
+            self._buckets[model] = (
+                TokenBucket(rpm) if rpm else None,
+                TokenBucket(tpm) if tpm else None,
+            )
+        return self._buckets[model]
+
+
+_default_limiter: Optional[RateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_default_limiter() -> RateLimiter:
+    """Process-wide limiter shared by every recommender and explainer (unlimited until configured)."""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter()
+        return _default_limiter
+
+
+def set_default_limiter(limiter: Optional[RateLimiter]):
+    """Replace the process-wide limiter (None restores an unlimited default)."""
+    global _default_limiter
+    with _default_lock:
+        _default_limiter = limiter
@@ -0,0 +1,303 @@
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from plotsense.exceptions import PlotSenseAPIError
+
+
+# HTTP statuses worth retrying: request timeout, rate limiting and server errors
+RETRYABLE_STATUSES = (408, 429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(PlotSenseAPIError):
+    """Raised when a model's circuit breaker is open and the call is not attempted."""
+    pass
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status carried by an API error, if any."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait (``Retry-After`` header), if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        parsed = email.utils.parsedate_to_datetime(value) if value else None
+        if parsed is None:
+            return None
+        return max(0.0, parsed.timestamp() - time.time())
+
+
+def is_connection_error(error: Exception) -> bool:
+    """True for network failures and timeouts (the request never got a status)."""
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff for retryable API errors.
+
+    Only errors carrying a retryable HTTP status are retried. Connection
+    errors and timeouts are not: each attempt already waited up to the
+    client timeout, so retrying them would only multiply the stall.
+    """
+
+    def __init__(self,
+                 max_attempts: int = 3,
+                 base_delay: float = 0.5,
+                 max_delay: float = 8.0,
+                 retry_statuses: Tuple[int, ...] = RETRYABLE_STATUSES,
+                 max_retry_after: float = 30.0):
+        """
+        Args:
+            max_attempts: Total attempts per call, including the first one
+            base_delay: Backoff ceiling of the first retry in seconds
+            max_delay: Upper bound of any backoff
+            retry_statuses: HTTP statuses that are retried
+            max_retry_after: Longest ``Retry-After`` that is honoured; larger
+                values fail the call instead of sleeping
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = tuple(retry_statuses)
+        self.max_retry_after = max_retry_after
+
+    def is_retryable(self, error: Exception) -> bool:
+        return error_status(error) in self.retry_statuses
+
+    def delay(self, attempt: int, error: Exception) -> Optional[float]:
+        """
+        Seconds to wait before retrying after the ``attempt``-th failure
+        (1-based), or None if the call should not be retried.
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+
+        requested = retry_after(error)
+        if requested is not None:
+            return requested if requested <= self.max_retry_after else None
+
+        # "Full jitter": uniform in [0, min(cap, base * 2^(attempt - 1))]
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Per-model circuit breaker over a sliding window of outcomes.
+
+    A model's circuit opens once at least ``min_requests`` calls were made in
+    the last ``window`` seconds and the failure rate reaches
+    ``failure_threshold``. While open, calls are refused. After ``cooldown``
+    seconds the circuit is half-open: a single trial call is let through, and
+    its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self,
+                 failure_threshold: float = 0.5,
+                 min_requests: int = 5,
+                 window: float = 60.0,
+                 cooldown: float = 30.0):
+        """
+        Args:
+            failure_threshold: Failure rate (0-1) at which the circuit opens
+            min_requests: Calls needed in the window before the rate is trusted
+            window: Sliding window length in seconds
+            cooldown: Seconds an open circuit waits before a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.window = window
+        self.cooldown = cooldown
+        self._outcomes: Dict[str, deque] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._trial_in_flight: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def state(self, model: str) -> str:
+        with self._lock:
+            return self._state(model, time.monotonic())
+
+    def is_open(self, model: str) -> bool:
+        """True while the model should not receive traffic (does not consume the trial call)."""
+        with self._lock:
+            state = self._state(model, time.monotonic())
+            return state == self.OPEN or (state == self.HALF_OPEN and self._trial_in_flight.get(model, False))
+
+    def allow(self, model: str) -> bool:
+        """Whether a call may proceed; claims the trial call of a half-open circuit."""
+        with self._lock:
+            state = self._state(model, time.monotonic())
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight.get(model, False):
+                self._trial_in_flight[model] = True
+                return True
+            return False
+
+    def record_success(self, model: str):
+        with self._lock:
+            if model in self._opened_at:
+                # Trial call succeeded: close and forget the failures that opened it
+                del self._opened_at[model]
+                self._outcomes.pop(model, None)
+            self._trial_in_flight.pop(model, None)
+            self._record(model, True)
+
+    def record_failure(self, model: str):
+        now = time.monotonic()
+        with self._lock:
+            if model in self._opened_at:
+                # Trial call failed (or a straggler from before opening): stay open
+                self._opened_at[model] = now
+                self._trial_in_flight.pop(model, None)
+                return
+
+            outcomes = self._record(model, False)
+            failures = sum(1 for _, ok in outcomes if not ok)
+            if len(outcomes) >= self.min_requests and failures / len(outcomes) >= self.failure_threshold:
+                self._opened_at[model] = now
+
+    def release(self, model: str):
+        """Give back a half-open trial call without judging the model."""
+        with self._lock:
+            self._trial_in_flight.pop(model, None)
+
+    def reset(self):
+        with self._lock:
+            self._outcomes.clear()
+            self._opened_at.clear()
+            self._trial_in_flight.clear()
+
+    def _state(self, model: str, now: float) -> str:
+        opened_at = self._opened_at.get(model)
+        if opened_at is None:
+            return self.CLOSED
+        return self.HALF_OPEN if now - opened_at >= self.cooldown else self.OPEN
+
+    def _record(self, model: str, ok: bool) -> deque:
+        now = time.monotonic()
+        outcomes = self._outcomes.setdefault(model, deque())
+        outcomes.append((now, ok))
+        while outcomes and now - outcomes[0][0] > self.window:
+            outcomes.popleft()
+        return outcomes
+
+
+class ResilientCaller:
+    """Run API calls through a retry policy and a per-model circuit breaker."""
+
+    def __init__(self,
+                 retry: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 sleep: Optional[Callable[[float], Any]] = None):
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self._sleep = sleep
+
+    def call(self, model: str, func: Callable[[], Any]) -> Any:
+        """
+        Call ``func`` for ``model``, retrying retryable errors.
+
+        Raises:
+            CircuitOpenError: If the model's circuit is open
+            Exception: The last error once retries are exhausted
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self._check_circuit(model)
+            try:
+                result = func()
+            except Exception as e:
+                wait = self._on_failure(model, attempt, e)
+                if wait is None:
+                    raise
+                (self._sleep or time.sleep)(wait)
+                continue
+            self.breaker.record_success(model)
+            return result
+
+    async def acall(self, model: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Async version of :meth:`call`; ``func`` returns a fresh awaitable per attempt."""
+        attempt = 0
+        while True:
+            attempt += 1
+            self._check_circuit(model)
+            try:
+                result = await func()
+            except asyncio.CancelledError:
+                # A cancelled call (timeout, losing hedge) says nothing about
+                # the model, but must not keep a half-open trial claimed
+                self.breaker.release(model)
+                raise
+            except Exception as e:
+                wait = self._on_failure(model, attempt, e)
+                if wait is None:
+                    raise
+                await asyncio.sleep(wait)
+                continue
+            self.breaker.record_success(model)
+            return result
+
+    def _check_circuit(self, model: str):
+        if not self.breaker.allow(model):
+            raise CircuitOpenError(f"Circuit breaker open for {model}")
+
+    def _on_failure(self, model: str, attempt: int, error: Exception) -> Optional[float]:
+        """Record a failed attempt and return the backoff before the next one (None: give up)."""
+        if self.retry.is_retryable(error) or is_connection_error(error):
+            self.breaker.record_failure(model)
+        else:
+            # Client errors (bad request, auth, ...) say nothing about model health
+            self.breaker.release(model)
+        return self.retry.delay(attempt, error)
+
+
+_default_caller: Optional[ResilientCaller] = None
+_default_lock = threading.Lock()
+
+
+def get_default_caller() -> ResilientCaller:
+    """Process-wide caller shared by every recommender and explainer."""
+    global _default_caller
+    with _default_lock:
+        if _default_caller is None:
+            _default_caller = ResilientCaller()
+        return _default_caller
+
+
+def set_default_caller(caller: Optional[ResilientCaller]):
+    """Replace the process-wide caller (None restores a fresh default)."""
+    global _default_caller
+    with _default_lock:
+        _default_caller = caller
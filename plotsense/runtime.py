@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import httpx
+
+
+class PlotSenseRuntime:
+    """
+    Worker threads and HTTP connections shared by PlotSense components.
+
+    Owns one bounded thread pool and one keep-alive ``httpx`` connection
+    pool (plus one async pool per event loop, since async connections are
+    bound to the loop that opened them). Recommenders and explainers pass
+    these to their Groq clients, so repeated calls reuse warm TCP/TLS
+    connections and threads instead of opening new ones. Everything is
+    created on first use.
+    """
+
+    def __init__(self,
+                 max_workers: int = 32,
+                 max_connections: int = 20,
+                 max_keepalive_connections: int = 10,
+                 keepalive_expiry: float = 30.0):
+        """
+        Args:
+            max_workers: Size of the shared thread pool
+            max_connections: Most concurrent connections per HTTP pool
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept open
+        """
+        self.max_workers = max_workers
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._http_client: Optional[httpx.Client] = None
+        self._async_http_clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The shared, bounded thread pool."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="plotsense")
+            return self._executor
+
+    def http_client(self) -> httpx.Client:
+        """The shared keep-alive HTTP client, for ``Groq(http_client=...)``."""
+        with self._lock:
+            if self._http_client is None or self._http_client.is_closed:
+                self._http_client = httpx.Client(limits=self.limits, follow_redirects=True)
+            return self._http_client
+
+    def async_http_client(self) -> httpx.AsyncClient:
+        """The keep-alive async HTTP client of the running event loop, for ``AsyncGroq(http_client=...)``."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_http_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(limits=self.limits, follow_redirects=True)
+                self._async_http_clients[loop] = client
+            return client
+
+    def close(self):
+        """Close the sync connection pool and stop the thread pool without waiting for running calls."""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+                self._http_client = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            # Async clients can only be closed on their own loop; they are
+            # released with it
+            self._async_http_clients = weakref.WeakKeyDictionary()
+
+
+_default_runtime: Optional[PlotSenseRuntime] = None
+_default_lock = threading.Lock()
+
+
+def get_default_runtime() -> PlotSenseRuntime:
+    """Process-wide runtime shared by every recommender and explainer."""
+    global _default_runtime
+    with _default_lock:
+        if _default_runtime is None:
+            _default_runtime = PlotSenseRuntime()
+        return _default_runtime
+
+
+def set_default_runtime(runtime: Optional[PlotSenseRuntime]):
+    """Replace the process-wide runtime (None creates a fresh default on next use)."""
+    global _default_runtime
+    with _default_lock:
+        _default_runtime = runtime
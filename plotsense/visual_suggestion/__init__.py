@@ -1,6 +1,9 @@
-from plotsense.visual_suggestion.suggestions import recommender, VisualizationRecommender
+from plotsense.visual_suggestion.suggestions import recommender, arecommender, VisualizationRecommender
+from plotsense.visual_suggestion.batch import recommend_many
 
 __all__ = [
     "recommender",
+    "arecommender",
+    "recommend_many",
     "VisualizationRecommender",
 ]
@@ -0,0 +1,162 @@
+import hashlib
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+import pandas as pd
+from plotsense.visual_suggestion.cache import LRUCache, ResponseCache
+from plotsense.visual_suggestion.profiling import DataFrameProfile, DataFrameProfiler
+from plotsense.visual_suggestion.suggestions import VisualizationRecommender, _get_recommender_instance
+
+
+# Per-table cache size; each table gets its own so that thousands of tables
+# do not evict each other's profiles while their requests are in flight
+TABLE_CACHE_SIZE = 8
+
+
+def recommend_many(
+    frames: Mapping[str, pd.DataFrame],
+    n: int = 5,
+    api_keys: dict = {},
+    custom_weights: Optional[Dict[str, float]] = None,
+    debug: bool = False,
+    response_cache: Optional[Union[bool, ResponseCache]] = None,
+    profile_sample: Optional[Union[int, float]] = None,
+    profile_stratify: Optional[str] = None,
+    recommender: Optional[VisualizationRecommender] = None,
+    max_concurrency: int = 8,
+    processes: Optional[int] = None
+) -> Iterator[Tuple[str, Union[pd.DataFrame, Exception]]]:
+    """
+    Recommend visualizations for many DataFrames, streaming results as they complete.
+
+    Frames are profiled in parallel worker processes. As each profile
+    arrives its prompt is built and sent to the models, with at most
+    ``max_concurrency`` tables in flight and every model call going through
+    the recommender's rate limiter. Tables whose prompts are identical (same
+    schema and statistics) share one set of model calls; each table is
+    still validated, ranked and supplemented on its own. With a schema
+    index on the recommender, tables matching a stored schema are answered
+    from the index.
+
+    Args:
+        frames: DataFrames to analyze, keyed by table name
+        n: Number of recommendations per table
+        api_keys: Dictionary of API keys (ignored if ``recommender`` is given)
+        custom_weights: Optional dictionary to override default model weights
+        debug: Enable debug output
+        response_cache: Optional ResponseCache (or True for the default
+            on-disk cache) used for LLM responses
+        profile_sample: Optional number (int) or fraction (float) of rows to
+            profile instead of each whole DataFrame
+        profile_stratify: Optional column to stratify the profiling sample by
+        recommender: Recommender to use instead of the package-level one
+        max_concurrency: Most tables waiting on model responses at once
+        processes: Profiling worker processes (None for one per CPU, 0 to
+            profile on the batch's threads instead). Frames are pickled to
+            the workers, so scripts using processes need an
+            ``if __name__ == "__main__":`` guard on platforms that spawn.
+
+    Yields:
+        (table name, recommendations) in completion order. A table that
+        failed yields the exception instead of a DataFrame, so one bad table
+        does not stop the batch.
+    """
+    if recommender is None:
+        recommender = _get_recommender_instance(api_keys, debug, response_cache)
+    weights = custom_weights if custom_weights else recommender.model_weights
+
+    workers = ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="plotsense-batch")
+    profilers = ProcessPoolExecutor(max_workers=processes) if processes != 0 else None
+    # future -> (stage, table name or prompt digest)
+    stages: Dict[Future, Tuple[str, str]] = {}
+    bound: Dict[str, VisualizationRecommender] = {}
+    collections: Dict[str, Future] = {}
+    waiting: Dict[str, List[str]] = {}
+
+    def submit(stage: str, label: str, future: Future):
+        stages[future] = (stage, label)
+
+    def finish(name: str, collected: Future):
+        submit('finish', name, workers.submit(_finish, bound[name], n, weights, collected))
+
+    try:
+        for name, df in frames.items():
+            table = recommender._with_dataframe(
+                df, profile_sample=profile_sample, profile_stratify=profile_stratify)
+            table._profile_cache = LRUCache(maxsize=TABLE_CACHE_SIZE)
+            bound[name] = table
+            pool = profilers or workers
+            submit('profile', name, pool.submit(_profile, table.profiler, df, profile_sample, profile_stratify))
+
+        while stages:
+            done, _ = wait(list(stages), return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, label = stages.pop(future)
+
+                if stage == 'profile':
+                    table = bound[label]
+                    try:
+                        table._profile_cache.set(('profile', table._profile_key()), future.result())
+                        table._prepare_request(n)
+                        if table.offline:
+                            submit('finish', label, workers.submit(table.recommend_visualizations, n))
+                            continue
+                        cached = table._schema_lookup(n, weights)
+                        prompt = table._build_prompt() if cached is None else None
+                    except Exception as e:
+                        del bound[label]
+                        yield label, e
+                        continue
+                    if cached is not None:
+                        del bound[label]
+                        yield label, cached
+                        continue
+
+                    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+                    if digest in collections and collections[digest].done():
+                        finish(label, collections[digest])
+                    elif digest in collections:
+                        waiting[digest].append(label)
+                    else:
+                        collected = workers.submit(table._collect_recommendations, prompt)
+                        collections[digest] = collected
+                        waiting[digest] = [label]
+                        submit('collect', digest, collected)
+
+                elif stage == 'collect':
+                    names = waiting.pop(label)
+                    if debug and len(names) > 1:
+                        print(f"\n[DEBUG] {len(names)} tables shared one prompt: {names}")
+                    for name in names:
+                        finish(name, future)
+
+                else:
+                    del bound[label]
+                    try:
+                        yield label, future.result()
+                    except Exception as e:
+                        yield label, e
+    finally:
+        # Also reached when the caller stops iterating early
+        for future in stages:
+            future.cancel()
+        workers.shutdown(wait=False, cancel_futures=True)
+        if profilers is not None:
+            profilers.shutdown(wait=False, cancel_futures=True)
+
+
+def _profile(profiler: DataFrameProfiler,
+             df: pd.DataFrame,
+             sample: Optional[Union[int, float]],
+             stratify: Optional[str]) -> DataFrameProfile:
+    # Module level so that it can run in a worker process
+    return profiler.profile(df, sample=sample, stratify=stratify)
+
+
+def _finish(table: VisualizationRecommender,
+            n: int,
+            weights: Dict[str, float],
+            collected: Future) -> pd.DataFrame:
+    responses, dropped = collected.result()
+    results = table._finish_recommendations(n, weights, responses, dropped)
+    table._schema_store(results)
+    return results
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "plotsense")
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache of LLM responses.
+
+    Entries are keyed on the model, a hash of the prompt and the generation
+    parameters (temperature, max_tokens, ...). Entries older than ``ttl``
+    seconds are treated as misses, and once the cache holds more than
+    ``max_entries`` rows the least recently used ones are evicted.
+    """
+
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 ttl: Optional[float] = 7 * 24 * 3600,
+                 max_entries: int = 10_000):
+        """
+        Args:
+            cache_dir: Directory holding the cache database. Defaults to
+                ``$PLOTSENSE_CACHE_DIR`` or ``~/.cache/plotsense``.
+            ttl: Time-to-live of an entry in seconds (None to never expire)
+            max_entries: Maximum number of cached responses
+        """
+        self.cache_dir = cache_dir or os.getenv("PLOTSENSE_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.path = os.path.join(self.cache_dir, "responses.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " model TEXT NOT NULL,"
+                " prompt_hash TEXT NOT NULL,"
+                " params TEXT NOT NULL,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+
+    @staticmethod
+    def make_key(model: str, prompt: str, **params) -> str:
+        """Stable cache key for a model, prompt and generation parameters."""
+        payload = json.dumps(
+            {"model": model, "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(), "params": params},
+            sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, model: str, prompt: str, **params) -> Optional[str]:
+        """Return the cached response, or None on a miss."""
+        key = self.make_key(model, prompt, **params)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, model: str, prompt: str, response: str, **params):
+        """Store a response and evict least recently used entries over the size cap."""
+        key = self.make_key(model, prompt, **params)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, model, prompt_hash, params, response, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+                 json.dumps(params, sort_keys=True, default=str), response, now, now))
+            overflow = self._count() - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN"
+                    " (SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)", (overflow,))
+
+    def clear(self):
+        """Remove every cached response and reset the counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current number of entries."""
+        with self._lock:
+            entries = self._count()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class LRUCache:
+    """Small thread-safe in-memory LRU mapping."""
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,149 @@
+import warnings
+from typing import List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+# Columns per block of the blocked correlation product
+DEFAULT_BLOCK_SIZE = 256
+
+CorrelationPair = Tuple[str, str, float]
+
+
+def top_correlation_pairs(corr: Optional[pd.DataFrame], k: int) -> List[CorrelationPair]:
+    """The ``k`` strongest absolute correlations of a dense matrix as (a, b, r) triples."""
+    if corr is None or k <= 0 or len(corr) < 2:
+        return []
+    values = corr.to_numpy(dtype=np.float64)
+    rows, cols = np.triu_indices(len(values), k=1)
+    strength = np.nan_to_num(np.abs(values[rows, cols]), nan=-1.0)
+    best = _top_indices(strength, k)
+    names = corr.columns
+    return [(names[rows[i]], names[cols[i]], float(values[rows[i], cols[i]]))
+            for i in best if strength[i] >= 0]
+
+
+def top_correlations(df: pd.DataFrame,
+                     k: int = 20,
+                     block_size: int = DEFAULT_BLOCK_SIZE) -> List[CorrelationPair]:
+    """
+    The ``k`` strongest absolute Pearson correlations between numeric columns.
+
+    Columns are standardized once into a ``rows x cols`` float32 matrix (half
+    the size of a float64 copy of the frame) and multiplied block by block,
+    so beyond that matrix only one ``block_size x cols`` block of
+    correlations and a running top-k (by partial sort) are held, never the
+    dense ``cols x cols`` matrix. Missing values are mean-imputed,
+    which approximates pandas' pairwise-complete correlation; constant
+    columns are skipped.
+
+    Args:
+        df: Numeric columns to correlate (pass a row sample to bound cost)
+        k: Number of pairs to return
+        block_size: Columns per block of the product
+
+    Returns:
+        List of (column_a, column_b, r) sorted by decreasing ``|r|``
+    """
+    if k <= 0 or df.shape[1] < 2 or len(df) < 2:
+        return []
+
+    z, names = _standardize(df)
+    n_cols = z.shape[1]
+    if n_cols < 2:
+        return []
+
+    best_rows = np.empty(0, dtype=np.int64)
+    best_cols = np.empty(0, dtype=np.int64)
+    best_vals = np.empty(0, dtype=np.float32)
+
+    for start in range(0, n_cols, block_size):
+        stop = min(start + block_size, n_cols)
+        # Correlations of this block against itself and every later column
+        block = z[:, start:stop].T @ z[:, start:]
+        local_rows, local_cols = np.nonzero(
+            np.arange(start, n_cols)[None, :] > np.arange(start, stop)[:, None])
+        values = block[local_rows, local_cols]
+
+        keep = _top_indices(np.abs(values), k)
+        best_rows = np.concatenate([best_rows, local_rows[keep] + start])
+        best_cols = np.concatenate([best_cols, local_cols[keep] + start])
+        best_vals = np.concatenate([best_vals, values[keep]])
+
+        keep = _top_indices(np.abs(best_vals), k)
+        best_rows, best_cols, best_vals = best_rows[keep], best_cols[keep], best_vals[keep]
+
+    return [(names[a], names[b], float(np.clip(r, -1.0, 1.0)))
+            for a, b, r in zip(best_rows, best_cols, best_vals)]
+
+
+def top_correlations_involving(df: pd.DataFrame,
+                               columns: List[str],
+                               k: int = 20,
+                               block_size: int = DEFAULT_BLOCK_SIZE) -> List[CorrelationPair]:
+    """
+    Like :func:`top_correlations`, restricted to pairs with at least one of ``columns``.
+
+    Only ``len(columns)`` rows of the correlation matrix are computed, so
+    adding a few columns to a wide frame costs ``rows x cols x len(columns)``
+    instead of a full recomputation.
+    """
+    if k <= 0 or df.shape[1] < 2 or len(df) < 2:
+        return []
+
+    z, names = _standardize(df)
+    position = {name: i for i, name in enumerate(names)}
+    targets = sorted({position[c] for c in columns if c in position})
+    if not targets or len(names) < 2:
+        return []
+    is_target = np.zeros(len(names), dtype=bool)
+    is_target[targets] = True
+
+    best_rows = np.empty(0, dtype=np.int64)
+    best_cols = np.empty(0, dtype=np.int64)
+    best_vals = np.empty(0, dtype=np.float32)
+
+    for start in range(0, len(targets), block_size):
+        rows = np.asarray(targets[start:start + block_size])
+        block = z[:, rows].T @ z
+        local_rows, cols = np.divmod(np.arange(block.size), block.shape[1])
+        # Each pair once: skip the diagonal and, among two targets, keep a < b
+        keep_pair = (cols != rows[local_rows]) & (~is_target[cols] | (rows[local_rows] < cols))
+        local_rows, cols = local_rows[keep_pair], cols[keep_pair]
+        values = block[local_rows, cols]
+
+        keep = _top_indices(np.abs(values), k)
+        best_rows = np.concatenate([best_rows, rows[local_rows[keep]]])
+        best_cols = np.concatenate([best_cols, cols[keep]])
+        best_vals = np.concatenate([best_vals, values[keep]])
+
+        keep = _top_indices(np.abs(best_vals), k)
+        best_rows, best_cols, best_vals = best_rows[keep], best_cols[keep], best_vals[keep]
+
+    return [(names[min(a, b)], names[max(a, b)], float(np.clip(r, -1.0, 1.0)))
+            for a, b, r in zip(best_rows, best_cols, best_vals)]
+
+
+def _standardize(df: pd.DataFrame) -> Tuple[np.ndarray, List[str]]:
+    """float32 z-scores scaled by 1/sqrt(n), so ``z.T @ z`` is the correlation matrix."""
+    x = df.to_numpy(dtype=np.float32, na_value=np.nan)
+    with warnings.catch_warnings(), np.errstate(invalid="ignore"):
+        # All-missing columns come out as NaN and are dropped below
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(x, axis=0)
+        std = np.nanstd(x, axis=0)
+    usable = np.isfinite(std) & (std > 0)
+    x, mean, std = x[:, usable], mean[usable], std[usable]
+
+    z = (x - mean) / (std * np.float32(np.sqrt(len(x))))
+    np.nan_to_num(z, copy=False, nan=0.0)
+    return z, list(df.columns[usable])
+
+
+def _top_indices(strength: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest values, largest first, via a partial sort."""
+    if len(strength) == 0:
+        return np.empty(0, dtype=np.int64)
+    k = min(k, len(strength))
+    best = np.argpartition(-strength, k - 1)[:k]
+    return best[np.argsort(-strength[best], kind="stable")]
@@ -0,0 +1,165 @@
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory latency histogram with log-spaced buckets.
+
+    Buckets span ``min_latency`` to ``max_latency`` seconds; quantiles are
+    reported as the upper edge of the bucket they fall in.
+    """
+
+    def __init__(self,
+                 min_latency: float = 0.01,
+                 max_latency: float = 120.0,
+                 n_buckets: int = 64):
+        self.edges = np.geomspace(min_latency, max_latency, n_buckets)
+        self.counts = np.zeros(n_buckets + 1, dtype=np.int64)
+        self.total = 0
+
+    def record(self, seconds: float):
+        self.counts[np.searchsorted(self.edges, seconds)] += 1
+        self.total += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Latency below which a fraction ``q`` of observations fall, or None if empty."""
+        if self.total == 0:
+            return None
+        bucket = int(np.searchsorted(np.cumsum(self.counts), q * self.total))
+        return float(self.edges[min(bucket, len(self.edges) - 1)])
+
+
+class LatencyTracker:
+    """Thread-safe per-model latency histograms."""
+
+    def __init__(self, min_samples: int = 5):
+        """
+        Args:
+            min_samples: Observations needed before a model's quantiles are trusted
+        """
+        self.min_samples = min_samples
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float):
+        with self._lock:
+            self._histograms.setdefault(model, LatencyHistogram()).record(seconds)
+
+    def quantile(self, model: str, q: float, default: Optional[float] = None) -> Optional[float]:
+        """``q``-quantile latency of ``model``, or ``default`` until enough samples exist."""
+        with self._lock:
+            histogram = self._histograms.get(model)
+            if histogram is None or histogram.total < self.min_samples:
+                return default
+            return histogram.quantile(q)
+
+    def count(self, model: str) -> int:
+        with self._lock:
+            histogram = self._histograms.get(model)
+            return histogram.total if histogram is not None else 0
+
+
+class ModelSlots:
+    """
+    Bookkeeping for one prompt fanned out to several models.
+
+    Each model is a slot that may have more than one request in flight (the
+    primary plus a hedge). The first request to return a non-empty parse
+    resolves the slot; an empty parse or an error only resolves it once no
+    other request for that slot is outstanding.
+    """
+
+    def __init__(self, models: Iterable[str]):
+        self.models = list(models)
+        self.responses: Dict[str, List[Dict]] = {}
+        self.dropped: Dict[str, str] = {}
+        self.errors: Dict[str, Exception] = {}
+        self.started: Dict[str, float] = {}
+        self.hedged = set()
+        self._outstanding = {model: 0 for model in self.models}
+        self._empty = set()
+
+    @property
+    def unresolved(self) -> List[str]:
+        return [m for m in self.models if m not in self.responses and m not in self.dropped]
+
+    def launched(self, model: str, hedge: bool = False):
+        self._outstanding[model] += 1
+        if hedge:
+            self.hedged.add(model)
+        else:
+            self.started[model] = time.monotonic()
+
+    def completed(self,
+                  model: str,
+                  recommendations: Optional[List[Dict]] = None,
+                  error: Optional[Exception] = None) -> bool:
+        """Record a finished request. Returns True if this resolved the slot."""
+        self._outstanding[model] -= 1
+        if model in self.responses or model in self.dropped:
+            return False
+
+        if error is None and recommendations:
+            self.responses[model] = recommendations
+            return True
+
+        if error is None:
+            self._empty.add(model)
+        else:
+            self.errors[model] = error
+
+        if self._outstanding[model] == 0:
+            self._finish(model)
+            return True
+        return False
+
+    def substituted(self,
+                    model: str,
+                    source: str,
+                    recommendations: Optional[List[Dict]] = None,
+                    error: Optional[Exception] = None) -> List[str]:
+        """
+        Record a hedge for ``model`` that was sent to another model, ``source``.
+
+        A non-empty answer is credited to ``source``, or discarded if
+        ``source`` has already answered, so no model is counted twice; either
+        way ``model`` is dropped rather than waited for. An error or an empty
+        answer counts as a failed request for ``model``.
+
+        Returns:
+            The slots this resolved
+        """
+        if error is not None or not recommendations:
+            return [model] if self.completed(model, recommendations, error) else []
+
+        self._outstanding[model] -= 1
+        if model in self.responses or model in self.dropped:
+            return []
+        self.dropped[model] = f"replaced by a hedge to {source}"
+        if self.responses.get(source):
+            return [model]
+        self.dropped.pop(source, None)
+        self.errors.pop(source, None)
+        self.responses[source] = recommendations
+        return [model, source]
+
+    def skip(self, model: str, reason: str):
+        """Drop a model without sending it a request."""
+        self.dropped[model] = reason
+
+    def expire(self, reason: str):
+        """Resolve every open slot, e.g. when the deadline passes."""
+        for model in self.unresolved:
+            self._finish(model, reason)
+
+    def _finish(self, model: str, reason: Optional[str] = None):
+        if model in self._empty:
+            self.responses[model] = []
+        elif reason is not None:
+            self.dropped[model] = reason
+        else:
+            error = self.errors[model]
+            self.dropped[model] = str(error) or type(error).__name__
@@ -0,0 +1,160 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+import pandas as pd
+from plotsense.visual_suggestion.profiling import DataFrameProfile
+from plotsense.visual_suggestion.prompting import column_informativeness
+
+
+# Source label used in ``source_models`` for rule-based recommendations
+HEURISTIC_SOURCE = "heuristic"
+
+OUTPUT_COLUMNS = ['plot_type', 'variables', 'ensemble_score', 'model_agreement', 'source_models']
+
+
+class HeuristicRecommender:
+    """
+    Deterministic, rule-based visualization recommendations.
+
+    Candidates are derived from a :class:`DataFrameProfile` alone, so they
+    cost no API call: line charts for datetime + numerical columns,
+    scatter/hexbin for strongly correlated numerical pairs, boxplot/bar for
+    numerical-by-categorical groupings, pie for small categoricals and
+    hist/boxplot for single numerical columns. Each rule has a fixed prior
+    score, discounted for each earlier pick of the same plot type; columns are
+    tried in order of informativeness.
+    """
+
+    # Prior score of each rule, used as the ensemble_score of its candidates
+    RULE_SCORES = {
+        'line': 0.9,
+        'scatter': 0.85,
+        'hexbin': 0.85,
+        'boxplot_grouped': 0.75,
+        'bar': 0.7,
+        'hist': 0.65,
+        'pie': 0.55,
+        'boxplot': 0.5,
+    }
+
+    def __init__(self,
+                 max_columns: int = 4,
+                 max_pie_categories: int = 8,
+                 min_correlation: float = 0.5,
+                 hexbin_rows: int = 10_000,
+                 repeat_penalty: float = 0.8):
+        """
+        Args:
+            max_columns: Most informative columns of each kind considered
+            max_pie_categories: Largest number of categories shown as a pie
+            min_correlation: Absolute correlation needed for a scatter candidate
+            hexbin_rows: Row count above which correlated pairs use hexbin
+                instead of scatter
+            repeat_penalty: Score factor applied per earlier candidate of the
+                same plot type
+        """
+        self.max_columns = max_columns
+        self.max_pie_categories = max_pie_categories
+        self.min_correlation = min_correlation
+        self.hexbin_rows = hexbin_rows
+        self.repeat_penalty = repeat_penalty
+
+    def candidates(self, profile: DataFrameProfile) -> List[Dict]:
+        """All rule-based candidates as dicts with plot_type, variables and score, best first."""
+        scores = column_informativeness(profile, profile.top_pairs)
+
+        def top(names: Iterable[str]) -> List[str]:
+            ranked = sorted((n for n in names if scores[n] > 0), key=lambda n: -scores[n])
+            return ranked[:self.max_columns]
+
+        # Low-cardinality numbers (flags, ratings) are treated as categories
+        numerical = top(n for n, c in profile.columns.items()
+                        if c.kind == "numerical" and not c.low_cardinality)
+        categorical = top(n for n, c in profile.columns.items()
+                          if c.low_cardinality and c.kind != "datetime")
+        datetimes = top(n for n, c in profile.columns.items() if c.kind == "datetime")
+
+        rules = self.RULE_SCORES
+        found: List[Tuple[str, List[str], float]] = []
+
+        for date in datetimes:
+            for num in numerical:
+                found.append(('line', [date, num], rules['line']))
+
+        pair_plot = 'hexbin' if profile.shape[0] > self.hexbin_rows else 'scatter'
+        for a, b, r in profile.scatter_candidates(self.min_correlation):
+            # Scale within the rule so stronger pairs rank first
+            found.append((pair_plot, [a, b], rules[pair_plot] * (0.5 + 0.5 * abs(r))))
+
+        for cat in categorical:
+            for num in numerical:
+                found.append(('boxplot', [num, cat], rules['boxplot_grouped']))
+                found.append(('bar', [num, cat], rules['bar']))
+
+        for num in numerical:
+            found.append(('hist', [num], rules['hist']))
+
+        for cat in categorical:
+            if profile.columns[cat].unique_count <= self.max_pie_categories:
+                found.append(('pie', [cat], rules['pie']))
+
+        for num in numerical:
+            found.append(('boxplot', [num], rules['boxplot']))
+
+        unique = {}
+        for plot_type, variables, score in found:
+            unique.setdefault((plot_type, tuple(sorted(variables))), (plot_type, variables, score))
+
+        # Greedy pick with a penalty per repeated plot type, so a handful of
+        # recommendations covers several kinds of plot
+        remaining = list(unique.values())
+        used: Counter = Counter()
+        candidates = []
+        while remaining:
+            best = max(range(len(remaining)),
+                       key=lambda i: remaining[i][2] * self.repeat_penalty ** used[remaining[i][0]])
+            plot_type, variables, score = remaining.pop(best)
+            candidates.append({'plot_type': plot_type,
+                               'variables': ', '.join(variables),
+                               'score': round(score * self.repeat_penalty ** used[plot_type], 2)})
+            used[plot_type] += 1
+        return candidates
+
+    def recommend(self,
+                  profile: DataFrameProfile,
+                  n: int = 5,
+                  exclude: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Top ``n`` candidates in the recommender's output schema.
+
+        Args:
+            profile: Profile of the DataFrame to recommend for
+            n: Number of recommendations to return
+            exclude: Existing recommendations (plot_type, variables) to skip
+
+        Returns:
+            pd.DataFrame: plot_type, variables, ensemble_score,
+            model_agreement and source_models (``['heuristic']``)
+        """
+        taken = set()
+        if exclude is not None and not exclude.empty:
+            taken = {recommendation_key(p, v) for p, v in zip(exclude['plot_type'], exclude['variables'])}
+
+        rows = []
+        for candidate in self.candidates(profile):
+            if recommendation_key(candidate['plot_type'], candidate['variables']) in taken:
+                continue
+            rows.append({
+                'plot_type': candidate['plot_type'],
+                'variables': candidate['variables'],
+                'ensemble_score': candidate['score'],
+                'model_agreement': 1,
+                'source_models': [HEURISTIC_SOURCE],
+            })
+            if len(rows) >= n:
+                break
+        return pd.DataFrame(rows, columns=OUTPUT_COLUMNS)
+
+
+def recommendation_key(plot_type: str, variables: str) -> Tuple[str, Tuple[str, ...]]:
+    """Identity of a recommendation: its plot type and variables, ignoring case and variable order."""
+    return plot_type.lower(), tuple(sorted(v.strip() for v in variables.split(',')))
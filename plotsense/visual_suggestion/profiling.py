@@ -0,0 +1,427 @@
+import warnings
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+import pandas as pd
+import numpy as np
+from plotsense.visual_suggestion.correlation import (
+    CorrelationPair, top_correlation_pairs, top_correlations, top_correlations_involving)
+from plotsense.visual_suggestion.sketches import HyperLogLog
+
+
+# Columns whose unique/total ratio falls below this are treated as categorical
+CATEGORICAL_RATIO = 0.05
+
+# Numeric column count up to which "auto" correlation keeps the dense matrix
+DENSE_CORRELATION_COLUMNS = 30
+
+# Rows scanned when looking for non-missing sample values before falling
+# back to a full ``dropna`` on the column
+_SAMPLE_SCAN_ROWS = 256
+
+
+@dataclass
+class ColumnProfile:
+    """Statistics for a single column, as used by the recommender prompt."""
+    name: str
+    dtype: str
+    kind: str
+    unique_count: int
+    missing_count: int
+    sample_values: List[Any]
+    low_cardinality: bool
+    unique_approx: bool = False
+    min: Any = None
+    max: Any = None
+    mean: Optional[float] = None
+
+
+@dataclass
+class DataFrameProfile:
+    """Column profiles plus frame-level relationships for one DataFrame."""
+    shape: Tuple[int, int]
+    columns: Dict[str, ColumnProfile] = field(default_factory=dict)
+    numerical_columns: List[str] = field(default_factory=list)
+    correlations: Optional[pd.DataFrame] = None
+    top_pairs: List[CorrelationPair] = field(default_factory=list)
+
+    @property
+    def categorical_columns(self) -> List[str]:
+        """Columns (of any dtype) that pass the low-cardinality rule."""
+        return [name for name, col in self.columns.items() if col.low_cardinality]
+
+    def kinds(self) -> Dict[str, str]:
+        """Map of column name to semantic kind."""
+        return {name: col.kind for name, col in self.columns.items()}
+
+    def scatter_candidates(self, min_strength: float = 0.5) -> List[CorrelationPair]:
+        """Strongly correlated numeric pairs, strongest first."""
+        return [pair for pair in self.top_pairs if abs(pair[2]) >= min_strength]
+
+    def pair_strength(self, a: str, b: str) -> float:
+        """Absolute correlation of two columns if it is among the top pairs, else 0."""
+        for x, y, r in self.top_pairs:
+            if {x, y} == {a, b}:
+                return abs(r)
+        return 0.0
+
+
+class DataFrameProfiler:
+    """
+    Compute every per-column statistic the recommender prompt needs.
+
+    Statistics are gathered per dtype block rather than per column, so each
+    reduction (``nunique``, ``isna``, ``min``/``max``/``mean``) is a single
+    vectorized call over all columns sharing a dtype.
+    """
+
+    def __init__(self,
+                 sample_size: int = 3,
+                 categorical_ratio: float = CATEGORICAL_RATIO,
+                 cardinality: str = "auto",
+                 approx_threshold: Optional[int] = None,
+                 hll_precision: int = 14,
+                 random_state: int = 0,
+                 correlation: str = "auto",
+                 max_pairs: int = 20,
+                 correlation_sample: Optional[int] = None):
+        """
+        Args:
+            sample_size: Number of non-missing sample values kept per column
+            categorical_ratio: Unique/total ratio below which a column is
+                considered categorical
+            cardinality: How unique counts of object/string columns are
+                computed: "exact", "approx" (HyperLogLog) or "auto", which
+                switches to "approx" above ``approx_threshold`` rows
+            approx_threshold: Row count at which "auto" starts estimating
+                (None, the default, never estimates). Hashing every value
+                takes about twice as long as an exact ``nunique``, so
+                estimates only pay off when the memory of an exact count of
+                a very high-cardinality column is the constraint
+            hll_precision: HyperLogLog precision used for estimates
+            random_state: Seed used when profiling a row sample
+            correlation: "dense" (full ``DataFrame.corr()`` matrix), "topk"
+                (only the strongest pairs, computed blockwise in float32) or
+                "auto", which is dense up to ``DENSE_CORRELATION_COLUMNS``
+                numeric columns
+            max_pairs: Number of strongest correlation pairs kept
+            correlation_sample: Optional row count the top-k correlations
+                are computed on
+        """
+        if cardinality not in ("auto", "exact", "approx"):
+            raise ValueError("cardinality must be 'auto', 'exact' or 'approx'")
+        if correlation not in ("auto", "dense", "topk"):
+            raise ValueError("correlation must be 'auto', 'dense' or 'topk'")
+        self.sample_size = sample_size
+        self.categorical_ratio = categorical_ratio
+        self.cardinality = cardinality
+        self.approx_threshold = approx_threshold
+        self.hll_precision = hll_precision
+        self.random_state = random_state
+        self.correlation = correlation
+        self.max_pairs = max_pairs
+        self.correlation_sample = correlation_sample
+
+    def profile(self,
+                df: pd.DataFrame,
+                sample: Optional[Union[int, float]] = None,
+                stratify: Optional[str] = None) -> DataFrameProfile:
+        """
+        Profile ``df`` and return a reusable :class:`DataFrameProfile`.
+
+        Args:
+            df: DataFrame to profile
+            sample: Optional row sample to profile instead of the whole frame,
+                either a row count (int) or a fraction of rows (float in (0, 1]).
+                Shape and missing counts are always reported for the full frame.
+            stratify: Optional column to stratify the row sample by
+
+        Returns:
+            DataFrameProfile
+        """
+        sampled = sample_rows(df, sample, stratify=stratify, random_state=self.random_state)
+        columns = self._column_profiles(df, sampled)
+
+        numerical_columns = df.select_dtypes(include=np.number).columns.tolist()
+        correlations, top_pairs = self._correlations(sampled, numerical_columns)
+
+        return DataFrameProfile(
+            shape=df.shape,
+            columns=columns,
+            numerical_columns=numerical_columns,
+            correlations=correlations,
+            top_pairs=top_pairs,
+        )
+
+    def update(self,
+               previous: DataFrameProfile,
+               df: pd.DataFrame,
+               changed: List[str],
+               sample: Optional[Union[int, float]] = None,
+               stratify: Optional[str] = None) -> DataFrameProfile:
+        """
+        Profile ``df`` reusing ``previous`` for every column not in ``changed``.
+
+        Only the changed (new or rewritten) columns are profiled; columns
+        missing from ``df`` are dropped. Correlations are recomputed only for
+        pairs involving a changed column: the dense matrix gains new rows,
+        and in top-k mode the previous pairs are merged with the strongest
+        pairs of the changed columns. The row count must be unchanged.
+
+        Args:
+            previous: Profile of an earlier version of ``df``
+            df: DataFrame to profile
+            changed: Columns that are new or whose contents changed
+            sample: Same as in :meth:`profile`
+            stratify: Same as in :meth:`profile`
+
+        Returns:
+            DataFrameProfile
+        """
+        if previous.shape[0] != len(df):
+            raise ValueError("update() needs the same rows as the previous profile")
+        changed_set = set(changed)
+        sampled = sample_rows(df, sample, stratify=stratify, random_state=self.random_state)
+        fresh = self._column_profiles(df[[c for c in df.columns if c in changed_set]], sampled)
+        columns = {c: fresh[c] if c in changed_set else previous.columns[c] for c in df.columns}
+
+        numerical_columns = df.select_dtypes(include=np.number).columns.tolist()
+        correlations, top_pairs = self._update_correlations(
+            previous, sampled, numerical_columns, changed_set)
+
+        return DataFrameProfile(
+            shape=df.shape,
+            columns=columns,
+            numerical_columns=numerical_columns,
+            correlations=correlations,
+            top_pairs=top_pairs,
+        )
+
+    def _column_profiles(self, df: pd.DataFrame, sampled: pd.DataFrame) -> Dict[str, ColumnProfile]:
+        """ColumnProfile of every column of ``df``, with statistics taken from the ``sampled`` rows."""
+        n_rows = len(df)
+        missing = df.isna().sum()
+        is_sampled = len(sampled) < n_rows
+        if is_sampled and not sampled.columns.equals(df.columns):
+            df = sampled[df.columns]
+        elif is_sampled:
+            df = sampled
+
+        if is_sampled:
+            unique = self._extrapolated_unique_counts(df, n_rows)
+            approx_cols = set(df.columns)
+        else:
+            unique, approx_cols = self._unique_counts(df)
+
+        numeric_stats: Dict[str, Dict[str, Any]] = {}
+        for block in self._dtype_blocks(df):
+            numeric_stats.update(self._block_stats(block))
+
+        columns: Dict[str, ColumnProfile] = {}
+        for col in df.columns:
+            series = df[col]
+            unique_count = int(unique[col])
+            missing_count = int(missing[col])
+            low_cardinality = n_rows > 0 and unique_count / n_rows < self.categorical_ratio
+
+            if pd.api.types.is_datetime64_dtype(series):
+                kind = "datetime"
+            elif pd.api.types.is_numeric_dtype(series):
+                kind = "numerical"
+            elif low_cardinality:
+                kind = "categorical"
+            else:
+                kind = "text/other"
+
+            stats = numeric_stats.get(col, {})
+            columns[col] = ColumnProfile(
+                name=col,
+                dtype=str(series.dtype),
+                kind=kind,
+                unique_count=unique_count,
+                missing_count=missing_count,
+                sample_values=self._sample_values(series, missing_count),
+                low_cardinality=low_cardinality,
+                unique_approx=col in approx_cols,
+                min=stats.get("min"),
+                max=stats.get("max"),
+                mean=stats.get("mean"),
+            )
+        return columns
+
+    def _correlations(self,
+                      df: pd.DataFrame,
+                      numerical_columns: List[str]) -> Tuple[Optional[pd.DataFrame], List[CorrelationPair]]:
+        """Dense correlation matrix (narrow frames only) and the strongest pairs."""
+        if len(numerical_columns) < 2:
+            return None, []
+
+        dense = self.correlation == "dense" or (
+            self.correlation == "auto" and len(numerical_columns) <= DENSE_CORRELATION_COLUMNS)
+        if dense:
+            correlations = df[numerical_columns].corr()
+            return correlations, top_correlation_pairs(correlations, self.max_pairs)
+
+        rows = sample_rows(df, self.correlation_sample, random_state=self.random_state)
+        return None, top_correlations(rows[numerical_columns], k=self.max_pairs)
+
+    def _update_correlations(self,
+                             previous: DataFrameProfile,
+                             df: pd.DataFrame,
+                             numerical_columns: List[str],
+                             changed: set) -> Tuple[Optional[pd.DataFrame], List[CorrelationPair]]:
+        """Correlations of ``df`` reusing every pair of unchanged columns from ``previous``."""
+        if len(numerical_columns) < 2:
+            return None, []
+        new = [c for c in numerical_columns if c in changed or c not in previous.columns]
+        if not new and set(numerical_columns) == set(previous.numerical_columns):
+            return previous.correlations, previous.top_pairs
+
+        dense = self.correlation == "dense" or (
+            self.correlation == "auto" and len(numerical_columns) <= DENSE_CORRELATION_COLUMNS)
+        if dense:
+            if previous.correlations is None:
+                return self._correlations(df, numerical_columns)
+            kept = [c for c in numerical_columns if c not in new]
+            correlations = previous.correlations.loc[kept, kept].reindex(
+                index=numerical_columns, columns=numerical_columns)
+            numeric = df[numerical_columns]
+            with warnings.catch_warnings():
+                # Constant columns correlate as NaN, as in DataFrame.corr()
+                warnings.simplefilter("ignore", RuntimeWarning)
+                for column in new:
+                    row = numeric.corrwith(numeric[column])
+                    correlations.loc[column, :] = row
+                    correlations.loc[:, column] = row
+            return correlations, top_correlation_pairs(correlations, self.max_pairs)
+
+        # Pairs of unchanged columns keep their previous values; pairs that
+        # fell just outside the previous top-k are not recovered
+        remaining = set(numerical_columns) - set(new)
+        kept_pairs = [(a, b, r) for a, b, r in previous.top_pairs if a in remaining and b in remaining]
+        rows = sample_rows(df, self.correlation_sample, random_state=self.random_state)
+        new_pairs = top_correlations_involving(rows[numerical_columns], new, k=self.max_pairs) if new else []
+        pairs = sorted(kept_pairs + new_pairs, key=lambda pair: -abs(pair[2]))
+        return None, pairs[:self.max_pairs]
+
+    def _use_approx(self, n_rows: int) -> bool:
+        if self.cardinality == "auto":
+            return self.approx_threshold is not None and n_rows >= self.approx_threshold
+        return self.cardinality == "approx"
+
+    def _unique_counts(self, df: pd.DataFrame) -> Tuple[pd.Series, set]:
+        """Exact ``nunique`` for most columns, HyperLogLog estimates for object-like ones when enabled."""
+        approx_cols = set()
+        if self._use_approx(len(df)):
+            approx_cols = {
+                col for col, dtype in df.dtypes.items()
+                if not (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype))
+            }
+
+        exact_cols = [col for col in df.columns if col not in approx_cols]
+        unique = df[exact_cols].nunique() if exact_cols else pd.Series(dtype=np.int64)
+        for col in approx_cols:
+            unique[col] = HyperLogLog(self.hll_precision).update(df[col]).count()
+        return unique, approx_cols
+
+    def _extrapolated_unique_counts(self, sample: pd.DataFrame, n_rows: int) -> pd.Series:
+        """
+        Estimate full-frame distinct counts from a row sample.
+
+        Values seen more than once in the sample are assumed to be all the
+        distinct values of their kind; values seen exactly once are scaled up
+        to the full row count. This keeps low-cardinality columns saturated at
+        their observed count while ID-like columns extrapolate to ``n_rows``.
+        """
+        scale = n_rows / len(sample)
+        unique = {}
+        for col in sample.columns:
+            counts = sample[col].value_counts()
+            singletons = int((counts == 1).sum())
+            unique[col] = min(n_rows, int(round(len(counts) + singletons * (scale - 1))))
+        return pd.Series(unique, dtype=np.int64)
+
+    def _dtype_blocks(self, df: pd.DataFrame) -> List[pd.DataFrame]:
+        """Split the numeric and datetime columns of ``df`` into same-dtype frames."""
+        groups: Dict[str, List[str]] = {}
+        for col, dtype in df.dtypes.items():
+            if pd.api.types.is_datetime64_dtype(dtype) or pd.api.types.is_numeric_dtype(dtype):
+                groups.setdefault(str(dtype), []).append(col)
+        return [df[cols] for cols in groups.values()]
+
+    def _block_stats(self, block: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """min/max (and mean for numeric blocks) for every column of a same-dtype block."""
+        mins = block.min()
+        maxs = block.max()
+        is_numeric = pd.api.types.is_numeric_dtype(block.dtypes.iloc[0])
+        means = block.mean() if is_numeric else None
+
+        stats = {}
+        for col in block.columns:
+            stats[col] = {
+                "min": _na_to_nan(mins[col]) if is_numeric else mins[col],
+                "max": _na_to_nan(maxs[col]) if is_numeric else maxs[col],
+                "mean": float(_na_to_nan(means[col])) if means is not None else None,
+            }
+        return stats
+
+    def _sample_values(self, series: pd.Series, missing_count: int) -> List[Any]:
+        if missing_count == 0:
+            return series.head(self.sample_size).tolist()
+        head = series.head(_SAMPLE_SCAN_ROWS).dropna()
+        if len(head) >= self.sample_size or len(series) <= _SAMPLE_SCAN_ROWS:
+            return head.head(self.sample_size).tolist()
+        return series.dropna().head(self.sample_size).tolist()
+
+
+def sample_rows(df: pd.DataFrame,
+                sample: Optional[Union[int, float]],
+                stratify: Optional[str] = None,
+                random_state: int = 0) -> pd.DataFrame:
+    """
+    Deterministically sample rows of ``df``, keeping the original row order.
+
+    Args:
+        df: DataFrame to sample
+        sample: Number of rows (int) or fraction of rows (float in (0, 1]).
+            ``None`` returns ``df`` unchanged.
+        stratify: Optional column; each of its values (including missing)
+            keeps the same share of rows, with at least one row per group
+        random_state: Seed for the sample
+
+    Returns:
+        pd.DataFrame: The sampled rows (or ``df`` itself if no sampling applies)
+    """
+    n_rows = len(df)
+    if sample is None or n_rows == 0:
+        return df
+
+    if isinstance(sample, float):
+        if not 0 < sample <= 1:
+            raise ValueError("A fractional sample must be in (0, 1]")
+        size = max(1, int(round(n_rows * sample)))
+    else:
+        if sample <= 0:
+            raise ValueError("Sample size must be positive")
+        size = int(sample)
+
+    if size >= n_rows:
+        return df
+
+    rng = np.random.default_rng(random_state)
+    if stratify is None:
+        keep = rng.choice(n_rows, size=size, replace=False, shuffle=False)
+    else:
+        # Shuffle once, then keep the first quota rows of each stratum
+        codes = pd.factorize(df[stratify])[0] + 1  # missing values become group 0
+        order = rng.permutation(n_rows)
+        shuffled = pd.Series(codes[order])
+        rank = shuffled.groupby(shuffled).cumcount().to_numpy()
+        quota = np.maximum(1, np.round(np.bincount(codes) * size / n_rows)).astype(np.int64)
+        keep = order[rank < quota[codes[order]]]
+
+    return df.iloc[np.sort(keep)]
+
+
+def _na_to_nan(value: Any) -> Any:
+    # All-missing nullable (Int64/Float64) columns reduce to pd.NA, which float() rejects
+    return np.nan if pd.isna(value) else value
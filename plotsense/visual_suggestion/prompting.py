@@ -0,0 +1,140 @@
+from collections import Counter
+from typing import Dict, List, Optional
+from plotsense.ratelimit import estimate_tokens
+from plotsense.visual_suggestion.correlation import CorrelationPair
+from plotsense.visual_suggestion.profiling import ColumnProfile, DataFrameProfile
+
+
+# Base informativeness of a column by kind; free text and IDs rarely make good axes
+KIND_WEIGHTS = {
+    "numerical": 1.0,
+    "categorical": 1.0,
+    "datetime": 0.9,
+    "text/other": 0.2,
+}
+
+# Correlation pairs listed in a compacted description
+DEFAULT_MAX_PAIRS = 20
+
+
+def column_lines(info: ColumnProfile) -> List[str]:
+    """Description lines for one column, as used by the full and compacted prompts."""
+    unique_count = f"~{info.unique_count}" if info.unique_approx else info.unique_count
+    lines = [f"- {info.name}: {info.kind} ({unique_count} unique values), sample: {info.sample_values}"]
+
+    # Add stats for numerical/datetime
+    if info.kind == "numerical":
+        lines.append(
+            f"  Stats: min={info.min}, max={info.max}, "
+            f"mean={info.mean:.2f}, missing={info.missing_count}")
+    elif info.kind == "datetime":
+        lines.append(
+            f"  Range: {info.min} to {info.max}, "
+            f"missing={info.missing_count}"
+        )
+    return lines
+
+
+def column_informativeness(profile: DataFrameProfile,
+                           pairs: Optional[List[CorrelationPair]] = None) -> Dict[str, float]:
+    """
+    Score how useful each column is likely to be in a visualization.
+
+    Starts from a per-kind weight, discounts missing values, zeroes constant
+    columns and adds the column's strongest listed correlation.
+    """
+    n_rows = profile.shape[0] or 1
+    strongest: Dict[str, float] = {}
+    for a, b, r in pairs or []:
+        strongest[a] = max(strongest.get(a, 0.0), abs(r))
+        strongest[b] = max(strongest.get(b, 0.0), abs(r))
+
+    scores = {}
+    for name, info in profile.columns.items():
+        if info.unique_count <= 1:
+            scores[name] = 0.0
+            continue
+        score = KIND_WEIGHTS.get(info.kind, 0.2) * (1 - info.missing_count / n_rows)
+        scores[name] = score + 0.5 * strongest.get(name, 0.0)
+    return scores
+
+
+def compact_description(profile: DataFrameProfile,
+                        max_tokens: int,
+                        max_pairs: int = DEFAULT_MAX_PAIRS) -> str:
+    """
+    Describe ``profile`` in at most ``max_tokens`` (estimated) tokens.
+
+    The most informative columns get full detail lines, correlations are
+    listed as the strongest pairs instead of a dense matrix, and every
+    remaining column is summarized by kind counts. Detail lines are dropped
+    first, then correlation pairs; the text is truncated only as a last resort.
+    """
+    pairs = profile.top_pairs[:max_pairs]
+    scores = column_informativeness(profile, pairs)
+    ranked = sorted(profile.columns, key=lambda name: -scores[name])
+
+    def render(n_detail: int, n_pairs: int) -> str:
+        return _render_compact(profile, ranked[:n_detail], pairs[:n_pairs])
+
+    def fits(text: str) -> bool:
+        return estimate_tokens(text) <= max_tokens
+
+    n_pairs = len(pairs)
+    if not fits(render(0, n_pairs)):
+        n_pairs = _largest_fitting(lambda n: fits(render(0, n)), len(pairs))
+        if n_pairs < 0:
+            return render(0, 0)[:max(0, (max_tokens - 1) * 4)]
+
+    n_detail = _largest_fitting(lambda n: fits(render(n, n_pairs)), len(ranked))
+    return render(n_detail, n_pairs)
+
+
+def _largest_fitting(fits, upper: int) -> int:
+    """Largest n in [0, upper] with ``fits(n)`` for a monotone predicate, or -1 if none."""
+    if not fits(0):
+        return -1
+    lo, hi = 0, upper
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if fits(mid):
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _render_compact(profile: DataFrameProfile,
+                    detailed: List[str],
+                    pairs: List[CorrelationPair]) -> str:
+    desc: List[str] = []
+    desc.append(f"DataFrame Shape: {profile.shape}")
+    desc.append(f"Columns ({len(profile.columns)}): {len(detailed)} described below")
+
+    detailed_set = set(detailed)
+    if detailed:
+        desc.append("\nColumn Details:")
+        # Keep the original column order among the detailed columns
+        for name, info in profile.columns.items():
+            if name in detailed_set:
+                desc.extend(column_lines(info))
+
+    remaining = [info.kind for name, info in profile.columns.items() if name not in detailed_set]
+    if remaining:
+        counts = Counter(remaining)
+        summary = ", ".join(f"{count} {kind}" for kind, count in counts.most_common())
+        desc.append(f"\nOther columns ({len(remaining)}): {summary}")
+
+    if pairs:
+        desc.append("\nStrongest Numerical Correlations (Pearson):")
+        desc.extend(f"- {a} ~ {b}: {r:.2f}" for a, b, r in pairs)
+
+    categorical_cols = [c for c in detailed if profile.columns[c].low_cardinality]
+    numerical_set = set(profile.numerical_columns)
+    numerical_cols = [c for c in detailed if c in numerical_set]
+    if categorical_cols and numerical_cols:
+        desc.append("\nPotential Groupings (categorical vs numerical):")
+        desc.append(f"  - Could group by: {categorical_cols}")
+        desc.append(f"  - To analyze: {numerical_cols}")
+
+    return "\n".join(desc)
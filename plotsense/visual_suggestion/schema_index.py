@@ -0,0 +1,190 @@
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+import time
+import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from plotsense.visual_suggestion.heuristics import OUTPUT_COLUMNS
+from plotsense.visual_suggestion.profiling import DataFrameProfile
+
+
+class SchemaIndex:
+    """
+    Past recommendations indexed by DataFrame schema.
+
+    A schema signature is the column names with their kinds, plus a
+    logarithmic cardinality bucket per column. Names and kinds must match
+    exactly; buckets may differ by up to ``tolerance``, so daily partitions
+    of the same table map to the same entry while their distributions drift.
+    Entries live in SQLite, in memory unless ``path`` is given.
+    """
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 tolerance: int = 1,
+                 cardinality_base: float = 4.0,
+                 ttl: Optional[float] = None,
+                 max_entries: int = 10_000):
+        """
+        Args:
+            path: SQLite file to persist the index in (None keeps it in memory)
+            tolerance: Largest per-column difference in cardinality bucket
+                that still counts as a match
+            cardinality_base: Bucket width; a column's bucket is
+                ``floor(log_base(unique values))``
+            ttl: Age in seconds after which entries are ignored (None to keep
+                them forever)
+            max_entries: Maximum number of stored entries
+        """
+        self.path = path
+        self.tolerance = tolerance
+        self.cardinality_base = cardinality_base
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS schema_index ("
+                " schema_key TEXT NOT NULL,"
+                " buckets TEXT NOT NULL,"
+                " results TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL,"
+                " PRIMARY KEY (schema_key, buckets))"
+            )
+        self._refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plotsense-schema")
+        self._refreshing: Dict[Tuple[str, str], Future] = {}
+
+    def signature(self, profile: DataFrameProfile) -> Tuple[str, List[int]]:
+        """Exact-match key (names and kinds) and cardinality buckets of a profile."""
+        names = sorted(profile.columns)
+        # Categorical vs text depends on the row count, so both count as
+        # "other"; the cardinality bucket tells them apart
+        layout = [(name, _schema_kind(profile.columns[name].kind)) for name in names]
+        key = hashlib.sha256(json.dumps(layout).encode("utf-8")).hexdigest()
+        buckets = [self._bucket(profile.columns[name].unique_count) for name in names]
+        return key, buckets
+
+    def lookup(self, profile: DataFrameProfile) -> Optional[pd.DataFrame]:
+        """Recommendations stored for the closest matching schema, or None."""
+        key, buckets = self.signature(profile)
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT buckets, results, created_at FROM schema_index WHERE schema_key = ?",
+                (key,)).fetchall()
+
+            best = None
+            for stored, results, created_at in rows:
+                if self.ttl is not None and now - created_at > self.ttl:
+                    continue
+                distance = max((abs(a - b) for a, b in zip(json.loads(stored), buckets)), default=0)
+                if distance <= self.tolerance and (
+                        best is None or (distance, -created_at) < (best[0], -best[3])):
+                    best = (distance, stored, results, created_at)
+
+            if best is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE schema_index SET last_access = ? WHERE schema_key = ? AND buckets = ?",
+                (now, key, best[1]))
+            self.hits += 1
+        return pd.DataFrame(json.loads(best[2]), columns=OUTPUT_COLUMNS)
+
+    def store(self, profile: DataFrameProfile, results: pd.DataFrame):
+        """Store recommendations for the profile's schema, replacing an entry with identical buckets."""
+        key, buckets = self.signature(profile)
+        records = json.dumps(results[OUTPUT_COLUMNS].to_dict("records"), default=_to_builtin)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO schema_index"
+                " (schema_key, buckets, results, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(buckets), records, now, now))
+            overflow = self._count() - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM schema_index WHERE rowid IN"
+                    " (SELECT rowid FROM schema_index ORDER BY last_access ASC LIMIT ?)", (overflow,))
+
+    def refresh(self,
+                profile: DataFrameProfile,
+                compute: Callable[[], Optional[pd.DataFrame]]) -> Future:
+        """
+        Recompute the entry for ``profile`` in the background.
+
+        ``compute`` runs on the index's refresh thread and its result (unless
+        None) is stored. A refresh already running for the same signature is
+        returned instead of starting another.
+        """
+        key, buckets = self.signature(profile)
+        slot = (key, json.dumps(buckets))
+
+        def run() -> Optional[pd.DataFrame]:
+            try:
+                results = compute()
+                if results is not None:
+                    self.store(profile, results)
+                return results
+            except Exception as e:
+                warnings.warn(f"Background schema refresh failed: {e}")
+                return None
+            finally:
+                with self._lock:
+                    self._refreshing.pop(slot, None)
+
+        with self._lock:
+            future = self._refreshing.get(slot)
+            if future is None:
+                future = self._refresher.submit(run)
+                self._refreshing[slot] = future
+        return future
+
+    def clear(self):
+        """Remove every entry and reset the counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM schema_index")
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current number of entries."""
+        with self._lock:
+            entries = self._count()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self):
+        self._refresher.shutdown(wait=False)
+        with self._lock:
+            self._conn.close()
+
+    def _bucket(self, unique_count: int) -> int:
+        if unique_count <= 1:
+            return 0
+        # Epsilon so that exact powers are not rounded down (log(64, 4) = 2.999...)
+        return int(math.log(unique_count, self.cardinality_base) + 1e-9)
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM schema_index").fetchone()[0]
+
+
+def _schema_kind(kind: str) -> str:
+    return kind if kind in ("numerical", "datetime") else "other"
+
+
+def _to_builtin(value):
+    # numpy scalars that json cannot serialize
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,80 @@
+import math
+from typing import Union
+import numpy as np
+import pandas as pd
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count estimator.
+
+    Values are hashed with ``pandas.util.hash_pandas_object`` so a whole
+    column is folded into the registers in one vectorized pass, without
+    building the Python-level hash set that ``Series.nunique()`` needs for
+    object columns. The relative standard error is ``1.04 / sqrt(2 ** p)``
+    (about 0.8% for the default ``p=14``).
+    """
+
+    def __init__(self, precision: int = 14):
+        """
+        Args:
+            precision: Number of hash bits used to select a register (4-18)
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of the estimate."""
+        return 1.04 / math.sqrt(self.m)
+
+    def update(self, values: Union[pd.Series, np.ndarray, list]) -> "HyperLogLog":
+        """Add values to the sketch. Missing values are ignored."""
+        series = values if isinstance(values, pd.Series) else pd.Series(values)
+        series = series.dropna()
+        if series.empty:
+            return self
+
+        hashes = pd.util.hash_pandas_object(series, index=False).to_numpy(dtype=np.uint64)
+        p = self.precision
+        idx = (hashes >> np.uint64(64 - p)).astype(np.int64)
+
+        # Rank = position of the leftmost 1-bit in the remaining bits. Keep at
+        # most 53 of them so the float conversion used for bit_length is exact.
+        width = min(64 - p, 53)
+        rest = (hashes << np.uint64(p)) >> np.uint64(64 - width)
+        _, exponent = np.frexp(rest.astype(np.float64))
+        rank = (width - exponent + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, idx, rank)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Fold another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        """Estimated number of distinct values seen."""
+        m = self.m
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+def approx_nunique(values: Union[pd.Series, np.ndarray, list], precision: int = 14) -> int:
+    """Estimate the number of distinct non-missing values with a HyperLogLog sketch."""
+    return HyperLogLog(precision).update(values).count()
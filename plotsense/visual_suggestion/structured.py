@@ -0,0 +1,124 @@
+import json
+from typing import Any, Collection, Dict, List, Optional
+
+
+OUTPUT_FORMATS = ("text", "json")
+
+# Provider response format requesting a syntactically valid JSON object
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Word cap on each rationale, which bounds the completion length
+MAX_RATIONALE_WORDS = 20
+
+# Completion budget of a JSON response: a fixed envelope plus one
+# recommendation object (plot type, a few variables, capped rationale) each,
+# as compact JSON. Models often pretty-print (about 65 tokens per object), so
+# the budget is JSON_TOKEN_MARGIN times the compact estimate
+JSON_BASE_TOKENS = 64
+JSON_TOKENS_PER_RECOMMENDATION = 48
+JSON_TOKEN_MARGIN = 2
+
+# Shape described to the model; the prompt must mention JSON for the provider
+# to accept the json_object response format
+RECOMMENDATION_SCHEMA = {
+    "recommendations": [
+        {
+            "plot_type": "<matplotlib function name, e.g. bar, scatter, hist, boxplot, pie>",
+            "variables": ["<column name, NUMERICAL VARIABLES FIRST>", "..."],
+            "rationale": f"<why this plot is useful, at most {MAX_RATIONALE_WORDS} words>",
+        }
+    ]
+}
+
+JSON_EXAMPLE = {
+    "recommendations": [
+        {"plot_type": "boxplot", "variables": ["income", "gender"],
+         "rationale": "Compares income distribution across genders"},
+        {"plot_type": "scatter", "variables": ["age", "income"],
+         "rationale": "Shows relationship between age and income"},
+    ]
+}
+
+
+def json_max_tokens(n: int, limit: int) -> int:
+    """Completion budget for a JSON response with ``n`` recommendations, capped at ``limit``."""
+    return min(limit, JSON_TOKEN_MARGIN * (JSON_BASE_TOKENS + JSON_TOKENS_PER_RECOMMENDATION * n))
+
+
+def parse_json_recommendations(response: str,
+                               model: str,
+                               columns: Collection[str]) -> Optional[List[Dict]]:
+    """
+    Parse a JSON recommendation response.
+
+    Accepts ``{"recommendations": [...]}`` or a bare list, also when wrapped
+    in prose or a code fence. A response cut off by the token limit keeps
+    the items that were completed. Items without a plot type or without any
+    variable present in ``columns`` are skipped; variables may be a list or a
+    comma-separated string.
+
+    Returns:
+        Recommendations in the same shape as the free-text parser produces,
+        or None if the response holds no JSON recommendation objects (so the
+        caller can fall back to the free-text parser)
+    """
+    data = _load_json(response)
+    if isinstance(data, dict):
+        data = data.get("recommendations")
+    if not isinstance(data, list) or not any(isinstance(item, dict) for item in data):
+        return None
+
+    recommendations = []
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        plot_type = item.get("plot_type")
+        if not isinstance(plot_type, str) or not plot_type.strip():
+            continue
+        variables = item.get("variables")
+        if isinstance(variables, str):
+            variables = variables.split(",")
+        if not isinstance(variables, list):
+            continue
+        names = [v.strip() for v in variables if isinstance(v, str) and v.strip() in columns]
+        if names:
+            recommendations.append({
+                'source_model': model,
+                'plot_type': plot_type.strip().lower(),
+                'variables': ', '.join(names),
+            })
+    return recommendations
+
+
+def _load_json(response: str) -> Any:
+    try:
+        return json.loads(response)
+    except ValueError:
+        pass
+    # Object wrapped in prose or a markdown code fence
+    start, end = response.find("{"), response.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        return json.loads(response[start:end + 1])
+    except ValueError:
+        return _complete_items(response)
+
+
+def _complete_items(response: str) -> Optional[List[Any]]:
+    """Object items of the first array that parse completely, for a truncated response."""
+    start = response.find("[")
+    if start == -1:
+        return None
+    decoder = json.JSONDecoder()
+    items, position = [], start + 1
+    while True:
+        while position < len(response) and response[position] in " \t\r\n,":
+            position += 1
+        try:
+            item, position = decoder.raw_decode(response, position)
+        except ValueError:
+            break
+        if isinstance(item, dict):
+            items.append(item)
+    return items or None
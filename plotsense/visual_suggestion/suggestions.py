@@ -1,21 +1,46 @@
 import os
-from typing import Dict, List, Optional, Callable
-from collections import defaultdict
+import sys
+import math
+import time
+import asyncio
+import copy
+import contextvars
+import threading
+import weakref
+from typing import Dict, List, Optional, Callable, Tuple, Union
 from dotenv import load_dotenv
 import pandas as pd
-import numpy as np
 import warnings
 import concurrent.futures
-from concurrent.futures import ThreadPoolExecutor
 import textwrap
+import json
 import builtins
 from pprint import pprint
-from groq import Groq
+from groq import Groq, AsyncGroq
 from plotsense.exceptions import PlotSenseAPIError, PlotSenseDataError, PlotSenseConfigError
+from plotsense.fingerprint import column_fingerprints, fingerprint_dataframe
+from plotsense.ratelimit import RateLimiter, estimate_tokens, get_default_limiter
+from plotsense.resilience import CircuitOpenError, ResilientCaller, get_default_caller
+from plotsense.runtime import PlotSenseRuntime, get_default_runtime
+from plotsense.visual_suggestion.profiling import DataFrameProfiler, DataFrameProfile
+from plotsense.visual_suggestion.cache import LRUCache, ResponseCache
+from plotsense.visual_suggestion.hedging import LatencyTracker, ModelSlots
+from plotsense.visual_suggestion.heuristics import OUTPUT_COLUMNS, HeuristicRecommender, recommendation_key
+from plotsense.visual_suggestion.prompting import column_lines, compact_description
+from plotsense.visual_suggestion.schema_index import SchemaIndex
+from plotsense.visual_suggestion.structured import (
+    JSON_EXAMPLE, JSON_RESPONSE_FORMAT, MAX_RATIONALE_WORDS, OUTPUT_FORMATS, RECOMMENDATION_SCHEMA,
+    json_max_tokens, parse_json_recommendations)
+from plotsense.visual_suggestion.validation import PlotSpecValidator
 
 
 load_dotenv()
 
+# Set on a worker thread once its request is no longer wanted (e.g. a losing
+# hedge), so a request still waiting for rate-limit budget is not sent
+_request_cancelled: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    '_request_cancelled', default=None)
+
 
 class VisualizationRecommender:
     DEFAULT_MODELS = {
@@ -26,13 +51,34 @@ class VisualizationRecommender:
         ],
 
     }
+    TEMPERATURE = 0.4
+    MAX_TOKENS = 1000
 
     def __init__(self,
                  api_keys: Optional[Dict[str,
                                          str]] = None,
                  timeout: int = 30,
                  interactive: bool = True,
-                 debug: bool = False):
+                 debug: bool = False,
+                 response_cache: Optional[Union[bool, ResponseCache]] = None,
+                 model_deadline: Optional[float] = None,
+                 min_quorum: int = 1,
+                 hedge: bool = False,
+                 hedge_quantile: float = 0.5,
+                 hedge_delay: float = 2.0,
+                 hedge_alternate: bool = False,
+                 resilience: Optional[ResilientCaller] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 max_prompt_tokens: Optional[int] = None,
+                 offline: bool = False,
+                 heuristic_fallback: bool = False,
+                 supplement: str = "llm",
+                 validate_plots: bool = True,
+                 overrequest: float = 1.5,
+                 output_format: str = "text",
+                 runtime: Optional[PlotSenseRuntime] = None,
+                 schema_index: Optional[SchemaIndex] = None,
+                 schema_refresh: bool = False):
         """
         Initialize VisualizationRecommender with API keys and configuration.
 
@@ -42,7 +88,63 @@ class VisualizationRecommender:
             timeout: Timeout in seconds for API requests
             interactive: Whether to prompt for missing API keys
             debug: Enable debug output
+            response_cache: Optional ResponseCache (or True for the default
+                on-disk cache) consulted before every LLM call
+            model_deadline: Optional number of seconds to wait for model
+                responses. Models that have not answered by then are dropped
+                and the ensemble runs on the responses that did arrive.
+            min_quorum: Minimum number of models that must respond for a
+                recommendation request to succeed
+            hedge: Send a duplicate request when a model is slower than its
+                usual latency; the first valid parse wins
+            hedge_quantile: Latency quantile of a model's observed response
+                times after which a hedge is sent
+            hedge_delay: Hedge threshold in seconds used until enough
+                latencies have been observed for a model
+            hedge_alternate: Send the hedge to the highest-weighted other
+                model instead of the same one. Its answer counts as that
+                model's (or is discarded if that model already answered) and
+                the slow model is dropped.
+            resilience: Retry policy and circuit breaker wrapping every
+                Groq call. Defaults to the process-wide caller, so breaker
+                state is shared by all recommenders and explainers.
+            rate_limiter: Per-model request/token budgets applied before
+                every Groq call. Defaults to the process-wide limiter.
+            max_prompt_tokens: Optional hard cap on the (estimated) prompt
+                size. Descriptions that would exceed it are compacted to the
+                most informative columns, the strongest correlation pairs and
+                a summary of the remaining columns.
+            offline: Answer from the local rule engine only, without any
+                API call (no API key is required)
+            heuristic_fallback: Return rule-based recommendations instead of
+                raising when too few models respond, and use them when an
+                LLM supplement request fails
+            supplement: How to fill up when the models return fewer than
+                ``n`` recommendations: "llm" (an extra model request) or
+                "heuristic" (the local rule engine, no round-trip)
+            validate_plots: Drop suggestions whose variables do not fit the
+                plot type's requirements (e.g. pie on a float column)
+            overrequest: Ask the models for this many times ``n``
+                suggestions, so enough survive validation without a
+                supplementary request
+            output_format: "text" (the free-text Plot Type/Variables format)
+                or "json" (the provider's JSON response mode with a
+                length-capped rationale, which needs fewer output tokens).
+                Responses that are not valid JSON are parsed as free text.
+            runtime: Thread pool and HTTP connection pool used for model
+                calls. Defaults to the process-wide runtime, so connections
+                are reused across recommenders and explainers.
+            schema_index: Optional SchemaIndex of past results. A DataFrame
+                whose schema matches a stored one gets the stored
+                recommendations (revalidated against its columns) without
+                any model call; fresh results are stored in the index.
+            schema_refresh: On a schema index hit, also recompute the
+                recommendations in the background and update the index
         """
+        if supplement not in ("llm", "heuristic"):
+            raise ValueError("supplement must be 'llm' or 'heuristic'")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}")
         self.interactive = interactive
         self.debug = debug
         api_keys = api_keys or {}
@@ -53,14 +155,47 @@ class VisualizationRecommender:
 
         self.timeout = timeout
         self.clients = {}
+        # Async clients are bound to the event loop they were created on
+        self._async_clients = weakref.WeakKeyDictionary()
         self.available_models = []
         self.df = None
         self.model_weights = {}
         self.n_to_request = 5
+        self.profiler = DataFrameProfiler()
+        self.profile_sample = None
+        self.profile_stratify = None
+        self.response_cache = ResponseCache() if response_cache is True else (response_cache or None)
+        self.model_deadline = model_deadline
+        self.min_quorum = min_quorum
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_delay = hedge_delay
+        self.hedge_alternate = hedge_alternate
+        self.latency = LatencyTracker()
+        self.resilience = resilience or get_default_caller()
+        self.rate_limiter = rate_limiter or get_default_limiter()
+        self.runtime = runtime or get_default_runtime()
+        self.schema_index = schema_index
+        self.schema_refresh = schema_refresh
+        # (column fingerprints, profile, results) of the last delta-mode request
+        self._delta_state = None
+        self.max_prompt_tokens = max_prompt_tokens
+        self.offline = offline
+        self.heuristic_fallback = heuristic_fallback
+        self.supplement = supplement
+        self.heuristics = HeuristicRecommender()
+        self.validate_plots = validate_plots
+        self.overrequest = overrequest
+        self.output_format = output_format
+        # Profiles, descriptions and prompts keyed by DataFrame fingerprint
+        self._profile_cache = LRUCache(maxsize=32)
+        # (DataFrame identity and options, profile key) of the current request
+        self._profile_key_memo = None
 
         self.api_keys.update(api_keys)
 
-        self._validate_keys()
+        if not self.offline:
+            self._validate_keys()
         self._initialize_clients()
         self._detect_available_models()
         self._initialize_model_weights()
@@ -109,7 +244,9 @@ class VisualizationRecommender:
         self.clients = {}
         if self.api_keys.get('groq'):
             try:
-                self.clients['groq'] = Groq(api_key=self.api_keys['groq'])
+                # Retries are handled by self.resilience
+                self.clients['groq'] = Groq(
+                    api_key=self.api_keys['groq'], max_retries=0, http_client=self.runtime.http_client())
             except ImportError:
                 raise PlotSenseConfigError("Python client not installed. Install with: pip install groq")
 
@@ -143,9 +280,24 @@ class VisualizationRecommender:
         if self.debug:
             print(f"[DEBUG] Model weights: {self.model_weights}")
 
-    def set_dataframe(self, df: pd.DataFrame):
-        """Set the DataFrame to analyze and provide debug info"""
+    def set_dataframe(self,
+                      df: pd.DataFrame,
+                      profile_sample: Optional[Union[int, float]] = None,
+                      profile_stratify: Optional[str] = None):
+        """
+        Set the DataFrame to analyze and provide debug info
+
+        Args:
+            df: DataFrame to analyze
+            profile_sample: Optional number (int) or fraction (float) of rows
+                to profile instead of the whole frame. Row and missing counts
+                are still reported for the full frame.
+            profile_stratify: Optional column to stratify the profiling sample by
+        """
         self.df = df
+        self.profile_sample = profile_sample
+        self.profile_stratify = profile_stratify
+        self._profile_key_memo = None
         if self.debug:
             print("\n[DEBUG] DataFrame Info:")
             print(f"Shape: {df.shape}")
@@ -156,44 +308,328 @@ class VisualizationRecommender:
     def recommend_visualizations(self,
                                  n: int = 5,
                                  custom_weights: Optional[Dict[str,
-                                                               float]] = None) -> pd.DataFrame:
+                                                               float]] = None,
+                                 delta: bool = False) -> pd.DataFrame:
         """
         Generate visualization recommendations using weighted ensemble approach.
 
         Args:
             n: Number of recommendations to return (default: 3)
             custom_weights: Optional dictionary to override default model weights
+            delta: Incremental mode for a DataFrame that gained or changed
+                columns since the previous delta request: only those columns
+                are profiled, the models are asked only for plots involving
+                them, and the answers are merged into the previous results.
+                Falls back to a full request when the rows changed.
 
         Returns:
-            pd.DataFrame: Recommended visualizations with ensemble scores
+            pd.DataFrame: Recommended visualizations with ensemble scores.
+            ``DataFrame.attrs`` records the ``responded_models`` and the
+            ``dropped_models`` (with the reason each was dropped).
 
         Raises:
             ValueError:
             If no DataFrame is set or no models are available
+            PlotSenseAPIError:
+            If fewer than ``min_quorum`` models respond
         """
         """Generate visualization recommendations using weighted ensemble approach."""
-        self.n_to_request = max(n, 5)
+        self._prepare_request(n)
+        if self.offline:
+            return self._attach_metadata(self.recommend_heuristic(n), {}, {})
+
+        # Use custom weights if provided, otherwise use defaults
+        weights = custom_weights if custom_weights else self.model_weights
+
+        if delta:
+            fingerprints = column_fingerprints(self.df)
+            results = self._recommend_delta(n, weights, fingerprints)
+            if results is not None:
+                return results
+
+        cached = self._schema_lookup(n, weights)
+        if cached is None:
+            # Get recommendations from all models in parallel
+            all_recommendations, dropped = self._collect_recommendations(self._build_prompt())
+            results = self._finish_recommendations(n, weights, all_recommendations, dropped)
+            self._schema_store(results)
+        else:
+            results = cached
+
+        if delta:
+            self._delta_state = (fingerprints, self._get_profile(), results)
+        return results
+
+    def _recommend_delta(self,
+                         n: int,
+                         weights: Dict[str, float],
+                         fingerprints: Dict[str, str]) -> Optional[pd.DataFrame]:
+        """
+        Update the previous delta-mode results for new or changed columns.
+
+        Returns:
+            The merged recommendations, or None if there is no previous
+            state for these rows (the caller then runs a full request)
+        """
+        if self._delta_state is None:
+            return None
+        previous_fingerprints, previous_profile, previous_results = self._delta_state
+        changed = [c for c, fp in fingerprints.items() if previous_fingerprints.get(c) != fp]
+        if previous_profile.shape[0] != len(self.df) or len(changed) == len(fingerprints):
+            return None
+
+        profile = self.profiler.update(
+            previous_profile, self.df, changed, sample=self.profile_sample, stratify=self.profile_stratify)
+        self._profile_cache.set(('profile', self._profile_key()), profile)
+        if self.debug:
+            print(f"\n[DEBUG] Delta request for columns: {changed}")
+
+        # Previous suggestions may refer to dropped or retyped columns
+        kept, _ = self._get_validator().filter(previous_results[OUTPUT_COLUMNS].to_dict("records"))
+        kept = pd.DataFrame(kept, columns=OUTPUT_COLUMNS)
+        responses, dropped = {}, {}
+        if changed:
+            responses, dropped = self._collect_recommendations(self._create_delta_prompt(profile, changed))
+            delta_weights = self._quorum_weights(weights, responses, dropped)
+            if delta_weights is None:
+                new = self.heuristics.recommend(profile, n=sys.maxsize, exclude=kept)
+            else:
+                new = self._rank_recommendations(responses, delta_weights)
+            changed_set = set(changed)
+            involves_changed = new['variables'].map(
+                lambda variables: any(v.strip() in changed_set for v in variables.split(',')))
+            kept = _merge_ranked(kept, new[involves_changed])
+
+        results = kept.head(n) if len(kept) >= n else self._supplement_recommendations(kept, n)
+        results = self._attach_metadata(results.reset_index(drop=True), responses, dropped)
+        results.attrs['delta_columns'] = changed
+        self._delta_state = (fingerprints, profile, kept)
+        return results
+
+    def _create_delta_prompt(self, profile: DataFrameProfile, changed: List[str]) -> str:
+        """Short prompt asking only for plots that involve the new or changed columns."""
+        changed_set = set(changed)
+        new_lines = []
+        for name in changed:
+            new_lines.extend(column_lines(profile.columns[name]))
+        existing = ", ".join(
+            f"{name} ({info.kind})" for name, info in profile.columns.items() if name not in changed_set)
+        pairs = [f"- {a} ~ {b}: {r:.2f}" for a, b, r in profile.top_pairs
+                 if a in changed_set or b in changed_set]
+
+        desc = [f"DataFrame Shape: {profile.shape}", "New columns:"] + new_lines
+        desc.append(f"\nExisting columns: {existing}")
+        if pairs:
+            desc.append("\nCorrelations of the new columns (Pearson):")
+            desc.extend(pairs)
+
+        return "\n".join([
+            "You are a data visualization expert. A dataset gained these columns:",
+            "",
+            *desc,
+            "",
+            f"Recommend {self.n_to_request} insightful visualizations using matplotlib's plotting functions.",
+            f"Every suggestion must use at least one of the new columns: {', '.join(changed)}.",
+            "List numerical variables first.",
+            self._response_format(),
+        ])
+
+    def _finish_recommendations(self,
+                                n: int,
+                                weights: Dict[str, float],
+                                all_recommendations: Dict[str, List[Dict]],
+                                dropped: Dict[str, str]) -> pd.DataFrame:
+        """Rank collected model responses into the top ``n``, supplementing if needed."""
+        weights = self._quorum_weights(weights, all_recommendations, dropped)
+        if weights is None:
+            return self._attach_metadata(self.recommend_heuristic(n), all_recommendations, dropped)
+
+        ensemble_results = self._rank_recommendations(all_recommendations, weights)
+
+        # If we don't have enough results, try to supplement
+        if len(ensemble_results) < n:
+            if self.debug:
+                print(
+                    f"\n[DEBUG] Only got {len(ensemble_results)} recommendations, trying to supplement")
+            results = self._supplement_recommendations(ensemble_results, n)
+        else:
+            if self.debug:
+                print("\n[DEBUG] Ensemble results before filtering:")
+                print(ensemble_results)
+            results = ensemble_results.head(n)
+
+        return self._attach_metadata(results, all_recommendations, dropped)
+
+    async def arecommend(self,
+                         n: int = 5,
+                         custom_weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """
+        Async version of recommend_visualizations.
+
+        Models are queried concurrently with the async Groq client, each under
+        its own ``timeout``; cancelling the awaiting task cancels every
+        in-flight model request. Parsing and ensemble scoring are shared with
+        the sync API.
+
+        Args:
+            n: Number of recommendations to return (default: 5)
+            custom_weights: Optional dictionary to override default model weights
+
+        Returns:
+            pd.DataFrame: Recommended visualizations with ensemble scores
+        """
+        self._prepare_request(n)
+        loop = asyncio.get_running_loop()
+        if self.offline:
+            results = await loop.run_in_executor(self.runtime.executor, self.recommend_heuristic, n)
+            return self._attach_metadata(results, {}, {})
+
+        weights = custom_weights if custom_weights else self.model_weights
+
+        # Profiling is CPU-bound, keep it off the event loop. A schema index
+        # hit returns before the prompt is built, as in the sync path
+        cached = await loop.run_in_executor(self.runtime.executor, self._schema_lookup, n, weights)
+        if cached is not None:
+            return cached
+        prompt = await loop.run_in_executor(self.runtime.executor, self._build_prompt)
+
+        all_recommendations, dropped = await self._acollect_recommendations(prompt)
+        weights = self._quorum_weights(weights, all_recommendations, dropped)
+        if weights is None:
+            return self._attach_metadata(self.recommend_heuristic(n), all_recommendations, dropped)
+
+        ensemble_results = self._rank_recommendations(all_recommendations, weights)
+
+        if len(ensemble_results) < n:
+            if self.debug:
+                print(
+                    f"\n[DEBUG] Only got {len(ensemble_results)} recommendations, trying to supplement")
+            results = await self._asupplement_recommendations(ensemble_results, n)
+        else:
+            results = ensemble_results.head(n)
+
+        results = self._attach_metadata(results, all_recommendations, dropped)
+        self._schema_store(results)
+        return results
+
+    def _schema_lookup(self, n: int, weights: Dict[str, float]) -> Optional[pd.DataFrame]:
+        """
+        Stored recommendations for a matching schema, revalidated against the current DataFrame.
+
+        Returns None on a miss or if fewer than ``n`` stored recommendations
+        still fit the current columns.
+        """
+        if self.schema_index is None:
+            return None
+        profile = self._get_profile()
+        cached = self.schema_index.lookup(profile)
+        if cached is None:
+            return None
+
+        valid, rejected = self._get_validator().filter(cached.to_dict("records"))
+        if len(valid) < n:
+            if self.debug:
+                print(f"\n[DEBUG] Schema index hit rejected: only {len(valid)} of {len(cached)} "
+                      f"stored recommendations are still valid")
+            return None
+
+        results = self._validate_variable_order(pd.DataFrame(valid, columns=cached.columns).head(n))
+        results = self._attach_metadata(results, {}, {})
+        results.attrs['schema_index'] = True
+        if self.debug:
+            print(f"\n[DEBUG] Reusing {len(results)} recommendations from the schema index")
+
+        if self.schema_refresh:
+            self._schedule_schema_refresh(profile, n, weights)
+        return results
+
+    def _schedule_schema_refresh(self, profile: DataFrameProfile, n: int, weights: Dict[str, float]):
+        """Recompute the current DataFrame's recommendations in the background and store them."""
+        bound = self._with_dataframe(
+            self.df, profile_sample=self.profile_sample, profile_stratify=self.profile_stratify)
+
+        def compute() -> Optional[pd.DataFrame]:
+            responses, dropped = bound._collect_recommendations(bound._build_prompt())
+            if not responses:
+                return None
+            return bound._finish_recommendations(n, weights, responses, dropped)
+
+        self.schema_index.refresh(profile, compute)
+
+    def _schema_store(self, results: pd.DataFrame):
+        # Heuristic fallbacks are not worth reusing
+        if self.schema_index is not None and results.attrs.get('responded_models'):
+            self.schema_index.store(self._get_profile(), results)
+
+    def _prepare_request(self, n: int):
+        """Validate state before a recommendation request."""
+        self.n_to_request = max(math.ceil(n * self.overrequest), 5)
 
         if self.df is None:
             raise ValueError("No DataFrame set. Call set_dataframe() first.")
+        # Fingerprint again once per request, so in-place edits are noticed
+        self._profile_key_memo = None
 
-        if not self.available_models:
+        if not self.available_models and not self.offline:
             raise ValueError("No available models detected")
 
         if self.debug:
             print("\n[DEBUG] Starting recommendation process")
             print(f"Using models: {self.available_models}")
 
-        # Use custom weights if provided, otherwise use defaults
-        weights = custom_weights if custom_weights else self.model_weights
+    def _quorum_weights(self,
+                        weights: Dict[str, float],
+                        responses: Dict[str, List[Dict]],
+                        dropped: Dict[str, str]) -> Optional[Dict[str, float]]:
+        """
+        Enforce ``min_quorum`` and restrict weights to the models that responded.
 
-        # Get recommendations from all models in parallel
-        all_recommendations = self._get_all_recommendations()
+        Ensemble scores are divided by the sum of the weights used, so
+        dropping the missing models renormalizes the remaining ones.
 
+        Returns:
+            The weights of the responding models, or None if the quorum was
+            missed and ``heuristic_fallback`` is enabled
+        """
+        quorum = min(self.min_quorum, len(self.available_models))
+        if len(responses) < quorum:
+            reasons = "; ".join(f"{model}: {reason}" for model, reason in dropped.items())
+            message = (
+                f"Only {len(responses)} of {len(self.available_models)} models responded "
+                f"(quorum is {quorum}). {reasons}"
+            )
+            if self.heuristic_fallback:
+                warnings.warn(f"{message} Falling back to heuristic recommendations.")
+                return None
+            raise PlotSenseAPIError(message)
+
+        if dropped and self.debug:
+            print(f"\n[DEBUG] Dropped models: {dropped}")
+
+        return {model: weight for model, weight in weights.items() if model in responses}
+
+    def _attach_metadata(self,
+                         results: pd.DataFrame,
+                         responses: Dict[str, List[Dict]],
+                         dropped: Dict[str, str]) -> pd.DataFrame:
+        results.attrs['responded_models'] = list(responses)
+        results.attrs['dropped_models'] = dict(dropped)
+        return results
+
+    def _rank_recommendations(self,
+                              all_recommendations: Dict[str, List[Dict]],
+                              weights: Dict[str, float]) -> pd.DataFrame:
+        """Score raw model recommendations and fix their variable order."""
         if self.debug:
             print("\n[DEBUG] Raw recommendations from models:")
             pprint(all_recommendations)
 
+        if self.validate_plots:
+            all_recommendations = {
+                model: self._valid_recommendations(recs, model)
+                for model, recs in all_recommendations.items()
+            }
+
         # Apply weighted ensemble scoring
         ensemble_results = self._apply_ensemble_scoring(
             all_recommendations, weights)
@@ -201,19 +637,54 @@ class VisualizationRecommender:
         # Validate and correct variable order
         if not ensemble_results.empty:
             ensemble_results = self._validate_variable_order(ensemble_results)
+            ensemble_results = self._break_ties_by_correlation(ensemble_results)
+
+        return ensemble_results
+
+    def _valid_recommendations(self, recommendations: List[Dict], model: str) -> List[Dict]:
+        """Drop recommendations that do not meet their plot type's variable requirements."""
+        valid, rejected = self._get_validator().filter(recommendations)
+        if rejected and self.debug:
+            print(f"\n[DEBUG] Rejected {len(rejected)} invalid recommendations from {model}:")
+            for rec, reason in rejected:
+                print(f"  - {rec.get('plot_type')}: {rec.get('variables')} ({reason})")
+        return valid
+
+    def _get_validator(self, key: Optional[Tuple] = None) -> PlotSpecValidator:
+        """Plot spec validator for the current DataFrame, memoized per fingerprint."""
+        key = key or self._profile_key()
+        validator = self._profile_cache.get(('validator', key))
+        if validator is None:
+            validator = PlotSpecValidator.from_profile(self._get_profile(key))
+            self._profile_cache.set(('validator', key), validator)
+        return validator
+
+    def _break_ties_by_correlation(self, results: pd.DataFrame) -> pd.DataFrame:
+        """Among equally scored recommendations, put strongly correlated variable pairs first."""
+        profile = self._get_profile()
+        if not profile.top_pairs:
+            return results
+
+        def strength(variables: str) -> float:
+            names = [v.strip() for v in variables.split(',')]
+            return profile.pair_strength(*names) if len(names) == 2 else 0.0
+
+        order = results.assign(_strength=results['variables'].map(strength)).sort_values(
+            ['ensemble_score', 'model_agreement', '_strength'],
+            ascending=[False, False, False], kind='mergesort')
+        return results.loc[order.index].reset_index(drop=True)
+
+    def _with_dataframe(self, df: pd.DataFrame, **kwargs) -> "VisualizationRecommender":
+        """
+        Shallow copy of this recommender bound to ``df``.
 
-        # If we don't have enough results, try to supplement
-        if len(ensemble_results) < n:
-            if self.debug:
-                print(
-                    f"\n[DEBUG] Only got {len(ensemble_results)} recommendations, trying to supplement")
-            return self._supplement_recommendations(ensemble_results, n)
-
-        if self.debug:
-            print("\n[DEBUG] Ensemble results before filtering:")
-            print(ensemble_results)
-
-        return ensemble_results.head(n)
+        The copy shares clients, caches and weights with the original, so
+        concurrent requests on different DataFrames do not overwrite each
+        other's ``df``.
+        """
+        bound = copy.copy(self)
+        bound.set_dataframe(df, **kwargs)
+        return bound
 
     def _supplement_recommendations(
             self,
@@ -222,7 +693,51 @@ class VisualizationRecommender:
         """Generate additional recommendations if we didn't get enough initially."""
         if len(existing) >= target:
             return existing.head(target)
+        if self.supplement == "heuristic":
+            return self._merge_heuristics(existing, target)
 
+        best_model, prompt = self._create_supplement_request(existing, target)
+
+        try:
+            response = self._query_llm(prompt, best_model)
+            return self._merge_supplement(existing, response, best_model, target)
+        except Exception as e:
+            if self.debug:
+                print(
+                    f"\n[WARNING] Couldn't supplement recommendations: {str(e)}")
+            if self.heuristic_fallback:
+                return self._merge_heuristics(existing, target)
+            return existing.head(target)  # Return what we have
+
+    async def _asupplement_recommendations(
+            self,
+            existing: pd.DataFrame,
+            target: int) -> pd.DataFrame:
+        """Async version of _supplement_recommendations."""
+        if len(existing) >= target:
+            return existing.head(target)
+        if self.supplement == "heuristic":
+            return self._merge_heuristics(existing, target)
+
+        best_model, prompt = self._create_supplement_request(existing, target)
+
+        try:
+            response = await asyncio.wait_for(
+                self._aquery_llm(prompt, best_model), timeout=self.timeout)
+            return self._merge_supplement(existing, response, best_model, target)
+        except Exception as e:
+            if self.debug:
+                print(
+                    f"\n[WARNING] Couldn't supplement recommendations: {str(e)}")
+            if self.heuristic_fallback:
+                return self._merge_heuristics(existing, target)
+            return existing.head(target)
+
+    def _create_supplement_request(
+            self,
+            existing: pd.DataFrame,
+            target: int) -> Tuple[str, str]:
+        """Pick the model and build the prompt for a supplementary request."""
         needed = target - len(existing)
         df_description = self._describe_dataframe()
 
@@ -236,72 +751,305 @@ class VisualizationRecommender:
             Please recommend {needed} ADDITIONAL different visualizations for:
             {df_description}
 
-            Use the same format but ensure they're distinct from the above.
+            {self._supplement_format()}
         """)
+        return best_model, prompt
 
-        try:
-            response = self._query_llm(prompt, best_model)
-            new_recs = self._parse_recommendations(
-                response, f"{best_model}-supplement")
+    def _supplement_format(self) -> str:
+        if self.output_format == "json":
+            return ("Respond with a single JSON object matching this schema, "
+                    f"with suggestions distinct from the above: {json.dumps(RECOMMENDATION_SCHEMA)}")
+        return "Use the same format but ensure they're distinct from the above."
 
-            # Combine with existing
-            combined = pd.concat(
-                [existing, pd.DataFrame(new_recs)], ignore_index=True)
-            combined = combined.drop_duplicates(
-                subset=['plot_type', 'variables'])
+    def _merge_supplement(
+            self,
+            existing: pd.DataFrame,
+            response: str,
+            model: str,
+            target: int) -> pd.DataFrame:
+        """Parse a supplementary response and append it to the existing results."""
+        new_recs = self._parse_recommendations(
+            response, f"{model}-supplement")
+        if self.validate_plots:
+            new_recs = self._valid_recommendations(new_recs, f"{model}-supplement")
+
+        # Combine with existing
+        combined = pd.concat(
+            [existing, pd.DataFrame(new_recs)], ignore_index=True)
+        combined = combined.drop_duplicates(
+            subset=['plot_type', 'variables'])
 
-            if self.debug:
-                print(
-                    f"\n[DEBUG] Supplemented with {len(new_recs)} new recommendations")
+        if self.debug:
+            print(
+                f"\n[DEBUG] Supplemented with {len(new_recs)} new recommendations")
 
-            return combined.head(target)
-        except Exception as e:
-            if self.debug:
-                print(
-                    f"\n[WARNING] Couldn't supplement recommendations: {str(e)}")
-            return existing.head(target)  # Return what we have
+        return combined.head(target)
 
-    def _get_all_recommendations(self) -> Dict[str, List[Dict]]:
-        df_description = self._describe_dataframe()
-        prompt = self._create_prompt(df_description)
+    def _merge_heuristics(self, existing: pd.DataFrame, target: int) -> pd.DataFrame:
+        """Fill up ``existing`` with rule-based recommendations it does not already contain."""
+        extra = self.heuristics.recommend(
+            self._get_profile(), n=target - len(existing), exclude=existing)
 
         if self.debug:
-            print("\n[DEBUG] Prompt being sent to models:")
-            print(prompt)
+            print(f"\n[DEBUG] Supplemented with {len(extra)} heuristic recommendations")
+
+        if existing.empty:
+            return extra
+        return pd.concat([existing, extra], ignore_index=True).head(target)
+
+    def recommend_heuristic(self, n: int = 5) -> pd.DataFrame:
+        """
+        Rule-based recommendations for the current DataFrame, without any API call.
+
+        Args:
+            n: Number of recommendations to return
 
+        Returns:
+            pd.DataFrame: Same columns as recommend_visualizations, with
+            ``source_models`` set to ``['heuristic']``
+        """
+        if self.df is None:
+            raise ValueError("No DataFrame set. Call set_dataframe() first.")
+        self._profile_key_memo = None
+        return self.heuristics.recommend(self._get_profile(), n=n)
+
+    def _get_all_recommendations(self) -> Dict[str, List[Dict]]:
+        """Recommendations per model; models that failed map to an empty list."""
+        responses, dropped = self._collect_recommendations(self._build_prompt())
+        return {**{model: [] for model in dropped}, **responses}
+
+    async def _aget_all_recommendations(self) -> Dict[str, List[Dict]]:
+        loop = asyncio.get_running_loop()
+        prompt = await loop.run_in_executor(self.runtime.executor, self._build_prompt)
+        responses, dropped = await self._acollect_recommendations(prompt)
+        return {**{model: [] for model in dropped}, **responses}
+
+    def _query_func(self, model: str) -> Callable[[str, str], str]:
         model_handlers = {
             'llama': self._query_llm
 
             # Add other model handlers here
         }
 
-        all_recommendations = {}
+        model_type = model.split('-')[0].lower()
+        if model_type.startswith(("llama", "mistral")):
+            model_type = "llama" if "llama" in model_type else "mistral"
+        return model_handlers[model_type]
 
-        with ThreadPoolExecutor() as executor:
-            futures = {}
-            for model in self.available_models:
-                model_type = model.split('-')[0].lower()
-                if model_type.startswith(("llama", "mistral")):
-                    model_type = "llama" if "llama" in model_type else "mistral"
-                query_func = model_handlers[model_type]
-                futures[executor.submit(
-                    self._get_model_recommendations, model, prompt, query_func)] = model
+    def _collect_recommendations(
+            self,
+            prompt: str) -> Tuple[Dict[str, List[Dict]], Dict[str, str]]:
+        """
+        Query every available model in parallel.
 
-            for future in concurrent.futures.as_completed(futures):
-                model = futures[future]
+        Returns:
+            Tuple of (recommendations per responding model,
+            reason per dropped model). A model is dropped when its request
+            fails or it has not responded within ``model_deadline`` seconds.
+        """
+        if self.debug:
+            print("\n[DEBUG] Prompt being sent to models:")
+            print(prompt)
+
+        slots = self._open_slots()
+        deadline = None if self.model_deadline is None else time.monotonic() + self.model_deadline
+        executor = self.runtime.executor
+        futures = {}
+        cancel_events = {}
+
+        def launch(slot: str, target: str):
+            cancelled = threading.Event()
+            future = executor.submit(
+                self._fetch_cancellable, cancelled, target, prompt, self._query_func(target))
+            futures[future] = (slot, target)
+            cancel_events[future] = cancelled
+            slots.launched(slot, hedge=slot in slots.started)
+            return future
+
+        def cancel(future: concurrent.futures.Future):
+            # A running request cannot be interrupted, but one still waiting
+            # for rate-limit budget gives its reservation back
+            future.cancel()
+            cancel_events[future].set()
+
+        pending = {launch(model, model) for model in slots.unresolved}
+
+        # Requests still running at the deadline are left to finish on the
+        # shared pool; their results are ignored
+        while slots.unresolved and pending:
+            done, pending = concurrent.futures.wait(
+                pending, timeout=self._next_wait(slots, deadline),
+                return_when=concurrent.futures.FIRST_COMPLETED)
+
+            for future in done:
                 try:
-                    result = future.result()
-                    all_recommendations[model] = result
-                    if self.debug:
-                        print(
-                            f"\n[DEBUG] Got {len(result)} recommendations from {model}")
+                    resolved = self._complete_slot(slots, *futures[future], recommendations=future.result())
                 except Exception as e:
-                    # Surface API/client failures as configuration/API errors
-                    raise PlotSenseAPIError(
-                        f"Failed to get recommendations from {model}: {str(e)}"
-                    ) from e
+                    resolved = self._complete_slot(slots, *futures[future], error=e)
+                for slot in resolved:
+                    self._on_slot_resolved(slots, slot)
+                    for sibling in [f for f in pending if futures[f][0] == slot]:
+                        cancel(sibling)
+                        pending.discard(sibling)
+
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            for slot, target in self._due_hedges(slots):
+                pending.add(launch(slot, target))
+
+        for future in pending:
+            cancel(future)
+        slots.expire(f"no response within {self.model_deadline}s deadline")
+
+        return slots.responses, slots.dropped
+
+    async def _acollect_recommendations(
+            self,
+            prompt: str) -> Tuple[Dict[str, List[Dict]], Dict[str, str]]:
+        """Async version of _collect_recommendations."""
+        if self.debug:
+            print("\n[DEBUG] Prompt being sent to models:")
+            print(prompt)
+
+        slots = self._open_slots()
+        deadline = None if self.model_deadline is None else time.monotonic() + self.model_deadline
+        tasks = {}
 
-        return all_recommendations
+        def launch(slot: str, target: str):
+            task = asyncio.ensure_future(self._afetch_model_recommendations(target, prompt))
+            tasks[task] = (slot, target)
+            slots.launched(slot, hedge=slot in slots.started)
+            return task
+
+        pending = {launch(model, model) for model in slots.unresolved}
+        try:
+            while slots.unresolved and pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=self._next_wait(slots, deadline),
+                    return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    try:
+                        resolved = self._complete_slot(slots, *tasks[task], recommendations=task.result())
+                    except Exception as e:
+                        resolved = self._complete_slot(slots, *tasks[task], error=e)
+                    for slot in resolved:
+                        self._on_slot_resolved(slots, slot)
+                        for sibling in [t for t in pending if tasks[t][0] == slot]:
+                            sibling.cancel()
+                            pending.discard(sibling)
+
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                for slot, target in self._due_hedges(slots):
+                    pending.add(launch(slot, target))
+        finally:
+            for task in pending:
+                task.cancel()
+
+        slots.expire(f"no response within {self.model_deadline}s deadline")
+        return slots.responses, slots.dropped
+
+    def _open_slots(self) -> ModelSlots:
+        """Slots for every available model, with models behind an open circuit breaker already dropped."""
+        slots = ModelSlots(self.available_models)
+        for model in self.available_models:
+            if self.resilience.breaker.is_open(model):
+                if self.debug:
+                    print(f"\n[DEBUG] Skipping {model}: circuit breaker open")
+                slots.skip(model, "circuit breaker open")
+        return slots
+
+    def _complete_slot(self,
+                       slots: ModelSlots,
+                       slot: str,
+                       target: str,
+                       recommendations: Optional[List[Dict]] = None,
+                       error: Optional[Exception] = None) -> List[str]:
+        """Record a finished request for ``slot`` sent to ``target``; returns the slots it resolved."""
+        if target != slot:
+            # An alternate hedge answers as ``target``, never under the slow model's name and weight
+            return slots.substituted(slot, target, recommendations=recommendations, error=error)
+        return [slot] if slots.completed(slot, recommendations=recommendations, error=error) else []
+
+    def _on_slot_resolved(self, slots: ModelSlots, model: str):
+        if model in slots.dropped and model in slots.errors:
+            self._warn_model_error(model, slots.errors[model])
+        elif model in slots.dropped:
+            if self.debug:
+                print(f"\n[DEBUG] Dropped {model}: {slots.dropped[model]}")
+        elif self.debug:
+            print(
+                f"\n[DEBUG] Got {len(slots.responses[model])} recommendations from {model}")
+
+    def _hedge_threshold(self, model: str) -> float:
+        """Seconds after which a request to ``model`` is hedged."""
+        return self.latency.quantile(model, self.hedge_quantile, default=self.hedge_delay)
+
+    def _hedge_target(self, model: str) -> str:
+        if self.hedge_alternate:
+            alternates = [m for m in self.available_models
+                          if m != model and not self.resilience.breaker.is_open(m)]
+            if alternates:
+                return max(alternates, key=lambda m: self.model_weights.get(m, 0))
+        return model
+
+    def _due_hedges(self, slots: ModelSlots) -> List[Tuple[str, str]]:
+        """(slot, target model) pairs whose primary request has outlived its hedge threshold."""
+        if not self.hedge:
+            return []
+        now = time.monotonic()
+        due = []
+        for model in slots.unresolved:
+            if model not in slots.hedged and now - slots.started[model] >= self._hedge_threshold(model):
+                target = self._hedge_target(model)
+                if self.debug:
+                    print(f"\n[DEBUG] Hedging {model} with a request to {target}")
+                due.append((model, target))
+        return due
+
+    def _next_wait(self, slots: ModelSlots, deadline: Optional[float]) -> Optional[float]:
+        """How long the collector may block before the deadline or the next hedge is due."""
+        now = time.monotonic()
+        waits = []
+        if deadline is not None:
+            waits.append(deadline - now)
+        if self.hedge:
+            waits.extend(
+                slots.started[model] + self._hedge_threshold(model) - now
+                for model in slots.unresolved if model not in slots.hedged
+            )
+        return max(0.0, min(waits)) if waits else None
+
+    async def _afetch_model_recommendations(self, model: str, prompt: str) -> List[Dict]:
+        response = await asyncio.wait_for(
+            self._aquery_llm(prompt, model), timeout=self.timeout)
+
+        if self.debug:
+            print(f"\n[DEBUG] Raw response from {model}:")
+            print(response)
+
+        return self._parse_recommendations(response, model)
+
+    def _fetch_model_recommendations(self,
+                                     model: str,
+                                     prompt: str,
+                                     query_func: Callable[[str, str], str]) -> List[Dict]:
+        response = query_func(prompt, model)
+
+        if self.debug:
+            print(f"\n[DEBUG] Raw response from {model}:")
+            print(response)
+
+        return self._parse_recommendations(response, model)
+
+    def _fetch_cancellable(self, cancelled: threading.Event, *args) -> List[Dict]:
+        """_fetch_model_recommendations on a worker thread, giving up its rate-limit wait once ``cancelled`` is set."""
+        token = _request_cancelled.set(cancelled)
+        try:
+            return self._fetch_model_recommendations(*args)
+        finally:
+            _request_cancelled.reset(token)
 
     def _get_model_recommendations(self,
                                    model: str,
@@ -310,34 +1058,36 @@ class VisualizationRecommender:
                                                          str],
                                                         str]) -> List[Dict]:
         try:
-            response = query_func(prompt, model)
-
-            if self.debug:
-                print(f"\n[DEBUG] Raw response from {model}:")
-                print(response)
-
-            return self._parse_recommendations(response, model)
+            return self._fetch_model_recommendations(model, prompt, query_func)
         except Exception as e:
-            warnings.warn(f"Error processing models {model}: {str(e)}")
-            if self.debug:
-                print(
-                    f"\n[ERROR] Failed to parse response from {model}: {str(e)}")
+            self._warn_model_error(model, e)
             return []
 
+    def _warn_model_error(self, model: str, error: Exception):
+        warnings.warn(f"Error processing models {model}: {str(error)}")
+        if self.debug:
+            print(
+                f"\n[ERROR] Failed to parse response from {model}: {str(error)}")
+
     def _apply_ensemble_scoring(self,
                                 all_recommendations: Dict[str,
                                                           List[Dict]],
                                 weights: Dict[str,
                                               float]) -> pd.DataFrame:
-        output_columns = ['plot_type', 'variables',
-                          'ensemble_score', 'model_agreement', 'source_models']
+        """
+        Combine the models' recommendations into one weighted ranking.
 
+        Each recommendation is keyed by its lower-cased plot type and sorted
+        variables and contributes ``model weight * score``; the contributions
+        are summed per key in a single groupby and normalized by the total
+        model weight.
+        """
         if self.debug:
             print("\n[DEBUG] Applying ensemble scoring with weights:")
             pprint(weights)
 
-        recommendation_weights = defaultdict(float)
-        recommendation_details = {}
+        ranks = self._variable_ranks()
+        candidates = []
 
         for model, recs in all_recommendations.items():
             model_weight = weights.get(model, 0)
@@ -345,113 +1095,166 @@ class VisualizationRecommender:
                 continue
 
             for rec in recs:
-                # Create a consistent key for the recommendation
                 variables = rec['variables']
                 if isinstance(variables, str):
                     variables = [v.strip() for v in variables.split(',')]
 
                 # Filter variables to only those in the DataFrame
-                valid_vars = [
-                    var for var in variables if var in self.df.columns]
+                valid_vars = [var for var in variables if var in ranks]
                 if not valid_vars:
                     if self.debug:
                         print(
                             f"\n[DEBUG] Skipping recommendation from {model} with invalid variables: {variables}")
                     continue
 
-                var_key = ', '.join(sorted(valid_vars))
-                rec_key = (rec['plot_type'].lower(), var_key)
-
-                model_score = rec.get('score', 1.0)
-                total_weight = model_weight * model_score
-                recommendation_weights[rec_key] += total_weight
+                candidates.append((
+                    rec['plot_type'].lower(),
+                    ', '.join(sorted(valid_vars)),
+                    rec['plot_type'],
+                    model,
+                    model_weight * rec.get('score', 1.0),
+                ))
 
-                if rec_key not in recommendation_details:
-                    recommendation_details[rec_key] = {
-                        'plot_type': rec['plot_type'],
-                        'variables': var_key,
-                        'source_models': [model],
-                        'raw_weight': total_weight
-                    }
-                else:
-                    recommendation_details[rec_key]['source_models'].append(
-                        model)
-                    recommendation_details[rec_key]['raw_weight'] += total_weight
-
-        if not recommendation_details:
+        if not candidates:
             if self.debug:
                 print("\n[DEBUG] No valid recommendations after filtering")
-            return pd.DataFrame(columns=output_columns)
+            return pd.DataFrame(columns=OUTPUT_COLUMNS)
 
-        results = pd.DataFrame(list(recommendation_details.values()))
+        candidates = pd.DataFrame(
+            candidates, columns=['plot_key', 'variables', 'plot_type', 'model', 'weight'])
+        results = candidates.groupby(['plot_key', 'variables'], sort=False).agg(
+            plot_type=('plot_type', 'first'),
+            raw_weight=('weight', 'sum'),
+            source_models=('model', list),
+            model_agreement=('model', 'size'),
+        ).reset_index()
 
         if self.debug:
             print("\n[DEBUG] Recommendations before scoring:")
             print(results)
 
-        if not results.empty:
-            total_possible = sum(weights.values())
-            results['ensemble_score'] = results['raw_weight'] / total_possible
-            results['ensemble_score'] = results['ensemble_score'].round(2)
-            results['model_agreement'] = results['source_models'].apply(len)
-            results = results.sort_values(['ensemble_score', 'model_agreement'], ascending=[
-                                          False, False]).reset_index(drop=True)
-            return results[output_columns]
+        total_possible = sum(weights.values())
+        results['ensemble_score'] = (results['raw_weight'] / total_possible).round(2)
+        results = results.sort_values(['ensemble_score', 'model_agreement'], ascending=[
+                                      False, False], kind='mergesort').reset_index(drop=True)
+        return results[OUTPUT_COLUMNS]
 
-        return pd.DataFrame(columns=output_columns)
+    def _variable_ranks(self, key: Optional[Tuple] = None) -> Dict[str, int]:
+        """
+        Sort rank of every column when ordering a recommendation's variables.
 
-    def _describe_dataframe(self) -> str:
-        num_cols = len(self.df.columns)
-        sample_size = min(3, len(self.df))
+        Datetime columns rank 0, numerical 1 and everything else 2. Built from
+        the dtypes once per DataFrame, so lookups do not touch the data.
+        """
+        key = key or self._profile_key()
+        ranks = self._profile_cache.get(('variable_ranks', key))
+        if ranks is None:
+            ranks = {}
+            for column, dtype in self.df.dtypes.items():
+                if pd.api.types.is_datetime64_any_dtype(dtype):
+                    ranks[column] = 0
+                elif pd.api.types.is_numeric_dtype(dtype):
+                    ranks[column] = 1
+                else:
+                    ranks[column] = 2
+            self._profile_cache.set(('variable_ranks', key), ranks)
+        return ranks
+
+    def _profile_key(self) -> Tuple:
+        """
+        Cache key for the current DataFrame and profiling options.
+
+        Fingerprinting a wide frame is not free and a request looks up
+        several cached values, so the key is computed once per request
+        (``set_dataframe`` and ``_prepare_request`` clear it) and reused.
+        """
+        options = (self.profile_sample, self.profile_stratify, tuple(sorted(vars(self.profiler).items())))
+        state = (id(self.df), options)
+        if self._profile_key_memo is None or self._profile_key_memo[0] != state:
+            self._profile_key_memo = (state, (fingerprint_dataframe(self.df), *options))
+        return self._profile_key_memo[1]
+
+    def _get_profile(self, key: Optional[Tuple] = None) -> DataFrameProfile:
+        """Profile the current DataFrame, reusing a memoized profile when the data is unchanged."""
+        key = key or self._profile_key()
+        profile = self._profile_cache.get(('profile', key))
+        if profile is None:
+            profile = self.profiler.profile(
+                self.df, sample=self.profile_sample, stratify=self.profile_stratify)
+            self._profile_cache.set(('profile', key), profile)
+        elif self.debug:
+            print("\n[DEBUG] Reusing cached DataFrame profile")
+        return profile
+
+    def _describe_dataframe(self, key: Optional[Tuple] = None) -> str:
+        key = key or self._profile_key()
+        budget = self._description_budget()
+        description = self._profile_cache.get(('description', key, budget))
+        if description is None:
+            profile = self._get_profile(key)
+            description = self._format_profile(profile)
+            if budget is not None and estimate_tokens(description) > budget:
+                if self.debug:
+                    print(f"\n[DEBUG] Compacting dataset description to {budget} tokens")
+                description = compact_description(profile, budget)
+            self._profile_cache.set(('description', key, budget), description)
+        return description
+
+    def _description_budget(self) -> Optional[int]:
+        """Tokens left for the dataset description under ``max_prompt_tokens``."""
+        if self.max_prompt_tokens is None:
+            return None
+        # A multi-line placeholder keeps dedent from stripping the template's
+        # indentation, exactly as a real description does
+        placeholder = "-\n-"
+        template = self._create_prompt(placeholder)
+        overhead = len(template) - len(placeholder)
+        budget = self.max_prompt_tokens - estimate_tokens(" " * overhead) - 1
+        if budget <= 0:
+            raise PlotSenseConfigError(
+                f"max_prompt_tokens={self.max_prompt_tokens} leaves no room for the dataset description")
+        return budget
+
+    def _build_prompt(self) -> str:
+        """Recommendation prompt for the current DataFrame, memoized per fingerprint."""
+        key = self._profile_key()
+        cache_key = ('prompt', key, self.n_to_request, self.max_prompt_tokens, self.output_format)
+        prompt = self._profile_cache.get(cache_key)
+        if prompt is None:
+            description = self._describe_dataframe(key)
+            if self.output_format == "json":
+                prompt = self._create_json_prompt(description)
+            else:
+                prompt = self._create_prompt(description)
+            self._profile_cache.set(cache_key, prompt)
+        return prompt
+
+    def _format_profile(self, profile: DataFrameProfile) -> str:
+        """Render a DataFrameProfile as the dataset description used in prompts."""
+        num_cols = len(profile.columns)
         desc: List[str] = []
 
         # --- Basic Metadata ---
-        desc.append(f"DataFrame Shape: {self.df.shape}")
-        desc.append(f"Columns ({num_cols}): {', '.join(self.df.columns)}")
+        desc.append(f"DataFrame Shape: {profile.shape}")
+        desc.append(f"Columns ({num_cols}): {', '.join(profile.columns)}")
         desc.append("\nColumn Details:")
 
         # --- Column-Level Analysis ---
-        for col in self.df.columns:
-            # Determine semantic type (more granular than dtype)
-            if pd.api.types.is_datetime64_dtype(self.df[col]):
-                col_type = "datetime"
-            elif pd.api.types.is_numeric_dtype(self.df[col]):
-                col_type = "numerical"
-            elif self.df[col].nunique() / len(self.df[col]) < 0.05:  # Low cardinality
-                col_type = "categorical"
-            else:
-                col_type = "text/other"
-
-            # Basic info
-            unique_count = self.df[col].nunique()
-            sample_values = self.df[col].dropna().head(sample_size).tolist()
-            desc.append(
-                f"- {col}: {col_type} ({unique_count} unique values), sample: {sample_values}")
-
-            # Add stats for numerical/datetime
-            if col_type == "numerical":
-                desc.append(
-                    f"  Stats: min={self.df[col].min()}, max={self.df[col].max()}, "
-                    f"mean={self.df[col].mean():.2f}, missing={self.df[col].isna().sum()}")
-            elif col_type == "datetime":
-                desc.append(
-                    f"  Range: {self.df[col].min()} to {self.df[col].max()}, "
-                    f"missing={self.df[col].isna().sum()}"
-                )
+        for info in profile.columns.values():
+            desc.extend(column_lines(info))
 
         # --- Relationship Analysis ---
-        numerical_cols = self.df.select_dtypes(
-            include=np.number).columns.tolist()
-        if len(numerical_cols) > 1:
+        numerical_cols = profile.numerical_columns
+        if profile.correlations is not None:
             desc.append("\nNumerical Variable Correlations (Pearson):")
-            corr = self.df[numerical_cols].corr().round(2)
-            desc.append(str(corr))
+            desc.append(str(profile.correlations.round(2)))
+        elif profile.top_pairs:
+            # Wide frames: only the strongest pairs were computed
+            desc.append("\nStrongest Numerical Correlations (Pearson):")
+            desc.extend(f"- {a} ~ {b}: {r:.2f}" for a, b, r in profile.top_pairs)
 
         # Categorical-numerical potential groupings
-        categorical_cols = [
-            col for col in self.df.columns
-            if self.df[col].nunique() / len(self.df[col]) < 0.05
-        ]
+        categorical_cols = profile.categorical_columns
         if categorical_cols and numerical_cols:
             desc.append("\nPotential Groupings (categorical vs numerical):")
             desc.append(f"  - Could group by: {categorical_cols}")
@@ -466,13 +1269,64 @@ class VisualizationRecommender:
             {df_description}
 
             Recommend {self.n_to_request} insightful visualizations using matplotlib's plotting functions.
+{textwrap.indent(self._response_format(), " " * 12)}
+
+{textwrap.indent(self._plot_rules(), " " * 12)}
+            Example CORRECT suggestions (NUMERICAL FIRST):
+            Plot Type: boxplot
+            Variables: income, gender
+            Rationale: Compares income distribution across genders
+            ---
+            Plot Type: scatter
+            Variables: age, income
+            Rationale: Shows relationship between age and income
+            ---
+            Plot Type: bar
+            Variables: revenue, product_category
+            Rationale: Compares revenue across product categories
+
+            Example INCORRECT suggestions (REJECT THESE):
+            Plot Type: boxplot
+            Variables: gender, income  # WRONG - categorical listed first
+            ---
+            Plot Type: scatter
+            Variables: price, weight  # WRONG - no clear priority order
+            Rationale: Should specify independent/dependent variable order
+        """)
+
+    def _create_json_prompt(self, df_description: str) -> str:
+        return textwrap.dedent(f"""
+            You are a data visualization expert analyzing this dataset:
+
+            {df_description}
+
+            Recommend {self.n_to_request} insightful visualizations using matplotlib's plotting functions.
+{textwrap.indent(self._response_format(), " " * 12)}
+
+{textwrap.indent(self._plot_rules(), " " * 12)}
+            Example CORRECT response (NUMERICAL FIRST):
+            {json.dumps(JSON_EXAMPLE)}
+        """)
+
+    def _response_format(self) -> str:
+        """Instructions for the response format, in the configured output format."""
+        if self.output_format == "json":
+            return textwrap.dedent(f"""\
+                Respond with a single JSON object and nothing else, matching this schema:
+                {json.dumps(RECOMMENDATION_SCHEMA)}
+
+                Keep each rationale to at most {MAX_RATIONALE_WORDS} words.""")
+        return textwrap.dedent("""\
             For each suggestion, follow this exact format:
 
             Plot Type: <matplotlib function name - exact, like bar, scatter, hist, boxplot, pie, contour, quiver, etc.>
             Variables: <comma-separated list of variables WITH NUMERICAL VARIABLES FIRST>
             Rationale: <1-2 sentences explaining why this visualization is useful>
-            ---
+            ---""")
 
+    def _plot_rules(self) -> str:
+        """Variable ordering and plot type rules shared by the text and JSON prompts."""
+        return textwrap.dedent("""\
             CRITICAL VARIABLE ORDERING RULES:
             1. If a suggestion includes both numerical and categorical variables, NUMERICAL VARIABLES MUST COME FIRST.
             - Correct: "income, gender"
@@ -522,45 +1376,105 @@ class VisualizationRecommender:
             2. Consider the statistical properties and relationships of the variables
             3. Suggest plots that would reveal meaningful insights about the data
             4. Include both common and advanced plots when appropriate
-
-            Example CORRECT suggestions (NUMERICAL FIRST):
-            Plot Type: boxplot
-            Variables: income, gender
-            Rationale: Compares income distribution across genders
-            ---
-            Plot Type: scatter
-            Variables: age, income
-            Rationale: Shows relationship between age and income
-            ---
-            Plot Type: bar
-            Variables: revenue, product_category
-            Rationale: Compares revenue across product categories
-
-            Example INCORRECT suggestions (REJECT THESE):
-            Plot Type: boxplot
-            Variables: gender, income  # WRONG - categorical listed first
-            ---
-            Plot Type: scatter
-            Variables: price, weight  # WRONG - no clear priority order
-            Rationale: Should specify independent/dependent variable order
-        """)
+""")
 
     def _query_llm(self, prompt: str, model: str) -> str:
         if not self.clients.get('groq'):
             raise PlotSenseDataError("Groq client not initialized")
 
-        try:
+        params = self._generation_params()
+        cached = self._cached_response(model, prompt, params)
+        if cached is not None:
+            return cached
+
+        tokens = estimate_tokens(prompt) + params['max_tokens']
+
+        def attempt():
+            self.rate_limiter.acquire(model, tokens, cancelled=_request_cancelled.get())
+            start = time.monotonic()
             response = self.clients['groq'].chat.completions.create(
                 model=model,
                 messages=[{"role": "user", "content": prompt}],
-                temperature=0.4,
-                max_tokens=1000,
-                timeout=self.timeout
+                timeout=self.timeout,
+                **params
+            )
+            self.latency.record(model, time.monotonic() - start)
+            return response
+
+        try:
+            response = self.resilience.call(model, attempt)
+            content = response.choices[0].message.content
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            raise PlotSenseAPIError(f"Groq API query failed for {model}: {str(e)}")
+
+        self._store_response(model, prompt, content, params)
+        return content
+
+    async def _aquery_llm(self, prompt: str, model: str) -> str:
+        if not self.clients.get('groq'):
+            raise PlotSenseDataError("Groq client not initialized")
+
+        params = self._generation_params()
+        cached = self._cached_response(model, prompt, params)
+        if cached is not None:
+            return cached
+
+        tokens = estimate_tokens(prompt) + params['max_tokens']
+
+        async def attempt():
+            await self.rate_limiter.aacquire(model, tokens)
+            start = time.monotonic()
+            response = await self._get_async_client('groq').chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=self.timeout,
+                **params
             )
-            return response.choices[0].message.content
+            self.latency.record(model, time.monotonic() - start)
+            return response
+
+        try:
+            response = await self.resilience.acall(model, attempt)
+            content = response.choices[0].message.content
+        except CircuitOpenError:
+            raise
         except Exception as e:
             raise PlotSenseAPIError(f"Groq API query failed for {model}: {str(e)}")
 
+        self._store_response(model, prompt, content, params)
+        return content
+
+    def _get_async_client(self, provider: str):
+        """Async client for ``provider`` on the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        clients = self._async_clients.setdefault(loop, {})
+        if provider not in clients:
+            clients[provider] = AsyncGroq(
+                api_key=self.api_keys[provider], max_retries=0,
+                http_client=self.runtime.async_http_client())
+        return clients[provider]
+
+    def _generation_params(self) -> Dict:
+        if self.output_format == "json":
+            return {'temperature': self.TEMPERATURE,
+                    'max_tokens': json_max_tokens(self.n_to_request, self.MAX_TOKENS),
+                    'response_format': JSON_RESPONSE_FORMAT}
+        return {'temperature': self.TEMPERATURE, 'max_tokens': self.MAX_TOKENS}
+
+    def _cached_response(self, model: str, prompt: str, params: Dict) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        cached = self.response_cache.get(model, prompt, **params)
+        if cached is not None and self.debug:
+            print(f"\n[DEBUG] Cache hit for {model}")
+        return cached
+
+    def _store_response(self, model: str, prompt: str, content: str, params: Dict):
+        if self.response_cache is not None and content:
+            self.response_cache.set(model, prompt, content, **params)
+
     def _validate_variable_order(
             self, recommendations: pd.DataFrame) -> pd.DataFrame:
         """
@@ -573,36 +1487,18 @@ class VisualizationRecommender:
         Returns:
             DataFrame with corrected variable order
         """
-        def _reorder_variables(row):
-            # Split variables
-            variables = [var.strip() for var in row['variables'].split(',')]
+        ranks = self._variable_ranks()
 
-            # Identify numerical and non-numerical variables
-            numerical_vars = [
-                var for var in variables
-                if pd.api.types.is_numeric_dtype(self.df[var])
-            ]
+        def _reorder_variables(variables: str) -> str:
+            # Datetime, then numerical, then other variables; stable within each
+            names = [var.strip() for var in variables.split(',')]
+            return ', '.join(sorted(names, key=lambda var: ranks.get(var, 2)))
 
-            date_vars = [
-                var for var in variables
-                if pd.api.types.is_datetime64_any_dtype(self.df[var])
-            ]
-
-            non_numerical_vars = [
-                var for var in variables
-                if var not in numerical_vars and var not in date_vars
-            ]
-
-            # Combine with numerical variables first
-            corrected_vars = date_vars + numerical_vars + non_numerical_vars
-
-            # Update the row with corrected variable order
-            row['variables'] = ', '.join(corrected_vars)
-            return row
-
-        # Apply reordering
-        corrected_recommendations = recommendations.apply(
-            _reorder_variables, axis=1)
+        # Each distinct variable list is reordered once
+        reordered = {variables: _reorder_variables(variables)
+                     for variables in recommendations['variables'].unique()}
+        corrected_recommendations = recommendations.assign(
+            variables=recommendations['variables'].map(reordered))
 
         if self.debug:
             print("\n[DEBUG] Variable Order Validation:")
@@ -615,6 +1511,15 @@ class VisualizationRecommender:
 
     def _parse_recommendations(self, response: str, model: str) -> List[Dict]:
         """Parse the LLM response into structured recommendations"""
+        # Text answers may mention braces or lists in prose, so only a JSON
+        # request or a response that opens like JSON goes through the JSON parser
+        if self.output_format == "json" or response.lstrip().startswith(('{', '[', '```')):
+            parsed = parse_json_recommendations(response, model, self.df.columns)
+            if parsed is not None:
+                if self.debug:
+                    print(f"\n[DEBUG] Parsed {len(parsed)} JSON recommendations from {model}")
+                return parsed
+
         recommendations = []
 
         # Split response into recommendation blocks
@@ -660,12 +1565,34 @@ class VisualizationRecommender:
 _recommender_instance = None
 
 
+def _merge_ranked(existing: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """
+    Union of two ranked recommendation frames, best score first, keeping the better duplicate.
+
+    ``new`` wins ties: suggestions for new columns usually score as high as
+    the existing top rows, and would otherwise never make the top ``n``.
+    """
+    if new.empty:
+        return existing.reset_index(drop=True)
+    if existing.empty:
+        return new[OUTPUT_COLUMNS].reset_index(drop=True)
+    combined = pd.concat([new[OUTPUT_COLUMNS], existing[OUTPUT_COLUMNS]], ignore_index=True)
+    combined = combined.sort_values(
+        ['ensemble_score', 'model_agreement'], ascending=[False, False], kind='mergesort')
+    keys = [recommendation_key(p, v) for p, v in zip(combined['plot_type'], combined['variables'])]
+    return combined[~pd.Series(keys, index=combined.index).duplicated()].reset_index(drop=True)
+
+
 def recommender(
     df: pd.DataFrame,
     n: int = 5,
     api_keys: dict = {},
     custom_weights: Optional[Dict[str, float]] = None,
-    debug: bool = False
+    debug: bool = False,
+    response_cache: Optional[Union[bool, ResponseCache]] = None,
+    profile_sample: Optional[Union[int, float]] = None,
+    profile_stratify: Optional[str] = None,
+    delta: bool = False
 ) -> pd.DataFrame:
     """
     Generate visualization recommendations using weighted ensemble of LLMs.
@@ -676,17 +1603,68 @@ def recommender(
         api_keys: Dictionary of API keys
         custom_weights: Optional dictionary to override default model weights
         debug: Enable debug output
+        response_cache: Optional ResponseCache (or True for the default
+            on-disk cache) used for LLM responses
+        profile_sample: Optional number (int) or fraction (float) of rows to
+            profile instead of the whole DataFrame
+        profile_stratify: Optional column to stratify the profiling sample by
+        delta: Only ask about columns added or changed since the previous
+            ``delta=True`` call and merge into its results
 
     Returns:
         pd.DataFrame: Recommended visualizations with ensemble scores
     """
+    instance = _get_recommender_instance(api_keys, debug, response_cache)
+    instance.set_dataframe(
+        df, profile_sample=profile_sample, profile_stratify=profile_stratify)
+    return instance.recommend_visualizations(
+        n=n,
+        custom_weights=custom_weights,
+        delta=delta
+    )
+
+
+async def arecommender(
+    df: pd.DataFrame,
+    n: int = 5,
+    api_keys: dict = {},
+    custom_weights: Optional[Dict[str, float]] = None,
+    debug: bool = False,
+    response_cache: Optional[Union[bool, ResponseCache]] = None,
+    profile_sample: Optional[Union[int, float]] = None,
+    profile_stratify: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Async version of recommender().
+
+    Safe to await concurrently on different DataFrames: each call works on
+    its own view of the shared recommender (clients and caches are shared).
+
+    Args:
+        Same as recommender()
+
+    Returns:
+        pd.DataFrame: Recommended visualizations with ensemble scores
+    """
+    instance = _get_recommender_instance(api_keys, debug, response_cache)
+    bound = instance._with_dataframe(
+        df, profile_sample=profile_sample, profile_stratify=profile_stratify)
+    return await bound.arecommend(n=n, custom_weights=custom_weights)
+
+
+def _get_recommender_instance(
+    api_keys: dict,
+    debug: bool,
+    response_cache: Optional[Union[bool, ResponseCache]]
+) -> VisualizationRecommender:
     global _recommender_instance
     if _recommender_instance is None:
         _recommender_instance = VisualizationRecommender(
-            api_keys=api_keys, debug=debug)
-
-    _recommender_instance.set_dataframe(df)
-    return _recommender_instance.recommend_visualizations(
-        n=n,
-        custom_weights=custom_weights
-    )
+            api_keys=api_keys, debug=debug, response_cache=response_cache)
+    elif response_cache is True:
+        # Keep an attached cache, with its connection and hit/miss counters
+        if _recommender_instance.response_cache is None:
+            _recommender_instance.response_cache = ResponseCache()
+    elif response_cache is not None:
+        _recommender_instance.response_cache = response_cache or None
+    return _recommender_instance
@@ -0,0 +1,142 @@
+from itertools import permutations
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+from plotsense.visual_suggestion.profiling import DataFrameProfile
+
+
+NUMERICAL = "numerical"
+CATEGORICAL = "categorical"
+DATETIME = "datetime"
+
+# (required roles, role allowed for any further variables or None)
+Signature = Tuple[Tuple[str, ...], Optional[str]]
+
+N, C, D = NUMERICAL, CATEGORICAL, DATETIME
+
+# Distinct values up to which a non-numeric column can act as a category,
+# even if it is too many relative to the row count to profile as categorical
+MAX_CATEGORIES = 50
+
+# Variable requirements per plot type, as listed in the recommendation prompt
+PLOT_REQUIREMENTS: Dict[str, List[Signature]] = {
+    'bar': [((N, C), None)],
+    'barh': [((N, C), None)],
+    'scatter': [((N, N), None)],
+    'hist': [((N,), None)],
+    'boxplot': [((N,), None), ((N, C), None)],
+    'violinplot': [((N,), None), ((N, C), None)],
+    'pie': [((C,), None)],
+    'line': [((N,), None), ((N, D), None)],
+    'heatmap': [((N, C, C), None), ((N, N), N)],
+    'hexbin': [((N, N), None)],
+    'pairplot': [((N, N), N)],
+    'jointplot': [((N, N), None)],
+    'contour': [((N, N, N), None)],
+    'quiver': [((N, N, N, N), None)],
+    'imshow': [((N,), N)],
+    'errorbar': [((N, N, N), None)],
+    'stackplot': [((N, N), N)],
+    'stem': [((N, N), None)],
+    'fill_between': [((N, N, N), None)],
+    'pcolormesh': [((N, N, N), None)],
+    'polar': [((N, N), None)],
+}
+
+
+class PlotSpecValidator:
+    """
+    Check recommended (plot type, variables) pairs against the plot requirements.
+
+    Column roles are derived once from a :class:`DataFrameProfile`: a column
+    is numerical or datetime by kind, and categorical if it has low
+    cardinality (so a 0/1 flag can fill either role) or is a non-numeric
+    column with at most ``MAX_CATEGORIES`` distinct values. Each check is a
+    dictionary lookup plus a match over a handful of variables.
+    """
+
+    def __init__(self,
+                 roles: Dict[str, FrozenSet[str]],
+                 allow_unknown: bool = True):
+        """
+        Args:
+            roles: Roles each column can fill
+            allow_unknown: Accept plot types without listed requirements
+        """
+        self.roles = roles
+        self.allow_unknown = allow_unknown
+
+    @classmethod
+    def from_profile(cls, profile: DataFrameProfile, allow_unknown: bool = True) -> "PlotSpecValidator":
+        roles = {}
+        for name, info in profile.columns.items():
+            column_roles = set()
+            if info.kind in (NUMERICAL, DATETIME):
+                column_roles.add(info.kind)
+            if info.kind != DATETIME and (
+                    info.low_cardinality or (info.kind != NUMERICAL and info.unique_count <= MAX_CATEGORIES)):
+                column_roles.add(CATEGORICAL)
+            roles[name] = frozenset(column_roles)
+        return cls(roles, allow_unknown=allow_unknown)
+
+    def validate(self, plot_type: str, variables: Sequence[str]) -> Optional[str]:
+        """Return why the suggestion is invalid, or None if it is valid."""
+        plot_type = plot_type.strip().lower()
+        variables = [v.strip() for v in variables]
+
+        missing = [v for v in variables if v not in self.roles]
+        if missing:
+            return f"unknown columns {missing}"
+        if len(set(variables)) != len(variables):
+            return "repeated variables"
+
+        signatures = PLOT_REQUIREMENTS.get(plot_type)
+        if signatures is None:
+            return None if self.allow_unknown else f"unsupported plot type '{plot_type}'"
+
+        for required, extra in signatures:
+            if self._matches(variables, required, extra):
+                return None
+        return f"{plot_type} needs {_describe(signatures)}, got {self._describe_variables(variables)}"
+
+    def is_valid(self, plot_type: str, variables: Sequence[str]) -> bool:
+        return self.validate(plot_type, variables) is None
+
+    def filter(self, recommendations: List[Dict]) -> Tuple[List[Dict], List[Tuple[Dict, str]]]:
+        """
+        Split parsed recommendations into valid ones and (rejected, reason) pairs.
+
+        ``variables`` may be a comma-separated string or a list.
+        """
+        valid, rejected = [], []
+        for rec in recommendations:
+            variables = rec.get('variables', [])
+            if isinstance(variables, str):
+                variables = [v for v in variables.split(',') if v.strip()]
+            reason = self.validate(rec.get('plot_type', ''), variables)
+            if reason is None:
+                valid.append(rec)
+            else:
+                rejected.append((rec, reason))
+        return valid, rejected
+
+    def _matches(self, variables: List[str], required: Tuple[str, ...], extra: Optional[str]) -> bool:
+        if len(variables) < len(required) or (extra is None and len(variables) != len(required)):
+            return False
+        for chosen in permutations(range(len(variables)), len(required)):
+            if all(role in self.roles[variables[i]] for i, role in zip(chosen, required)):
+                rest = set(range(len(variables))) - set(chosen)
+                if all(extra in self.roles[variables[i]] for i in rest):
+                    return True
+        return False
+
+    def _describe_variables(self, variables: List[str]) -> str:
+        return ", ".join(f"{v} ({'/'.join(sorted(self.roles[v])) or 'text'})" for v in variables)
+
+
+def _describe(signatures: List[Signature]) -> str:
+    options = []
+    for required, extra in signatures:
+        option = " + ".join(required)
+        if extra:
+            option += f" (+ more {extra})"
+        options.append(option)
+    return " or ".join(options)
@@ -38,6 +38,7 @@ setup(
         "numpy>=1.18",
         "python-dotenv",
         "groq",
+        "httpx",
         "requests",
         "Pillow>=9.0.0",
     ],
@@ -219,6 +219,18 @@ def reset_random_seed():
     yield
 
 
+@pytest.fixture(autouse=True)
+def reset_resilience():
+    """Give every test a fresh process-wide retry policy, circuit breaker and rate limiter."""
+    from plotsense.ratelimit import set_default_limiter
+    from plotsense.resilience import set_default_caller
+    set_default_caller(None)
+    set_default_limiter(None)
+    yield
+    set_default_caller(None)
+    set_default_limiter(None)
+
+
 # ============================================================================
 # Markers helpers
 # ============================================================================
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import patch
+
+# SUT
+from plotsense.visual_suggestion.batch import recommend_many
+from plotsense.visual_suggestion.suggestions import VisualizationRecommender
+
+
+RESPONSE = """
+Plot Type: scatter
+Variables: value, count
+---
+Plot Type: hist
+Variables: value
+---
+Plot Type: boxplot
+Variables: value, category
+"""
+
+
+def make_frame(seed, n=60):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "value": rng.normal(0, 1, n),
+        "count": rng.integers(0, 100, n),
+        "category": rng.choice(list("ABC"), n),
+    })
+
+
+@pytest.fixture
+def recommender():
+    return VisualizationRecommender(api_keys={"groq": "x"})
+
+
+class TestRecommendMany:
+    def test_results_for_every_table(self, recommender):
+        frames = {f"t{i}": make_frame(i) for i in range(4)}
+        with patch.object(VisualizationRecommender, '_query_llm', return_value=RESPONSE):
+            results = dict(recommend_many(frames, n=3, recommender=recommender, processes=0))
+        assert set(results) == set(frames)
+        for result in results.values():
+            assert isinstance(result, pd.DataFrame)
+            assert result['plot_type'].tolist() == ['scatter', 'hist', 'boxplot']
+
+    def test_identical_prompts_share_model_calls(self, recommender):
+        frame = make_frame(0)
+        frames = {"a": frame, "b": frame.copy(), "c": make_frame(1)}
+        with patch.object(VisualizationRecommender, '_query_llm', return_value=RESPONSE) as query:
+            results = dict(recommend_many(frames, n=3, recommender=recommender, processes=0))
+        assert len(results) == 3
+        assert query.call_count == 2 * len(recommender.available_models)
+
+    def test_failed_table_yields_exception(self, recommender):
+        with patch.object(VisualizationRecommender, '_query_llm', return_value=RESPONSE):
+            results = dict(recommend_many({"good": make_frame(0), "none": None},
+                                          n=3, recommender=recommender, processes=0))
+        assert isinstance(results["good"], pd.DataFrame)
+        assert isinstance(results["none"], Exception)
+
+    def test_streams_and_stops_early(self, recommender):
+        frames = {f"t{i}": make_frame(i) for i in range(6)}
+        with patch.object(VisualizationRecommender, '_query_llm', return_value=RESPONSE):
+            stream = recommend_many(frames, n=3, recommender=recommender, processes=0, max_concurrency=1)
+            name, result = next(stream)
+            stream.close()
+        assert name in frames
+        assert isinstance(result, pd.DataFrame)
+
+    def test_offline(self):
+        offline = VisualizationRecommender(offline=True)
+        results = dict(recommend_many({"a": make_frame(0)}, n=2, recommender=offline, processes=0))
+        assert results["a"]['source_models'].tolist() == [['heuristic'], ['heuristic']]
+
+    def test_process_profiling(self, recommender):
+        frames = {f"t{i}": make_frame(i) for i in range(2)}
+        with patch.object(VisualizationRecommender, '_query_llm', return_value=RESPONSE):
+            results = dict(recommend_many(frames, n=3, recommender=recommender, processes=1))
+        assert all(isinstance(result, pd.DataFrame) for result in results.values())
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+# SUT
+from plotsense.visual_suggestion.cache import ResponseCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ResponseCache(cache_dir=str(tmp_path), ttl=60, max_entries=3)
+    yield c
+    c.close()
+
+
+class TestResponseCache:
+    def test_miss_then_hit(self, cache):
+        assert cache.get("model-a", "prompt", temperature=0.4, max_tokens=1000) is None
+        cache.set("model-a", "prompt", "response", temperature=0.4, max_tokens=1000)
+        assert cache.get("model-a", "prompt", temperature=0.4, max_tokens=1000) == "response"
+        assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    def test_key_includes_model_and_params(self, cache):
+        cache.set("model-a", "prompt", "response", temperature=0.4, max_tokens=1000)
+        assert cache.get("model-b", "prompt", temperature=0.4, max_tokens=1000) is None
+        assert cache.get("model-a", "prompt", temperature=0.7, max_tokens=1000) is None
+        assert cache.get("model-a", "other", temperature=0.4, max_tokens=1000) is None
+
+    def test_ttl_expiry(self, tmp_path):
+        c = ResponseCache(cache_dir=str(tmp_path), ttl=0.01)
+        c.set("m", "p", "r")
+        time.sleep(0.05)
+        assert c.get("m", "p") is None
+        assert c.stats()["entries"] == 0
+        c.close()
+
+    def test_lru_eviction(self, cache):
+        for i in range(3):
+            cache.set("m", f"p{i}", f"r{i}")
+            time.sleep(0.01)
+        cache.get("m", "p0")  # p0 becomes most recently used
+        cache.set("m", "p3", "r3")
+        assert cache.stats()["entries"] == 3
+        assert cache.get("m", "p1") is None
+        assert cache.get("m", "p0") == "r0"
+
+    def test_persists_across_instances(self, tmp_path):
+        first = ResponseCache(cache_dir=str(tmp_path))
+        first.set("m", "p", "r")
+        first.close()
+        second = ResponseCache(cache_dir=str(tmp_path))
+        assert second.get("m", "p") == "r"
+        second.close()
+
+    def test_clear(self, cache):
+        cache.set("m", "p", "r")
+        cache.clear()
+        assert cache.stats() == {"hits": 0, "misses": 0, "entries": 0}
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# SUT
+from plotsense.visual_suggestion.correlation import (
+    top_correlation_pairs, top_correlations, top_correlations_involving)
+from plotsense.visual_suggestion.profiling import DataFrameProfiler
+
+
+@pytest.fixture
+def wide_numeric():
+    n = 500
+    rng = np.random.default_rng(3)
+    data = rng.normal(size=(n, 80))
+    data[:, 10] = data[:, 3] * 0.9 + rng.normal(scale=0.1, size=n)
+    data[:, 70] = -data[:, 5] + rng.normal(scale=0.3, size=n)
+    return pd.DataFrame(data, columns=[f"c{i}" for i in range(80)])
+
+
+class TestTopCorrelations:
+    @pytest.mark.parametrize("block_size", [7, 256])
+    def test_matches_dense(self, wide_numeric, block_size):
+        expected = top_correlation_pairs(wide_numeric.corr(), 10)
+        pairs = top_correlations(wide_numeric, k=10, block_size=block_size)
+        assert [p[:2] for p in pairs] == [p[:2] for p in expected]
+        assert [p[2] for p in pairs] == pytest.approx([p[2] for p in expected], abs=1e-4)
+
+    def test_strongest_pairs_first(self, wide_numeric):
+        pairs = top_correlations(wide_numeric, k=2)
+        assert pairs[0][:2] == ("c3", "c10")
+        assert pairs[1][:2] == ("c5", "c70")
+        assert pairs[1][2] < 0
+
+    def test_constant_and_missing_columns(self):
+        df = pd.DataFrame({
+            "a": [1.0, 2.0, 3.0, 4.0],
+            "b": [2.0, 4.0, np.nan, 8.0],
+            "constant": [1.0] * 4,
+            "empty": [np.nan] * 4,
+        })
+        pairs = top_correlations(df, k=5)
+        assert [p[:2] for p in pairs] == [("a", "b")]
+
+    def test_degenerate_inputs(self):
+        assert top_correlations(pd.DataFrame({"a": [1.0, 2.0]}), k=3) == []
+        assert top_correlations(pd.DataFrame({"a": [1.0, 2.0], "b": [2.0, 1.0]}), k=0) == []
+
+    @pytest.mark.parametrize("block_size", [1, 256])
+    def test_involving_matches_dense(self, wide_numeric, block_size):
+        columns = ["c3", "c70", "c71"]
+        dense = top_correlation_pairs(wide_numeric.corr(), 80 * 79 // 2)
+        expected = [p for p in dense if p[0] in columns or p[1] in columns][:8]
+        pairs = top_correlations_involving(wide_numeric, columns, k=8, block_size=block_size)
+        assert [p[:2] for p in pairs] == [p[:2] for p in expected]
+        assert [p[2] for p in pairs] == pytest.approx([p[2] for p in expected], abs=1e-4)
+        assert top_correlations_involving(wide_numeric, ["missing"], k=3) == []
+
+
+class TestProfilerCorrelation:
+    def test_auto_switches_to_topk(self, wide_numeric):
+        profile = DataFrameProfiler(max_pairs=5).profile(wide_numeric)
+        assert profile.correlations is None
+        assert len(profile.top_pairs) == 5
+        assert profile.scatter_candidates(0.97) == [profile.top_pairs[0]]
+        assert profile.pair_strength("c10", "c3") == pytest.approx(0.99, abs=0.01)
+
+        narrow = DataFrameProfiler().profile(wide_numeric.iloc[:, :5])
+        assert narrow.correlations is not None
+        assert len(narrow.top_pairs) == 10
+
+    def test_correlation_sample(self, wide_numeric):
+        profile = DataFrameProfiler(correlation="topk", correlation_sample=200).profile(wide_numeric)
+        assert profile.top_pairs[0][:2] == ("c3", "c10")
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            DataFrameProfiler(correlation="sparse")
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+import matplotlib
+import matplotlib.pyplot as plt
+from plotsense.plot_generator.density import DensityGrid, normalize, render_density
+
+matplotlib.use('Agg')
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    return rng.normal(0, 1, 50_000), rng.normal(0, 1, 50_000)
+
+
+class TestDensityGrid:
+    def test_matches_histogram2d(self, points):
+        x, y = points
+        grid = DensityGrid.from_arrays(x, y, bins=(40, 30))
+        expected, _, _ = np.histogram2d(x, y, bins=(40, 30), range=[grid.x_range, grid.y_range])
+        assert np.array_equal(grid.counts, expected)
+        assert grid.total == len(x)
+
+    def test_chunked_accumulation_matches_single_pass(self, points):
+        x, y = points
+        whole = DensityGrid.from_arrays(x, y, bins=50)
+        chunked = DensityGrid.from_arrays(x, y, bins=50, chunk_size=7_000)
+        assert np.array_equal(whole.counts, chunked.counts)
+
+        streamed = DensityGrid(whole.x_range, whole.y_range, bins=50)
+        for start in range(0, len(x), 10_000):
+            streamed.add(x[start:start + 10_000], y[start:start + 10_000])
+        assert np.array_equal(whole.counts, streamed.counts)
+
+    def test_merge(self, points):
+        x, y = points
+        left = DensityGrid((-5, 5), (-5, 5), bins=20).add(x[:100], y[:100])
+        right = DensityGrid((-5, 5), (-5, 5), bins=20).add(x[100:], y[100:])
+        assert left.merge(right).total == len(x)
+        with pytest.raises(ValueError, match="same bounds"):
+            left.merge(DensityGrid((0, 1), (0, 1), bins=20))
+
+    def test_skips_missing_and_out_of_range(self):
+        grid = DensityGrid((0, 1), (0, 1), bins=2)
+        grid.add([0.0, 1.0, np.nan, 2.0, 0.5], [0.0, 1.0, 0.5, 0.5, np.nan])
+        assert grid.total == 2
+        assert grid.counts[0, 0] == 1 and grid.counts[1, 1] == 1
+
+    def test_constant_column(self):
+        grid = DensityGrid.from_arrays(np.ones(10), np.arange(10), bins=5)
+        assert grid.total == 10
+
+    def test_no_finite_points(self):
+        with pytest.raises(ValueError, match="No finite points"):
+            DensityGrid.from_arrays([np.nan], [np.nan])
+
+
+class TestNormalize:
+    def test_empty_cells_are_nan(self):
+        values = normalize(np.array([[0, 1], [4, 0]]), "linear")
+        assert np.isnan(values[0, 0]) and np.isnan(values[1, 1])
+        assert values[1, 0] == 4
+
+    def test_log(self):
+        values = normalize(np.array([[0, 9]]), "log")
+        assert values[0, 1] == pytest.approx(np.log(10))
+
+    def test_eq_hist_spreads_skewed_counts(self):
+        values = normalize(np.array([[1, 1, 2, 1000]]), "eq_hist")
+        assert values.tolist() == [[0.5, 0.5, 0.75, 1.0]]
+
+    def test_unknown(self):
+        with pytest.raises(ValueError, match="Unknown normalization"):
+            normalize(np.zeros((2, 2)), "sqrt")
+
+
+def test_render_density(points):
+    x, y = points
+    grid = DensityGrid.from_arrays(x, y, bins=(40, 30))
+    fig, ax = plt.subplots()
+    image = render_density(ax, grid, norm="log")
+    assert image.get_array().shape == (30, 40)
+    assert image.get_extent() == list(grid.extent)
+    assert len(fig.axes) == 2
+    plt.close(fig)
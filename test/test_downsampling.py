@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from plotsense.plot_generator.downsampling import (
+    STRATEGIES, SamplingInfo, downsample, grid_sample, stratified_sample, uniform_sample
+)
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    x = rng.normal(0, 1, 20_000)
+    y = 2 * x + rng.normal(0, 1, 20_000)
+    return x, y
+
+
+class TestDownsample:
+    def test_small_input_is_kept(self, points):
+        x, y = points
+        positions, info = downsample(x[:100], y[:100], max_points=500)
+        assert np.array_equal(positions, np.arange(100))
+        assert info.ratio == 1.0
+
+    @pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+    def test_respects_budget(self, points, strategy):
+        x, y = points
+        groups = (x > 0).astype(int)
+        positions, info = downsample(x, y, max_points=1000, strategy=strategy, groups=groups)
+        assert len(positions) <= 1000
+        assert len(np.unique(positions)) == len(positions)
+        assert np.all(np.diff(positions) > 0)
+        assert info.strategy == strategy
+        assert info.total_points == len(x)
+        assert info.shown_points == len(positions)
+
+    def test_keeps_extremes_and_outliers(self, points):
+        x, y = points
+        x = x.copy()
+        x[123] = 1e6
+        positions, info = downsample(x, y, max_points=200, strategy='uniform')
+        for position in (x.argmin(), x.argmax(), y.argmin(), y.argmax(), 123):
+            assert position in positions
+        assert info.preserved_points >= 4
+
+    def test_keep_extremes_disabled(self, points):
+        x, y = points
+        _, info = downsample(x, y, max_points=200, keep_extremes=False)
+        assert info.preserved_points == 0
+
+    def test_drops_missing_coordinates(self, points):
+        x, y = points
+        x = x.copy()
+        x[:10] = np.nan
+        positions, _ = downsample(x, y, max_points=1000)
+        assert positions.min() >= 10
+
+    def test_is_deterministic(self, points):
+        x, y = points
+        first, _ = downsample(x, y, max_points=500)
+        second, _ = downsample(x, y, max_points=500)
+        assert np.array_equal(first, second)
+
+    def test_auto_picks_stratified_with_groups(self, points):
+        x, y = points
+        _, info = downsample(x, y, max_points=500, groups=np.zeros(len(x), dtype=int))
+        assert info.strategy == 'stratified'
+        _, info = downsample(x, y, max_points=500)
+        assert info.strategy == 'uniform'
+
+    def test_custom_sampler(self, points):
+        x, y = points
+
+        def first_points(x, y, groups, budget, rng):
+            return np.arange(budget)
+
+        positions, info = downsample(x, y, max_points=50, strategy=first_points, keep_extremes=False)
+        assert np.array_equal(positions, np.arange(50))
+        assert info.strategy == 'first_points'
+
+    def test_unknown_strategy(self, points):
+        x, y = points
+        with pytest.raises(ValueError, match="Unknown sampling strategy"):
+            downsample(x, y, max_points=10, strategy='random')
+
+
+class TestSamplers:
+    def test_uniform(self):
+        chosen = uniform_sample(np.zeros(100), np.zeros(100), None, 10, np.random.default_rng(0))
+        assert len(np.unique(chosen)) == 10
+
+    def test_stratified_keeps_rare_groups(self):
+        groups = np.zeros(10_000, dtype=np.int64)
+        groups[:3] = 1
+        groups[3:5] = 2
+        chosen = stratified_sample(np.zeros(10_000), np.zeros(10_000), groups, 100, np.random.default_rng(0))
+        assert len(chosen) <= 100
+        assert set(groups[chosen]) == {0, 1, 2}
+
+    def test_grid_keeps_sparse_regions(self):
+        rng = np.random.default_rng(0)
+        x = np.concatenate([rng.normal(0, 0.01, 10_000), [5.0, 10.0]])
+        y = np.concatenate([rng.normal(0, 0.01, 10_000), [5.0, 10.0]])
+        chosen = grid_sample(x, y, None, 100, rng)
+        assert len(chosen) <= 100
+        assert {10_000, 10_001} <= set(chosen.tolist())
+
+    def test_grid_more_cells_than_budget(self):
+        rng = np.random.default_rng(0)
+        x, y = rng.random(10_000), rng.random(10_000)
+        assert len(grid_sample(x, y, None, 10, rng)) == 10
+
+
+def test_sampling_info_ratio():
+    assert SamplingInfo('uniform', 200, 50, 4).ratio == 0.25
+    assert SamplingInfo('uniform', 0, 0, 0).ratio == 1.0
@@ -186,6 +186,32 @@ class TestModelQuerying:
                 image_path=str(output_path)
             )
 
+    def test_query_model_retries_service_unavailable(self, plot_explainer_instance, mock_groq_client,
+                                                     mock_groq_completion, temp_image_path):
+        unavailable = Exception("Error code: 503")
+        unavailable.status_code = 503
+        mock_groq_client.chat.completions.create.side_effect = [unavailable, mock_groq_completion]
+        plot_explainer_instance.clients["groq"] = mock_groq_client
+
+        with patch('plotsense.resilience.time.sleep'):
+            response = plot_explainer_instance._query_model(
+                model=plot_explainer_instance.available_models[0],
+                prompt="What's the trend?",
+                image_path=str(temp_image_path)
+            )
+
+        assert response == "Mock explanation"
+        assert mock_groq_client.chat.completions.create.call_count == 2
+
+    def test_select_model_skips_open_circuit(self, plot_explainer_instance):
+        first, second = plot_explainer_instance.available_models
+        breaker = plot_explainer_instance.resilience.breaker
+        for _ in range(breaker.min_requests):
+            breaker.record_failure(first)
+
+        assert plot_explainer_instance._select_model(0) == second
+        assert plot_explainer_instance._select_model(1) == second
+
 
 class TestExplanationGeneration:
     @patch('plotsense.explanations.explanations.PlotExplainer._query_model')
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# SUT
+from plotsense.fingerprint import column_fingerprints, fingerprint_dataframe
+
+
+@pytest.fixture
+def frame():
+    n = 10_000
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        "x": rng.normal(size=n),
+        "category": rng.choice(list("ABC"), n),
+    })
+
+
+class TestFingerprint:
+    def test_equal_content_same_fingerprint(self, frame):
+        assert fingerprint_dataframe(frame) == fingerprint_dataframe(frame.copy())
+
+    def test_schema_changes_fingerprint(self, frame):
+        renamed = frame.rename(columns={"x": "y"})
+        retyped = frame.astype({"x": "float32"})
+        assert fingerprint_dataframe(renamed) != fingerprint_dataframe(frame)
+        assert fingerprint_dataframe(retyped) != fingerprint_dataframe(frame)
+        assert fingerprint_dataframe(frame.iloc[:-1]) != fingerprint_dataframe(frame)
+
+    def test_sampled_block_changes_fingerprint(self, frame):
+        edited = frame.copy()
+        edited.loc[0, "x"] = 1e9
+        assert fingerprint_dataframe(edited) != fingerprint_dataframe(frame)
+
+    def test_small_frame_hashes_every_row(self):
+        df = pd.DataFrame({"x": range(100)})
+        edited = df.copy()
+        edited.loc[57, "x"] = -1
+        assert fingerprint_dataframe(edited) != fingerprint_dataframe(df)
+
+    def test_unhashable_cells(self):
+        df = pd.DataFrame({"x": [[1, 2], [3]]})
+        assert isinstance(fingerprint_dataframe(df), str)
+
+
+class TestColumnFingerprints:
+    def test_only_touched_columns_change(self, frame):
+        before = column_fingerprints(frame)
+        edited = frame.assign(extra=1.0)
+        edited.loc[0, "x"] = 1e9
+        after = column_fingerprints(edited)
+        assert [c for c in after if before.get(c) != after[c]] == ["x", "extra"]
+
+    def test_row_count_changes_every_column(self, frame):
+        before = column_fingerprints(frame)
+        after = column_fingerprints(frame.iloc[:-1])
+        assert all(before[c] != after[c] for c in frame.columns)
+
+    def test_empty_frame(self):
+        assert set(column_fingerprints(pd.DataFrame({"x": []}))) == {"x"}
@@ -0,0 +1,86 @@
+import pytest
+
+# SUT
+from plotsense.visual_suggestion.hedging import LatencyHistogram, LatencyTracker, ModelSlots
+
+
+class TestLatencyHistogram:
+    def test_quantiles(self):
+        histogram = LatencyHistogram()
+        for seconds in [0.1] * 90 + [5.0] * 10:
+            histogram.record(seconds)
+        assert histogram.quantile(0.5) == pytest.approx(0.1, rel=0.2)
+        assert histogram.quantile(0.99) == pytest.approx(5.0, rel=0.2)
+
+    def test_empty(self):
+        assert LatencyHistogram().quantile(0.5) is None
+
+
+class TestLatencyTracker:
+    def test_default_until_min_samples(self):
+        tracker = LatencyTracker(min_samples=3)
+        tracker.record("m", 0.2)
+        tracker.record("m", 0.2)
+        assert tracker.quantile("m", 0.5, default=2.0) == 2.0
+        tracker.record("m", 0.2)
+        assert tracker.quantile("m", 0.5, default=2.0) == pytest.approx(0.2, rel=0.2)
+        assert tracker.count("m") == 3
+        assert tracker.count("other") == 0
+
+
+class TestModelSlots:
+    def test_first_valid_response_wins(self):
+        slots = ModelSlots(["a"])
+        slots.launched("a")
+        slots.launched("a", hedge=True)
+        assert slots.completed("a", recommendations=[{"plot_type": "bar"}])
+        assert not slots.completed("a", error=RuntimeError("late"))
+        assert slots.responses == {"a": [{"plot_type": "bar"}]}
+        assert slots.dropped == {}
+
+    def test_error_waits_for_hedge(self):
+        slots = ModelSlots(["a"])
+        slots.launched("a")
+        slots.launched("a", hedge=True)
+        assert not slots.completed("a", error=RuntimeError("boom"))
+        assert slots.unresolved == ["a"]
+        assert slots.completed("a", error=RuntimeError("boom"))
+        assert slots.dropped == {"a": "boom"}
+
+    def test_alternate_hedge_credited_to_source(self):
+        slots = ModelSlots(["a", "b"])
+        slots.launched("a")
+        slots.launched("b")
+        slots.launched("a", hedge=True)
+        assert slots.substituted("a", "b", recommendations=[{"plot_type": "bar"}]) == ["a", "b"]
+        assert slots.responses == {"b": [{"plot_type": "bar"}]}
+        assert slots.dropped == {"a": "replaced by a hedge to b"}
+        # b's own answer arrives late and is not counted again
+        assert not slots.completed("b", recommendations=[{"plot_type": "pie"}])
+        assert slots.responses == {"b": [{"plot_type": "bar"}]}
+
+    def test_alternate_hedge_discarded_when_source_answered(self):
+        slots = ModelSlots(["a", "b"])
+        slots.launched("a")
+        slots.launched("b")
+        slots.completed("b", recommendations=[{"plot_type": "pie"}])
+        slots.launched("a", hedge=True)
+        assert slots.substituted("a", "b", recommendations=[{"plot_type": "bar"}]) == ["a"]
+        assert slots.responses == {"b": [{"plot_type": "pie"}]}
+
+    def test_failed_alternate_hedge_waits_for_primary(self):
+        slots = ModelSlots(["a", "b"])
+        slots.launched("a")
+        slots.launched("a", hedge=True)
+        assert not slots.substituted("a", "b", error=RuntimeError("boom"))
+        assert slots.unresolved == ["a", "b"]
+        assert slots.completed("a", recommendations=[{"plot_type": "bar"}])
+
+    def test_expire(self):
+        slots = ModelSlots(["a", "b"])
+        slots.launched("a")
+        slots.launched("b")
+        slots.completed("a", recommendations=[])
+        slots.expire("deadline")
+        assert slots.responses == {"a": []}
+        assert slots.dropped == {"b": "deadline"}
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# SUT
+from plotsense.visual_suggestion.heuristics import HeuristicRecommender
+from plotsense.visual_suggestion.profiling import DataFrameProfiler
+
+
+@pytest.fixture
+def heuristic_dataframe():
+    n = 300
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=n)
+    return pd.DataFrame({
+        "date": pd.date_range("2020-01-01", periods=n),
+        "category": rng.choice(list("ABC"), n),
+        "value": base,
+        "double": base * 2 + rng.normal(scale=0.2, size=n),
+        "noise": rng.normal(size=n),
+        "id": [f"id{i}" for i in range(n)],
+    })
+
+
+class TestHeuristicRecommender:
+    def test_output_schema(self, heuristic_dataframe):
+        profile = DataFrameProfiler().profile(heuristic_dataframe)
+        result = HeuristicRecommender().recommend(profile, n=5)
+        assert list(result.columns) == [
+            'plot_type', 'variables', 'ensemble_score', 'model_agreement', 'source_models']
+        assert len(result) == 5
+        assert all(sources == ['heuristic'] for sources in result['source_models'])
+        assert result['ensemble_score'].is_monotonic_decreasing
+
+    def test_rules(self, heuristic_dataframe):
+        profile = DataFrameProfiler().profile(heuristic_dataframe)
+        candidates = {(c['plot_type'], c['variables']) for c in HeuristicRecommender().candidates(profile)}
+        assert ('line', 'date, value') in candidates
+        assert ('scatter', 'value, double') in candidates
+        assert ('boxplot', 'value, category') in candidates
+        assert ('bar', 'noise, category') in candidates
+        assert ('pie', 'category') in candidates
+        assert ('hist', 'noise') in candidates
+        # ID-like text columns are never plotted
+        assert not any('id' in v.split(', ') for _, v in candidates)
+
+    def test_plot_types_are_diverse(self, heuristic_dataframe):
+        profile = DataFrameProfiler().profile(heuristic_dataframe)
+        result = HeuristicRecommender().recommend(profile, n=5)
+        assert result['plot_type'].nunique() >= 3
+
+    def test_hexbin_for_large_frames(self, heuristic_dataframe):
+        profile = DataFrameProfiler().profile(heuristic_dataframe)
+        candidates = HeuristicRecommender(hexbin_rows=100).candidates(profile)
+        assert ('hexbin', 'value, double') in {(c['plot_type'], c['variables']) for c in candidates}
+
+    def test_exclude_existing(self, heuristic_dataframe):
+        profile = DataFrameProfiler().profile(heuristic_dataframe)
+        existing = pd.DataFrame({'plot_type': ['line'], 'variables': ['value, date']})
+        result = HeuristicRecommender().recommend(profile, n=3, exclude=existing)
+        assert ('line', 'date, value') not in set(zip(result['plot_type'], result['variables']))
+
+    def test_deterministic(self, heuristic_dataframe):
+        profile = DataFrameProfiler().profile(heuristic_dataframe)
+        pd.testing.assert_frame_equal(
+            HeuristicRecommender().recommend(profile), HeuristicRecommender().recommend(profile))
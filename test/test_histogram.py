@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import pytest
+import matplotlib
+import matplotlib.pyplot as plt
+from plotsense.plot_generator.histogram import (
+    QuantileSketch, StreamingHistogram, bin_index, group_counts, hist_from_chunks
+)
+
+matplotlib.use('Agg')
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).lognormal(0, 1, 30_000)
+
+
+class TestStreamingHistogram:
+    def test_matches_numpy(self, values):
+        hist = StreamingHistogram.from_range(values.min(), values.max(), 25)
+        for start in range(0, len(values), 4_000):
+            hist.add(values[start:start + 4_000])
+        expected, edges = np.histogram(values, bins=25)
+        assert np.allclose(hist.edges, edges)
+        assert np.array_equal(hist.counts, expected)
+        assert hist.total == len(values)
+
+    def test_missing_and_outside(self):
+        hist = StreamingHistogram([0, 1, 2])
+        hist.add(pd.Series([0.0, 2.0, 3.0, -1.0, np.nan, np.inf], dtype="Float64"))
+        assert hist.counts.tolist() == [1, 1]
+        assert hist.missing == 1
+        assert hist.outside == 3
+
+    def test_merge(self, values):
+        left = StreamingHistogram.from_range(0, 10, 5).add(values[:100])
+        right = StreamingHistogram.from_range(0, 10, 5).add(values[100:])
+        merged = left.merge(right)
+        assert merged.total + merged.outside == len(values)
+        with pytest.raises(ValueError, match="same bin edges"):
+            merged.merge(StreamingHistogram.from_range(0, 1, 5))
+
+    def test_invalid_edges(self):
+        with pytest.raises(ValueError, match="strictly increasing"):
+            StreamingHistogram([0, 2, 1])
+        with pytest.raises(ValueError, match="two bin edges"):
+            StreamingHistogram([0])
+
+    def test_constant_range_is_widened(self):
+        hist = StreamingHistogram.from_range(3, 3, 4).add([3, 3])
+        assert hist.edges[0] == 2.5 and hist.edges[-1] == 3.5
+        assert hist.total == 2
+
+    def test_plot_density(self, values):
+        hist = StreamingHistogram.from_range(values.min(), values.max(), 20).add(values)
+        fig, ax = plt.subplots()
+        patch = hist.plot(ax, density=True)
+        heights, edges, _ = patch.get_data()
+        assert np.sum(heights * np.diff(edges)) == pytest.approx(1.0)
+        plt.close(fig)
+
+
+def test_bin_index_closes_last_bin():
+    assert bin_index(np.array([0.0, 0.5, 1.0, 1.5]), np.array([0.0, 0.5, 1.0])).tolist() == [0, 1, 1, -1]
+
+
+def test_group_counts():
+    counts = group_counts(np.array([0.1, 0.9, 0.2, 0.8, np.nan]), np.array([0, 1, 0, -1, 1]), 2,
+                          np.array([0.0, 0.5, 1.0]))
+    assert counts.tolist() == [[2, 0], [0, 1]]
+
+
+class TestQuantileSketch:
+    def test_quantiles_are_close(self, values):
+        sketch = QuantileSketch(capacity=2_000)
+        for chunk in np.array_split(values, 7):
+            sketch.add(chunk)
+        assert sketch.count == len(values)
+        assert sketch.quantiles([0, 1]).tolist() == [values.min(), values.max()]
+        median = sketch.quantiles(0.5)[0]
+        assert np.mean(values <= median) == pytest.approx(0.5, abs=0.05)
+
+    def test_merge_matches_min_max(self, values):
+        left = QuantileSketch(capacity=500).add(values[:10_000])
+        right = QuantileSketch(capacity=500, random_state=1).add(values[10_000:])
+        merged = left.merge(right)
+        assert merged.count == len(values)
+        assert merged.min == values.min() and merged.max == values.max()
+        assert len(merged._values) == 500
+
+    def test_quantile_edges_balance_counts(self, values):
+        sketch = QuantileSketch().add(values)
+        hist = StreamingHistogram(sketch.edges(10, binning="quantile")).add(values)
+        assert hist.total == len(values)
+        assert hist.counts.min() > 0.5 * len(values) / 10
+
+    def test_empty(self):
+        with pytest.raises(ValueError, match="No values"):
+            QuantileSketch().edges()
+
+
+class TestHistFromChunks:
+    def test_dataframe_chunks_from_factory(self, values):
+        frame = pd.DataFrame({"fare": values})
+        hist = hist_from_chunks(lambda: (frame.iloc[i:i + 5_000] for i in range(0, len(frame), 5_000)),
+                                column="fare", bins=15)
+        expected, _ = np.histogram(values, bins=15)
+        assert np.array_equal(hist.counts, expected)
+
+    def test_one_shot_iterator_with_range(self, values):
+        hist = hist_from_chunks(iter(np.array_split(values, 3)), bins=10, bin_range=(0, 5))
+        assert hist.total == np.sum(values <= 5)
+
+    def test_one_shot_iterator_needs_edges(self, values):
+        with pytest.raises(ValueError, match="one-shot iterator"):
+            hist_from_chunks(iter([values]))
+
+    def test_dataframe_needs_column(self, values):
+        with pytest.raises(ValueError, match="column is required"):
+            hist_from_chunks([pd.DataFrame({"fare": values})])
+
+    def test_csv_chunks(self, tmp_path, values):
+        path = tmp_path / "fares.csv"
+        pd.DataFrame({"fare": values[:5_000]}).to_csv(path, index=False)
+        hist = hist_from_chunks(lambda: pd.read_csv(path, chunksize=1_000), column="fare",
+                                bins=8, binning="quantile")
+        assert hist.total == 5_000
@@ -288,3 +288,174 @@ class TestPlotGeneratorEdgeCases:
         fig = plotgen(df, 0, sugg)
         assert isinstance(fig, plt.Figure)
         plt.close(fig)
+
+
+class TestZeroCopy:
+    def test_generator_holds_reference(self, sample_dataframe, sample_suggestions):
+        pg = SmartPlotGenerator(sample_dataframe, sample_suggestions)
+        assert pg.data is sample_dataframe
+
+    def test_plotting_leaves_data_unchanged(self, sample_dataframe, sample_suggestions):
+        original = sample_dataframe.copy()
+        pg = SmartPlotGenerator(sample_dataframe, sample_suggestions)
+        for index in range(len(sample_suggestions)):
+            plt.close(pg.generate_plot(index))
+        pd.testing.assert_frame_equal(sample_dataframe, original)
+
+    def test_plotgen_series_reuses_generator(self, sample_dataframe, sample_suggestions):
+        from plotsense.plot_generator import generator
+
+        plt.close(plotgen(sample_dataframe, sample_suggestions.iloc[0]))
+        instance = generator._plot_generator_instance
+        other = sample_dataframe.head(10)
+        plt.close(plotgen(other, sample_suggestions.iloc[3]))
+
+        assert generator._plot_generator_instance is instance
+        assert instance.data is other
+        assert instance.suggestions['variables'].iloc[0] == 'value'
+
+    def test_plotgen_series_validates_on_reuse(self, sample_dataframe, sample_suggestions):
+        plt.close(plotgen(sample_dataframe, sample_suggestions.iloc[0]))
+        with pytest.raises(ValueError, match="must contain"):
+            plotgen(sample_dataframe, pd.Series({'wrong_column': 'scatter'}))
+
+
+class TestChangeDetection:
+    def test_same_frame_is_unchanged(self, sample_dataframe, sample_suggestions):
+        pg = SmartPlotGenerator(sample_dataframe, sample_suggestions)
+        assert pg.update_data(sample_dataframe) is False
+
+    def test_other_frame_with_equal_contents_is_a_change(self, sample_dataframe, sample_suggestions):
+        pg = SmartPlotGenerator(sample_dataframe, sample_suggestions)
+        other = sample_dataframe.copy()
+        assert pg.update_data(other) is True
+        assert pg.data is other
+
+    def test_in_place_edit_is_plotted(self, sample_dataframe, sample_suggestions):
+        pg = SmartPlotGenerator(sample_dataframe, sample_suggestions)
+        sample_dataframe.loc[0, 'y'] = 1000.0
+        assert pg.update_data(sample_dataframe) is False
+        fig = pg.generate_plot(0)
+        assert fig.axes[0].collections[0].get_offsets()[0][1] == 1000.0
+        plt.close(fig)
+
+    def test_update_data_does_not_scan_cells(self, sample_dataframe, sample_suggestions):
+        pg = SmartPlotGenerator(sample_dataframe, sample_suggestions)
+        with patch.object(pd.DataFrame, 'equals', side_effect=AssertionError("full comparison")), \
+                patch('pandas.util.hash_pandas_object', side_effect=AssertionError("fingerprint")):
+            pg.update_data(sample_dataframe)
+            plt.close(plotgen(sample_dataframe, 0, sample_suggestions))
+
+    def test_update_data_validates(self, sample_dataframe, sample_suggestions):
+        pg = SmartPlotGenerator(sample_dataframe, sample_suggestions)
+        with pytest.raises(ValueError, match="empty"):
+            pg.update_data(pd.DataFrame())
+
+
+class TestScatterDownsampling:
+    @pytest.fixture
+    def large_dataframe(self):
+        n = 5000
+        rng = np.random.default_rng(0)
+        return pd.DataFrame({
+            "x": rng.normal(0, 1, n),
+            "y": rng.normal(0, 1, n),
+            "category": rng.choice(list("ABC"), n),
+        })
+
+    def test_small_scatter_is_not_sampled(self, plot_generator):
+        from plotsense.plot_generator.downsampling import sampling_info
+
+        fig = plot_generator.generate_plot(0)
+        assert sampling_info(fig) is None
+        plt.close(fig)
+
+    @pytest.mark.parametrize("generator_class", [PlotGenerator, SmartPlotGenerator])
+    def test_large_scatter_is_sampled(self, large_dataframe, generator_class):
+        from plotsense.plot_generator.downsampling import sampling_info
+
+        sugg = pd.DataFrame({'plot_type': ['scatter'], 'variables': ['x,y']})
+        fig = generator_class(large_dataframe, sugg, max_points=500).generate_plot(0)
+        info = sampling_info(fig)
+        assert info.total_points == 5000
+        assert info.shown_points <= 500
+        assert len(fig.axes[0].collections[0].get_offsets()) == info.shown_points
+        plt.close(fig)
+
+    def test_per_plot_override(self, large_dataframe):
+        from plotsense.plot_generator.downsampling import sampling_info
+
+        sugg = pd.DataFrame({'plot_type': ['scatter'], 'variables': ['x,y,category']})
+        pg = SmartPlotGenerator(large_dataframe, sugg)
+        fig = pg.generate_plot(0, max_points=300, sampling='grid')
+        assert sampling_info(fig).strategy == 'grid'
+        plt.close(fig)
+
+        fig = pg.generate_plot(0, max_points=300)
+        assert sampling_info(fig).strategy == 'stratified'
+        assert len(set(fig.axes[0].collections[0].get_array())) == 3
+        plt.close(fig)
+
+        fig = pg.generate_plot(0, max_points=None)
+        assert sampling_info(fig) is None
+        plt.close(fig)
+
+    @pytest.mark.parametrize("generator_class", [PlotGenerator, SmartPlotGenerator])
+    def test_per_point_kwargs_are_sampled(self, large_dataframe, generator_class):
+        sugg = pd.DataFrame({'plot_type': ['scatter'], 'variables': ['x,y']})
+        fig = generator_class(large_dataframe, sugg, max_points=500).generate_plot(
+            0, c=large_dataframe['x'].to_numpy(), s=list(range(len(large_dataframe))), alpha=0.5)
+        points = fig.axes[0].collections[0]
+        offsets = points.get_offsets()
+        assert len(points.get_array()) == len(points.get_sizes()) == len(offsets)
+        # Colors still belong to the points they were given for
+        np.testing.assert_allclose(points.get_array(), offsets[:, 0])
+        plt.close(fig)
+
+
+class TestDensityMode:
+    @pytest.mark.parametrize("plot_type", ['scatter', 'hexbin'])
+    @pytest.mark.parametrize("generator_class", [PlotGenerator, SmartPlotGenerator])
+    def test_density_renders_image(self, sample_dataframe, plot_type, generator_class):
+        sugg = pd.DataFrame({'plot_type': [plot_type], 'variables': ['x,y']})
+        fig = generator_class(sample_dataframe, sugg).generate_plot(
+            0, density=True, density_bins=(16, 8), density_norm='log', cmap='magma')
+        ax = fig.axes[0]
+        assert len(ax.images) == 1
+        assert ax.images[0].get_array().shape == (8, 16)
+        assert ax.get_title() == "Density: x vs y"
+        plt.close(fig)
+
+    def test_density_requires_numeric(self, sample_dataframe):
+        sugg = pd.DataFrame({'plot_type': ['hexbin'], 'variables': ['category,y']})
+        with pytest.raises(ValueError, match="must be numeric"):
+            SmartPlotGenerator(sample_dataframe, sugg).generate_plot(0, density=True)
+
+
+class TestStreamingHist:
+    @pytest.mark.parametrize("generator_class", [PlotGenerator, SmartPlotGenerator])
+    def test_streaming_matches_counts(self, sample_dataframe, generator_class):
+        sugg = pd.DataFrame({'plot_type': ['hist'], 'variables': ['value']})
+        fig = generator_class(sample_dataframe, sugg).generate_plot(0, streaming=True, bins=5)
+        heights, edges, _ = fig.axes[0].patches[0].get_data()
+        expected, expected_edges = np.histogram(sample_dataframe['value'], bins=5)
+        assert np.array_equal(heights, expected)
+        assert np.allclose(edges, expected_edges)
+        plt.close(fig)
+
+    def test_streaming_grouped_shares_edges(self, sample_dataframe):
+        sugg = pd.DataFrame({'plot_type': ['hist'], 'variables': ['value,category']})
+        fig = SmartPlotGenerator(sample_dataframe, sugg).generate_plot(0, streaming=True, bins=4)
+        ax = fig.axes[0]
+        assert len(ax.patches) == sample_dataframe['category'].nunique()
+        all_edges = [patch.get_data()[1] for patch in ax.patches]
+        assert all(np.array_equal(edges, all_edges[0]) for edges in all_edges)
+        assert sum(patch.get_data()[0].sum() for patch in ax.patches) == len(sample_dataframe)
+        assert ax.get_legend() is not None
+        plt.close(fig)
+
+    def test_streaming_all_missing(self):
+        df = pd.DataFrame({'x': [np.nan] * 5})
+        sugg = pd.DataFrame({'plot_type': ['hist'], 'variables': ['x']})
+        with pytest.raises(ValueError, match="No valid data"):
+            SmartPlotGenerator(df, sugg).generate_plot(0, streaming=True)
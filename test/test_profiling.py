@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# SUT
+from plotsense.visual_suggestion.profiling import DataFrameProfiler, DataFrameProfile, sample_rows
+from plotsense.visual_suggestion.prompting import column_lines
+from plotsense.visual_suggestion.sketches import HyperLogLog, approx_nunique
+
+
+@pytest.fixture
+def profile_dataframe():
+    n = 200
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({
+        "date": pd.date_range("2020-01-01", periods=n),
+        "category": rng.choice(list("ABC"), n),
+        "value": rng.normal(0, 1, n),
+        "count": rng.integers(0, 100, n),
+        "flag": rng.choice([True, False], n),
+        "label": [f"id{i}" for i in range(n)],
+    })
+    df.loc[:4, "value"] = np.nan
+    return df
+
+
+class TestDataFrameProfiler:
+    def test_profile_kinds(self, profile_dataframe):
+        profile = DataFrameProfiler().profile(profile_dataframe)
+        assert isinstance(profile, DataFrameProfile)
+        assert profile.kinds() == {
+            "date": "datetime",
+            "category": "categorical",
+            "value": "numerical",
+            "count": "numerical",
+            "flag": "numerical",
+            "label": "text/other",
+        }
+
+    def test_profile_matches_pandas(self, profile_dataframe):
+        profile = DataFrameProfiler().profile(profile_dataframe)
+        value = profile.columns["value"]
+        assert value.missing_count == 5
+        assert value.unique_count == profile_dataframe["value"].nunique()
+        assert value.min == profile_dataframe["value"].min()
+        assert value.max == profile_dataframe["value"].max()
+        assert value.mean == pytest.approx(profile_dataframe["value"].mean())
+        assert value.sample_values == profile_dataframe["value"].dropna().head(3).tolist()
+
+        date = profile.columns["date"]
+        assert date.min == profile_dataframe["date"].min()
+        assert date.mean is None
+
+    def test_relationships(self, profile_dataframe):
+        profile = DataFrameProfiler().profile(profile_dataframe)
+        assert profile.numerical_columns == ["value", "count"]
+        assert profile.categorical_columns == ["category", "flag"]
+        pd.testing.assert_frame_equal(
+            profile.correlations, profile_dataframe[["value", "count"]].corr())
+
+    def test_all_missing_nullable_columns(self):
+        df = pd.DataFrame({
+            "int": pd.array([None] * 5, dtype="Int64"),
+            "float": pd.array([None] * 5, dtype="Float64"),
+            "value": [1.0, 2.0, 3.0, 4.0, 5.0],
+        })
+        profile = DataFrameProfiler().profile(df)
+        for col in ("int", "float"):
+            info = profile.columns[col]
+            assert np.isnan(info.mean) and np.isnan(info.min) and np.isnan(info.max)
+            assert "mean=nan" in column_lines(info)[1]
+        assert profile.columns["value"].mean == 3.0
+
+    def test_empty_dataframe(self):
+        profile = DataFrameProfiler().profile(pd.DataFrame())
+        assert profile.columns == {}
+        assert profile.correlations is None
+
+
+class TestCardinalitySketch:
+    def test_hyperloglog_within_error_bound(self):
+        values = pd.Series([f"user-{i}" for i in range(50_000)])
+        sketch = HyperLogLog(precision=14).update(values)
+        assert abs(sketch.count() - 50_000) / 50_000 < 4 * sketch.relative_error
+
+    def test_hyperloglog_small_and_missing(self):
+        values = pd.Series(["a", "b", None, "a", "c", np.nan])
+        assert approx_nunique(values) == 3
+
+    def test_hyperloglog_merge(self):
+        left = HyperLogLog().update([f"k{i}" for i in range(1000)])
+        right = HyperLogLog().update([f"k{i}" for i in range(500, 1500)])
+        assert abs(left.merge(right).count() - 1500) < 50
+
+    def test_invalid_precision(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=2)
+
+    def test_profiler_approx_mode(self, profile_dataframe):
+        profile = DataFrameProfiler(cardinality="approx").profile(profile_dataframe)
+        assert profile.columns["label"].unique_approx
+        assert profile.columns["label"].kind == "text/other"
+        assert profile.columns["category"].unique_count == 3
+        assert profile.columns["category"].kind == "categorical"
+        # numeric columns keep exact counts
+        assert not profile.columns["count"].unique_approx
+
+    def test_profiler_auto_threshold(self, profile_dataframe):
+        exact = DataFrameProfiler(approx_threshold=10_000).profile(profile_dataframe)
+        approx = DataFrameProfiler(approx_threshold=100).profile(profile_dataframe)
+        assert not exact.columns["label"].unique_approx
+        assert approx.columns["label"].unique_approx
+        # Estimating is opt-in: it is slower than an exact count
+        assert not DataFrameProfiler().profile(profile_dataframe).columns["label"].unique_approx
+        assert DataFrameProfiler()._use_approx(10 ** 9) is False
+
+
+class TestRowSampling:
+    def test_sample_size_and_fraction(self, profile_dataframe):
+        assert len(sample_rows(profile_dataframe, 50)) == 50
+        assert len(sample_rows(profile_dataframe, 0.25)) == 50
+        assert sample_rows(profile_dataframe, None) is profile_dataframe
+        assert sample_rows(profile_dataframe, 1000) is profile_dataframe
+
+    def test_sample_is_deterministic_and_ordered(self, profile_dataframe):
+        first = sample_rows(profile_dataframe, 40, random_state=7)
+        second = sample_rows(profile_dataframe, 40, random_state=7)
+        pd.testing.assert_frame_equal(first, second)
+        assert first.index.is_monotonic_increasing
+
+    def test_stratified_sample_keeps_groups(self):
+        df = pd.DataFrame({
+            "group": ["rare"] * 2 + ["common"] * 998,
+            "value": np.arange(1000),
+        })
+        sampled = sample_rows(df, 100, stratify="group")
+        counts = sampled["group"].value_counts()
+        assert counts["rare"] >= 1
+        assert counts["common"] == 100
+
+    def test_invalid_fraction(self, profile_dataframe):
+        with pytest.raises(ValueError):
+            sample_rows(profile_dataframe, 1.5)
+
+    def test_profile_sample_reports_full_metadata(self, profile_dataframe):
+        profile = DataFrameProfiler().profile(profile_dataframe, sample=50)
+        assert profile.shape == profile_dataframe.shape
+        assert profile.columns["value"].missing_count == 5
+        assert profile.columns["count"].unique_approx
+        assert profile.columns["category"].kind == "categorical"
+
+
+class TestIncrementalProfile:
+    @pytest.mark.parametrize("correlation", ["dense", "topk"])
+    def test_update_matches_full_profile(self, profile_dataframe, correlation):
+        profiler = DataFrameProfiler(correlation=correlation)
+        previous = profiler.profile(profile_dataframe)
+        changed = profile_dataframe.drop(columns=["count"]).assign(
+            ratio=profile_dataframe["value"] * 2, flag=~profile_dataframe["flag"])
+
+        updated = profiler.update(previous, changed, ["ratio", "flag"])
+        full = profiler.profile(changed)
+        assert updated.columns == full.columns
+        assert list(updated.columns) == list(changed.columns)
+        assert updated.numerical_columns == full.numerical_columns
+        assert [p[:2] for p in updated.top_pairs] == [p[:2] for p in full.top_pairs]
+        assert [p[2] for p in updated.top_pairs] == pytest.approx([p[2] for p in full.top_pairs], abs=1e-4)
+        if correlation == "dense":
+            pd.testing.assert_frame_equal(updated.correlations, full.correlations)
+
+    def test_unchanged_columns_not_profiled(self, profile_dataframe):
+        profiler = DataFrameProfiler()
+        previous = profiler.profile(profile_dataframe)
+        updated = profiler.update(previous, profile_dataframe.assign(extra=1), ["extra"])
+        assert updated.columns["value"] is previous.columns["value"]
+        assert updated.columns["extra"].unique_count == 1
+
+    def test_rows_must_match(self, profile_dataframe):
+        profiler = DataFrameProfiler()
+        previous = profiler.profile(profile_dataframe)
+        with pytest.raises(ValueError):
+            profiler.update(previous, profile_dataframe.iloc[:10], [])
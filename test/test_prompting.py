@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# SUT
+from plotsense.ratelimit import estimate_tokens
+from plotsense.visual_suggestion.profiling import DataFrameProfiler
+from plotsense.visual_suggestion.correlation import top_correlation_pairs
+from plotsense.visual_suggestion.prompting import column_informativeness, compact_description
+
+
+@pytest.fixture
+def wide_dataframe():
+    n = 200
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=n)
+    data = {f"num{i}": rng.normal(size=n) for i in range(120)}
+    data["num0"] = base
+    data["num1"] = base * 2 + rng.normal(scale=0.01, size=n)
+    data["category"] = rng.choice(list("ABC"), n)
+    data["constant"] = 1.0
+    data["id"] = [f"id{i}" for i in range(n)]
+    return pd.DataFrame(data)
+
+
+class TestCorrelationPairs:
+    def test_top_pairs_sorted_by_strength(self, wide_dataframe):
+        corr = wide_dataframe.select_dtypes("number").corr()
+        pairs = top_correlation_pairs(corr, 5)
+        assert len(pairs) == 5
+        assert pairs[0][:2] == ("num0", "num1")
+        assert pairs[0][2] == pytest.approx(1.0, abs=1e-3)
+        strengths = [abs(r) for _, _, r in pairs]
+        assert strengths == sorted(strengths, reverse=True)
+
+    def test_no_pairs(self):
+        assert top_correlation_pairs(None, 5) == []
+
+
+class TestCompactDescription:
+    def test_respects_budget(self, wide_dataframe):
+        profile = DataFrameProfiler().profile(wide_dataframe)
+        desc = compact_description(profile, max_tokens=600)
+        assert estimate_tokens(desc) <= 600
+        assert "DataFrame Shape: (200, 123)" in desc
+        assert "- num0 ~ num1: 1.00" in desc
+        assert "Other columns" in desc
+
+    def test_informative_columns_first(self, wide_dataframe):
+        profile = DataFrameProfiler().profile(wide_dataframe)
+        scores = column_informativeness(profile, profile.top_pairs)
+        assert scores["constant"] == 0
+        assert scores["num1"] > scores["num5"] > scores["id"]
+
+        desc = compact_description(profile, max_tokens=400)
+        assert "- num1:" in desc
+        assert "- constant:" not in desc
+
+    def test_tiny_budget_truncates(self, wide_dataframe):
+        profile = DataFrameProfiler().profile(wide_dataframe)
+        assert estimate_tokens(compact_description(profile, max_tokens=5)) <= 5
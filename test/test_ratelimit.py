@@ -0,0 +1,132 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# SUT
+from plotsense.ratelimit import RateLimiter, TokenBucket, estimate_tokens, get_default_limiter
+from plotsense.visual_suggestion.suggestions import VisualizationRecommender
+
+
+class TestTokenBucket:
+    def test_burst_then_debt(self):
+        bucket = TokenBucket(rate_per_minute=60, capacity=2)
+        now = time.monotonic()
+        assert bucket.reserve(1, now) == 0
+        assert bucket.reserve(1, now) == 0
+        # Third and fourth requests queue one second apart
+        assert bucket.reserve(1, now) == pytest.approx(1.0)
+        assert bucket.reserve(1, now) == pytest.approx(2.0)
+
+    def test_refill(self):
+        bucket = TokenBucket(rate_per_minute=60, capacity=1)
+        now = time.monotonic()
+        bucket.reserve(1, now)
+        assert bucket.reserve(1, now + 1.0) == pytest.approx(0.0)
+
+    def test_refund(self):
+        bucket = TokenBucket(rate_per_minute=60, capacity=2)
+        now = time.monotonic()
+        bucket.reserve(2, now)
+        bucket.refund(1, now)
+        assert bucket.reserve(1, now) == pytest.approx(0.0)
+        bucket.refund(10, now)
+        assert bucket.tokens == 2
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+
+class TestRateLimiter:
+    def test_unlimited_by_default(self):
+        limiter = RateLimiter()
+        assert all(limiter.reserve("m", tokens=10_000) == 0 for _ in range(100))
+
+    def test_per_model_limits(self):
+        limiter = RateLimiter()
+        limiter.configure("slow", requests_per_minute=1)
+        assert limiter.reserve("slow") == 0
+        assert limiter.reserve("slow") == pytest.approx(60, abs=0.1)
+        assert limiter.reserve("fast") == 0
+
+    def test_token_budget(self):
+        limiter = RateLimiter(tokens_per_minute=600)
+        assert limiter.reserve("m", tokens=600) == 0
+        assert limiter.reserve("m", tokens=60) == pytest.approx(6.0, abs=0.1)
+
+    def test_acquire_sleeps_for_wait(self):
+        limiter = RateLimiter(requests_per_minute=60)
+        with patch.object(limiter, "reserve", return_value=0.5), \
+                patch("plotsense.ratelimit.time.sleep") as mock_sleep:
+            assert limiter.acquire("m") == 0.5
+        mock_sleep.assert_called_once_with(0.5)
+
+    def test_async_acquire(self):
+        limiter = RateLimiter(requests_per_minute=6000)
+        assert asyncio.run(limiter.aacquire("m")) == 0
+
+    def test_cancelled_acquire_refunds(self):
+        limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=600)
+        limiter.acquire("m", tokens=600)
+        cancelled = threading.Event()
+        threading.Timer(0.05, cancelled.set).start()
+        with pytest.raises(concurrent.futures.CancelledError):
+            limiter.acquire("m", tokens=600, cancelled=cancelled)
+        # Only the first reservation is still owed
+        assert limiter.reserve("m", tokens=600) == pytest.approx(60, abs=0.5)
+
+    def test_cancelled_async_acquire_refunds(self):
+        limiter = RateLimiter(requests_per_minute=1)
+
+        async def run():
+            await limiter.aacquire("m")
+            task = asyncio.ensure_future(limiter.aacquire("m"))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        assert limiter.reserve("m") == pytest.approx(60, abs=0.5)
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("a" * 400) == 101
+
+
+class TestRecommenderIntegration:
+    def test_query_reserves_request_and_tokens(self):
+        r = VisualizationRecommender(api_keys={"groq": "x"})
+        assert r.rate_limiter is get_default_limiter()
+        model = r.available_models[0]
+
+        with patch.object(r.clients['groq'].chat.completions, 'create'), \
+                patch.object(r.rate_limiter, 'acquire', return_value=0) as mock_acquire:
+            r._query_llm("a" * 400, model)
+
+        mock_acquire.assert_called_once_with(model, 101 + r.MAX_TOKENS, cancelled=None)
+
+    def test_losing_hedge_refunds_reservation(self, sample_dataframe):
+        r = VisualizationRecommender(api_keys={"groq": "x"}, hedge=True, hedge_delay=0.05,
+                                     rate_limiter=RateLimiter(requests_per_minute=1))
+        r.set_dataframe(sample_dataframe)
+        model = r.available_models[0]
+        r.available_models = [model]
+
+        def slow_create(**kwargs):
+            time.sleep(0.3)
+            message = MagicMock(content="Plot Type: hist\nVariables: value\n---")
+            return MagicMock(choices=[MagicMock(message=message)])
+
+        with patch.object(r.clients['groq'].chat.completions, 'create', side_effect=slow_create) as mock_create:
+            responses, _ = r._collect_recommendations("prompt")
+
+        # The hedge waited for budget, was cancelled when the primary
+        # answered, and refunds its reservation on its worker thread
+        time.sleep(0.1)
+        assert responses[model]
+        assert mock_create.call_count == 1
+        assert r.rate_limiter.reserve(model) == pytest.approx(60, abs=0.5)
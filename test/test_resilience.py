@@ -0,0 +1,155 @@
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+# SUT
+from plotsense.resilience import (
+    CircuitBreaker, CircuitOpenError, ResilientCaller, RetryPolicy, retry_after)
+from plotsense.visual_suggestion.suggestions import VisualizationRecommender
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+        self.response = httpx.Response(status_code, headers=headers or {})
+
+
+def make_caller(**breaker_kwargs):
+    sleeps = []
+    caller = ResilientCaller(
+        retry=RetryPolicy(max_attempts=3, base_delay=0.01),
+        breaker=CircuitBreaker(**breaker_kwargs),
+        sleep=sleeps.append,
+    )
+    return caller, sleeps
+
+
+class TestRetryPolicy:
+    def test_retries_server_errors(self):
+        caller, sleeps = make_caller()
+        func = MagicMock(side_effect=[FakeStatusError(503), FakeStatusError(429), "ok"])
+        assert caller.call("m", func) == "ok"
+        assert func.call_count == 3
+        assert len(sleeps) == 2
+        assert all(0 <= s <= 0.02 for s in sleeps)
+
+    def test_gives_up_after_max_attempts(self):
+        caller, sleeps = make_caller()
+        func = MagicMock(side_effect=FakeStatusError(500))
+        with pytest.raises(FakeStatusError):
+            caller.call("m", func)
+        assert func.call_count == 3
+
+    def test_client_and_connection_errors_not_retried(self):
+        caller, _ = make_caller()
+        for error in (FakeStatusError(400), ConnectionError("down")):
+            func = MagicMock(side_effect=error)
+            with pytest.raises(type(error)):
+                caller.call("m", func)
+            assert func.call_count == 1
+
+    def test_honours_retry_after(self):
+        caller, sleeps = make_caller()
+        func = MagicMock(side_effect=[FakeStatusError(429, {"retry-after": "2"}), "ok"])
+        assert caller.call("m", func) == "ok"
+        assert sleeps == [2.0]
+        assert retry_after(FakeStatusError(429, {"retry-after-ms": "250"})) == 0.25
+
+    def test_async_retry(self):
+        caller, _ = make_caller()
+        attempts = []
+
+        async def func():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise FakeStatusError(502)
+            return "ok"
+
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        with patch("plotsense.resilience.asyncio.sleep", new=fake_sleep):
+            assert asyncio.run(caller.acall("m", func)) == "ok"
+        assert len(attempts) == 2
+        assert len(sleeps) == 1
+
+
+class TestCircuitBreaker:
+    def test_opens_on_error_rate(self):
+        breaker = CircuitBreaker(min_requests=4, failure_threshold=0.5)
+        breaker.record_success("m")
+        breaker.record_success("m")
+        breaker.record_failure("m")
+        assert breaker.state("m") == "closed"
+        breaker.record_failure("m")
+        assert breaker.state("m") == "open"
+        assert not breaker.allow("m")
+        assert breaker.state("other") == "closed"
+
+    def test_half_open_trial(self):
+        breaker = CircuitBreaker(min_requests=1, cooldown=0.05)
+        breaker.record_failure("m")
+        assert breaker.is_open("m")
+        time.sleep(0.06)
+        assert breaker.state("m") == "half-open"
+        assert breaker.allow("m")
+        # Only one trial call at a time
+        assert not breaker.allow("m")
+        breaker.record_success("m")
+        assert breaker.state("m") == "closed"
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(min_requests=1, cooldown=0.05)
+        breaker.record_failure("m")
+        time.sleep(0.06)
+        assert breaker.allow("m")
+        breaker.record_failure("m")
+        assert breaker.state("m") == "open"
+
+    def test_cancelled_trial_is_released(self):
+        caller, _ = make_caller(min_requests=1, cooldown=0.05)
+        caller.breaker.record_failure("m")
+        time.sleep(0.06)
+
+        async def slow():
+            await asyncio.sleep(10)
+
+        async def cancel_trial():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(caller.acall("m", slow), timeout=0.01)
+
+        asyncio.run(cancel_trial())
+        assert caller.breaker.state("m") == "half-open"
+        # The next call gets the trial instead of being refused forever
+        assert caller.breaker.allow("m")
+
+    def test_open_circuit_short_circuits_calls(self):
+        caller, _ = make_caller(min_requests=1)
+        with pytest.raises(ConnectionError):
+            caller.call("m", MagicMock(side_effect=ConnectionError("down")))
+        func = MagicMock()
+        with pytest.raises(CircuitOpenError):
+            caller.call("m", func)
+        func.assert_not_called()
+
+
+class TestRecommenderIntegration:
+    def test_open_model_is_skipped(self, sample_dataframe, llm_dummy_response):
+        caller, _ = make_caller(min_requests=1)
+        r = VisualizationRecommender(api_keys={"groq": "x"}, resilience=caller)
+        r.set_dataframe(sample_dataframe)
+        down_model, up_model = r.available_models
+        caller.breaker.record_failure(down_model)
+
+        with patch.object(r, '_query_llm', return_value=llm_dummy_response) as mock_query:
+            responses, dropped = r._collect_recommendations("prompt")
+
+        assert mock_query.call_count == 1
+        assert dropped == {down_model: "circuit breaker open"}
+        assert responses[up_model]
@@ -0,0 +1,60 @@
+import asyncio
+
+import pandas as pd
+
+# SUT
+from plotsense.runtime import PlotSenseRuntime, get_default_runtime
+from plotsense.explanations.explanations import PlotExplainer
+from plotsense.visual_suggestion.suggestions import VisualizationRecommender
+
+
+class TestPlotSenseRuntime:
+    def test_executor_reused(self):
+        runtime = PlotSenseRuntime(max_workers=2)
+        executor = runtime.executor
+        assert runtime.executor is executor
+        assert executor.submit(lambda: 42).result() == 42
+        runtime.close()
+
+    def test_http_client_pooled(self):
+        runtime = PlotSenseRuntime(max_connections=5, max_keepalive_connections=2)
+        client = runtime.http_client()
+        assert runtime.http_client() is client
+        assert runtime.limits.max_connections == 5
+        runtime.close()
+        assert client.is_closed
+        assert runtime.http_client() is not client
+
+    def test_async_client_per_loop(self):
+        runtime = PlotSenseRuntime()
+
+        async def get_clients():
+            return runtime.async_http_client(), runtime.async_http_client()
+
+        first, again = asyncio.run(get_clients())
+        assert first is again
+        second, _ = asyncio.run(get_clients())
+        assert second is not first
+
+
+class TestSharedRuntime:
+    def test_components_share_connections(self):
+        recommender = VisualizationRecommender(api_keys={"groq": "x"})
+        explainer = PlotExplainer(api_keys={"groq": "x"}, interactive=False)
+        shared = get_default_runtime().http_client()
+        assert recommender.runtime is explainer.runtime is get_default_runtime()
+        assert recommender.clients['groq']._client is shared
+        assert explainer.clients['groq']._client is shared
+
+    def test_custom_runtime(self):
+        runtime = PlotSenseRuntime(max_workers=1)
+        recommender = VisualizationRecommender(api_keys={"groq": "x"}, runtime=runtime)
+        recommender.set_dataframe(pd.DataFrame({"value": [1.0, 2.0, 3.0]}))
+        assert recommender.clients['groq']._client is runtime.http_client()
+
+        async def build():
+            return await asyncio.get_running_loop().run_in_executor(
+                recommender.runtime.executor, recommender._build_prompt)
+
+        assert "value" in asyncio.run(build())
+        runtime.close()
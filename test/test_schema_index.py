@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# SUT
+from plotsense.visual_suggestion.profiling import DataFrameProfiler
+from plotsense.visual_suggestion.schema_index import SchemaIndex
+
+
+def make_profile(n=200, seed=0, **extra):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "value": rng.normal(0, 1, n),
+        "category": rng.choice(list("ABC"), n),
+        **extra,
+    })
+    return DataFrameProfiler().profile(df)
+
+
+@pytest.fixture
+def results():
+    return pd.DataFrame({
+        'plot_type': ['hist', 'boxplot'],
+        'variables': ['value', 'value, category'],
+        'ensemble_score': np.array([0.9, 0.5]),
+        'model_agreement': np.array([2, 1]),
+        'source_models': [['m1', 'm2'], ['m1']],
+    })
+
+
+class TestSchemaIndex:
+    def test_round_trip(self, results):
+        index = SchemaIndex()
+        index.store(make_profile(seed=0), results)
+        cached = index.lookup(make_profile(seed=1))
+        pd.testing.assert_frame_equal(cached, results)
+        assert index.stats() == {"hits": 1, "misses": 0, "entries": 1}
+
+    def test_names_and_kinds_must_match(self, results):
+        index = SchemaIndex()
+        index.store(make_profile(), results)
+        assert index.lookup(make_profile(extra=np.zeros(200))) is None
+        assert index.stats()["misses"] == 1
+
+    def test_cardinality_tolerance(self, results):
+        index = SchemaIndex(tolerance=0)
+        index.store(make_profile(n=200), results)
+        # 200 -> 20 distinct values moves "value" down one bucket
+        assert index.signature(make_profile(n=200))[1] == [0, 3]
+        assert index.signature(make_profile(n=20))[1] == [0, 2]
+        assert index.lookup(make_profile(n=20)) is None
+
+        lenient = SchemaIndex(tolerance=1)
+        lenient.store(make_profile(n=200), results)
+        assert lenient.lookup(make_profile(n=20)) is not None
+
+    def test_ttl(self, results):
+        index = SchemaIndex(ttl=-1)
+        index.store(make_profile(), results)
+        assert index.lookup(make_profile()) is None
+
+    def test_persistent(self, tmp_path, results):
+        path = str(tmp_path / "schemas.sqlite3")
+        index = SchemaIndex(path=path)
+        index.store(make_profile(), results)
+        index.close()
+        assert SchemaIndex(path=path).lookup(make_profile()) is not None
+
+    def test_refresh(self, results):
+        index = SchemaIndex()
+        profile = make_profile()
+        assert index.refresh(profile, lambda: results).result() is results
+        assert index.lookup(profile) is not None
+
+        with pytest.warns(UserWarning, match="refresh failed"):
+            assert index.refresh(profile, lambda: 1 / 0).result() is None
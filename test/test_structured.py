@@ -0,0 +1,61 @@
+import pytest
+
+# SUT
+from plotsense.visual_suggestion.structured import json_max_tokens, parse_json_recommendations
+
+
+COLUMNS = {"value", "count", "category"}
+
+
+class TestParseJsonRecommendations:
+    def test_parses_object(self):
+        response = ('{"recommendations": ['
+                    '{"plot_type": "Scatter", "variables": ["value", "count"], "rationale": "x"},'
+                    '{"plot_type": "bar", "variables": "value, category"}]}')
+        recs = parse_json_recommendations(response, "m", COLUMNS)
+        assert recs == [
+            {"source_model": "m", "plot_type": "scatter", "variables": "value, count"},
+            {"source_model": "m", "plot_type": "bar", "variables": "value, category"},
+        ]
+
+    def test_code_fence_and_bare_list(self):
+        fenced = '```json\n{"recommendations": [{"plot_type": "hist", "variables": ["value"]}]}\n```'
+        assert parse_json_recommendations(fenced, "m", COLUMNS)[0]["plot_type"] == "hist"
+        bare = '[{"plot_type": "hist", "variables": ["value"]}]'
+        assert len(parse_json_recommendations(bare, "m", COLUMNS)) == 1
+
+    def test_invalid_items_skipped(self):
+        response = ('{"recommendations": ['
+                    '{"plot_type": "hist", "variables": ["missing"]},'
+                    '{"plot_type": "", "variables": ["value"]},'
+                    '{"variables": ["value"]},'
+                    '"hist",'
+                    '{"plot_type": "pie", "variables": ["category", "missing"]}]}')
+        recs = parse_json_recommendations(response, "m", COLUMNS)
+        assert recs == [{"source_model": "m", "plot_type": "pie", "variables": "category"}]
+
+    @pytest.mark.parametrize("response", [
+        "Plot Type: hist\nVariables: value\n---",
+        '{"recommendations": [',
+        '{"plots": []}',
+        "Plot Type: hist {not json}",
+        '{"recommendations": [1, 2]}',
+        "Plot {value} over [1, 2]",
+    ])
+    def test_not_json_returns_none(self, response):
+        assert parse_json_recommendations(response, "m", COLUMNS) is None
+
+    def test_truncated_response_keeps_complete_items(self):
+        response = ('{\n  "recommendations": [\n'
+                    '    {"plot_type": "hist", "variables": ["value"]},\n'
+                    '    {"plot_type": "scatter", "variables": ["value", "count"]},\n'
+                    '    {"plot_type": "bar", "variables": ["value", "cat')
+        recs = parse_json_recommendations(response, "m", COLUMNS)
+        assert [r["plot_type"] for r in recs] == ["hist", "scatter"]
+
+
+def test_json_max_tokens():
+    assert json_max_tokens(5, 10_000) == 2 * (64 + 5 * 48)
+    # Leaves room for a pretty-printed response of about 65 tokens per item
+    assert json_max_tokens(8, 10_000) > 8 * 65 + 64
+    assert json_max_tokens(100, 1000) == 1000
@@ -1,5 +1,7 @@
 # tests/test_visual_suggestion.py
-from unittest.mock import patch, MagicMock, Mock
+import asyncio
+import time
+from unittest.mock import patch, MagicMock, Mock, AsyncMock
 
 import numpy as np
 import pandas as pd
@@ -10,7 +12,12 @@ import warnings
 
 
 # SUT
+from plotsense.fingerprint import fingerprint_dataframe
 from plotsense.visual_suggestion.suggestions import VisualizationRecommender
+from plotsense.visual_suggestion.cache import ResponseCache
+from plotsense.exceptions import PlotSenseAPIError
+from plotsense.ratelimit import estimate_tokens
+from plotsense.visual_suggestion.schema_index import SchemaIndex
 
 load_dotenv()  # make .env vars visible for tests
 SEED = 42
@@ -42,6 +49,7 @@ def mock_recommender(sample_dataframe):
     recommender.debug = False
     recommender.df = sample_dataframe
     recommender.timeout = 30
+    recommender.output_format = "text"
     recommender.api_keys = {"groq": "test_key"}
     # expose real (static) attrs so tests that inspect them still work
     recommender.DEFAULT_MODELS = VisualizationRecommender.DEFAULT_MODELS
@@ -113,6 +121,69 @@ class TestDataFrameHandling:
         for col in sample_dataframe.columns:
             assert col in desc
 
+    def test_profile_memoized_across_calls(self, sample_dataframe):
+        """Test that repeat calls on unchanged data skip profiling"""
+        r = VisualizationRecommender(api_keys={"groq": "x"})
+        r.set_dataframe(sample_dataframe)
+        with patch.object(r.profiler, 'profile', wraps=r.profiler.profile) as profile:
+            first = r._describe_dataframe()
+            r.set_dataframe(sample_dataframe.copy())
+            assert r._describe_dataframe() == first
+            r._build_prompt()
+            assert profile.call_count == 1
+
+            r.set_dataframe(sample_dataframe.assign(extra=1))
+            r._describe_dataframe()
+            assert profile.call_count == 2
+
+    def test_frame_fingerprinted_once_per_request(self, sample_dataframe, llm_dummy_response):
+        """Test that one request computes the DataFrame fingerprint once"""
+        r = VisualizationRecommender(api_keys={"groq": "x"})
+        r.set_dataframe(sample_dataframe)
+        with patch('plotsense.visual_suggestion.suggestions.fingerprint_dataframe',
+                   wraps=fingerprint_dataframe) as fingerprint, \
+                patch.object(VisualizationRecommender, '_query_llm', return_value=llm_dummy_response):
+            r.recommend_visualizations(n=3)
+            assert fingerprint.call_count == 1
+            # The next request fingerprints again, so in-place edits are noticed
+            r.recommend_visualizations(n=3)
+            assert fingerprint.call_count == 2
+
+    def test_set_dataframe_profile_sample(self, sample_dataframe):
+        """Test that sampled profiling still reports the full shape"""
+        r = VisualizationRecommender(api_keys={"groq": "x"})
+        r.set_dataframe(sample_dataframe, profile_sample=20, profile_stratify="category")
+        desc = r._describe_dataframe()
+        assert f"DataFrame Shape: {sample_dataframe.shape}" in desc
+        assert "(~" in desc
+
+    def test_max_prompt_tokens_compacts_wide_frames(self, sample_dataframe):
+        """Test that a token cap compacts only descriptions that do not fit"""
+        r = VisualizationRecommender(api_keys={"groq": "x"}, max_prompt_tokens=100_000)
+        r.set_dataframe(sample_dataframe)
+        assert r._describe_dataframe() == r._format_profile(r._get_profile())
+
+        wide = pd.DataFrame(rng.normal(size=(50, 300)), columns=[f"c{i}" for i in range(300)])
+        r = VisualizationRecommender(api_keys={"groq": "x"}, max_prompt_tokens=2500)
+        r.set_dataframe(wide)
+        prompt = r._build_prompt()
+        assert estimate_tokens(prompt) <= 2500
+        assert "Strongest Numerical Correlations" in prompt
+
+    def test_ties_broken_by_correlation(self, llm_dummy_response):
+        """Test that equally scored pairs are ordered by correlation strength"""
+        n = 100
+        base = rng.normal(size=n)
+        df = pd.DataFrame({"a": base, "b": base + rng.normal(scale=0.1, size=n),
+                           "c": rng.normal(size=n), "d": rng.normal(size=n)})
+        r = VisualizationRecommender(api_keys={"groq": "x"})
+        r.set_dataframe(df)
+        model = r.available_models[0]
+        recs = {model: [{'plot_type': 'scatter', 'variables': 'c, d'},
+                        {'plot_type': 'scatter', 'variables': 'a, b'}]}
+        ranked = r._rank_recommendations(recs, {model: 1.0})
+        assert ranked['variables'].tolist() == ['a, b', 'c, d']
+
 
 class TestPromptGeneration:
     def test_create_prompt_mentions_examples(self, sample_dataframe):
@@ -200,6 +271,23 @@ class TestLLMIntegration:
 
         assert response == "test response"
 
+    def test_query_llm_uses_response_cache(self, tmp_path):
+        """Test that cached responses skip the API call"""
+        cache = ResponseCache(cache_dir=str(tmp_path))
+        r = VisualizationRecommender(api_keys={"groq": "test_key"}, response_cache=cache)
+
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value.choices = [
+            MagicMock(message=MagicMock(content="fresh response"))]
+        r.clients['groq'] = mock_client
+
+        assert r._query_llm("test prompt", "llama-3.3-70b-versatile") == "fresh response"
+        assert r._query_llm("test prompt", "llama-3.3-70b-versatile") == "fresh response"
+
+        mock_client.chat.completions.create.assert_called_once()
+        assert cache.stats()["hits"] == 1
+        cache.close()
+
 
 class TestRecommendationGeneration:
 
@@ -251,6 +339,520 @@ class TestRecommendationGeneration:
         assert recs  # Ensure it's not empty
 
 
+class TestPartialEnsemble:
+    @pytest.fixture
+    def partial_dataframe(self):
+        n = 50
+        return pd.DataFrame({
+            "value": rng.normal(0, 1, n),
+            "count": rng.integers(0, 100, n),
+            "category": rng.choice(list("ABC"), n),
+        })
+
+    def test_deadline_drops_slow_model(self, partial_dataframe, llm_dummy_response):
+        r = VisualizationRecommender(api_keys={"groq": "x"}, model_deadline=0.2)
+        r.set_dataframe(partial_dataframe)
+        fast_model, slow_model = r.available_models
+
+        def fake_query(prompt, model):
+            if model == slow_model:
+                time.sleep(1)
+            return llm_dummy_response
+
+        with patch.object(r, '_query_llm', side_effect=fake_query):
+            start = time.monotonic()
+            result = r.recommend_visualizations(n=2)
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 1
+        assert result.attrs['responded_models'] == [fast_model]
+        assert slow_model in result.attrs['dropped_models']
+        # Weights are renormalized over the responding model
+        assert result.iloc[0]['ensemble_score'] == 1.0
+        assert result.iloc[0]['source_models'] == [fast_model]
+
+    def test_failed_model_keeps_other_results(self, partial_dataframe, llm_dummy_response):
+        r = VisualizationRecommender(api_keys={"groq": "x"})
+        r.set_dataframe(partial_dataframe)
+        good_model, bad_model = r.available_models
+
+        def fake_query(prompt, model):
+            if model == bad_model:
+                raise PlotSenseAPIError("boom")
+            return llm_dummy_response
+
+        with patch.object(r, '_query_llm', side_effect=fake_query):
+            with pytest.warns(UserWarning, match="boom"):
+                result = r.recommend_visualizations(n=2)
+
+        assert len(result) == 2
+        assert result.attrs['dropped_models'] == {bad_model: "boom"}
+
+    def test_quorum_not_met(self, partial_dataframe, llm_dummy_response):
+        r = VisualizationRecommender(api_keys={"groq": "x"}, min_quorum=2)
+        r.set_dataframe(partial_dataframe)
+        bad_model = r.available_models[1]
+
+        def fake_query(prompt, model):
+            if model == bad_model:
+                raise PlotSenseAPIError("boom")
+            return llm_dummy_response
+
+        with patch.object(r, '_query_llm', side_effect=fake_query):
+            with pytest.warns(UserWarning):
+                with pytest.raises(PlotSenseAPIError, match="quorum is 2"):
+                    r.recommend_visualizations(n=2)
+
+
+class TestHeuristicTier:
+    def test_offline_needs_no_key_or_model(self, sample_dataframe):
+        with patch.dict('os.environ', {'GROQ_API_KEY': ''}):
+            r = VisualizationRecommender(interactive=False, offline=True)
+        r.set_dataframe(sample_dataframe)
+        with patch.object(r, '_collect_recommendations') as mock_collect:
+            result = r.recommend_visualizations(n=4)
+        mock_collect.assert_not_called()
+        assert len(result) == 4
+        assert result.iloc[0]['source_models'] == ['heuristic']
+
+    def test_quorum_fallback(self, sample_dataframe):
+        r = VisualizationRecommender(api_keys={"groq": "x"}, heuristic_fallback=True)
+        r.set_dataframe(sample_dataframe)
+        with patch.object(r, '_query_llm', side_effect=PlotSenseAPIError("down")):
+            with pytest.warns(UserWarning, match="Falling back to heuristic"):
+                result = r.recommend_visualizations(n=3)
+        assert len(result) == 3
+        assert set(result.attrs['dropped_models']) == set(r.available_models)
+
+    def test_heuristic_supplement_skips_round_trip(self, sample_dataframe):
+        r = VisualizationRecommender(api_keys={"groq": "x"}, supplement="heuristic")
+        r.set_dataframe(sample_dataframe)
+        response = "Plot Type: hist\nVariables: value\n---"
+        with patch.object(r, '_query_llm', return_value=response) as mock_query:
+            result = r.recommend_visualizations(n=5)
+        assert mock_query.call_count == len(r.available_models)
+        assert len(result) == 5
+        assert result.iloc[0]['variables'] == 'value'
+        assert all(sources == ['heuristic'] for sources in result['source_models'][1:])
+
+    def test_invalid_supplement(self):
+        with pytest.raises(ValueError):
+            VisualizationRecommender(api_keys={"groq": "x"}, supplement="magic")
+
+
+class TestPlotValidation:
+    def test_invalid_suggestions_dropped(self, sample_dataframe):
+        r = VisualizationRecommender(api_keys={"groq": "x"})
+        r.set_dataframe(sample_dataframe)
+        model = r.available_models[0]
+        recs = {model: [{'plot_type': 'pie', 'variables': 'value'},
+                        {'plot_type': 'scatter', 'variables': 'value'},
+                        {'plot_type': 'hist', 'variables': 'value'}]}
+        ranked = r._rank_recommendations(recs, {model: 1.0})
+        assert ranked['plot_type'].tolist() == ['hist']
+
+    def test_validation_can_be_disabled(self, sample_dataframe):
+        r = VisualizationRecommender(api_keys={"groq": "x"}, validate_plots=False)
+        r.set_dataframe(sample_dataframe)
+        model = r.available_models[0]
+        ranked = r._rank_recommendations(
+            {model: [{'plot_type': 'pie', 'variables': 'value'}]}, {model: 1.0})
+        assert len(ranked) == 1
+
+    def test_overrequest(self, sample_dataframe):
+        r = VisualizationRecommender(api_keys={"groq": "x"}, overrequest=2.0)
+        r.set_dataframe(sample_dataframe)
+        r._prepare_request(6)
+        assert r.n_to_request == 12
+        assert "Recommend 12 insightful" in r._build_prompt()
+
+
+class TestEnsembleScoring:
+    @pytest.fixture
+    def recommender(self, sample_dataframe):
+        r = VisualizationRecommender(api_keys={"groq": "x"})
+        r.set_dataframe(sample_dataframe)
+        return r
+
+    def test_scores_summed_per_normalized_key(self, recommender):
+        recs = {
+            "a": [{'plot_type': 'Bar', 'variables': 'category, count'},
+                  {'plot_type': 'hist', 'variables': 'value, missing'}],
+            "b": [{'plot_type': 'bar', 'variables': 'count,category', 'score': 0.5}],
+        }
+        results = recommender._apply_ensemble_scoring(recs, {"a": 0.6, "b": 0.4})
+        assert results['plot_type'].tolist() == ['Bar', 'hist']
+        assert results['variables'].tolist() == ['category, count', 'value']
+        assert results['ensemble_score'].tolist() == [0.8, 0.6]
+        assert results['model_agreement'].tolist() == [2, 1]
+        assert results.loc[0, 'source_models'] == ['a', 'b']
+
+    def test_no_valid_recommendations(self, recommender):
+        results = recommender._apply_ensemble_scoring(
+            {"a": [{'plot_type': 'hist', 'variables': 'missing'}]}, {"a": 1.0})
+        assert results.empty
+        assert list(results.columns) == ['plot_type', 'variables', 'ensemble_score',
+                                         'model_agreement', 'source_models']
+
+    def test_variable_order(self, recommender):
+        recs = pd.DataFrame({'variables': ['category, count', 'flag, category, date', 'value']})
+        corrected = recommender._validate_variable_order(recs)
+        assert corrected['variables'].tolist() == ['count, category', 'date, flag, category', 'value']
+        assert recs['variables'].tolist()[0] == 'category, count'
+
+    def test_variable_ranks_memoized(self, recommender):
+        ranks = recommender._variable_ranks()
+        assert ranks == {'date': 0, 'category': 2, 'value': 1, 'count': 1, 'flag': 1}
+        assert recommender._variable_ranks() is ranks
+
+
+class TestSchemaIndexReuse:
+    RESPONSE = """
+Plot Type: scatter
+Variables: value, count
+---
+Plot Type: hist
+Variables: value
+---
+Plot Type: boxplot
+Variables: value, category
+"""
+
+    def make_frame(self, seed):
+        local = np.random.default_rng(seed)
+        n = 100
+        return pd.DataFrame({
+            "value": local.normal(0, 1, n),
+            "count": local.integers(0, 100, n),
+            "category": local.choice(list("ABC"), n),
+        })
+
+    def test_matching_schema_skips_models(self):
+        index = SchemaIndex()
+        r = VisualizationRecommender(api_keys={"groq": "x"}, schema_index=index)
+        with patch.object(VisualizationRecommender, '_query_llm', return_value=self.RESPONSE) as query:
+            r.set_dataframe(self.make_frame(0))
+            first = r.recommend_visualizations(n=3)
+            calls = query.call_count
+            r.set_dataframe(self.make_frame(1))
+            second = r.recommend_visualizations(n=3)
+        assert query.call_count == calls
+        assert second.attrs['schema_index'] is True
+        assert second['plot_type'].tolist() == first['plot_type'].tolist()
+
+    def test_async_hit_skips_prompt(self):
+        index = SchemaIndex()
+        r = VisualizationRecommender(api_keys={"groq": "x"}, schema_index=index)
+        with patch.object(VisualizationRecommender, '_query_llm', return_value=self.RESPONSE):
+            r.set_dataframe(self.make_frame(0))
+            r.recommend_visualizations(n=3)
+        r.set_dataframe(self.make_frame(1))
+        with patch.object(VisualizationRecommender, '_build_prompt') as build_prompt, \
+                patch.object(VisualizationRecommender, '_aquery_llm') as query:
+            hit = asyncio.run(r.arecommend(n=3))
+        build_prompt.assert_not_called()
+        query.assert_not_called()
+        assert hit.attrs['schema_index'] is True
+
+    def test_too_few_valid_falls_back_to_models(self):
+        index = SchemaIndex()
+        r = VisualizationRecommender(api_keys={"groq": "x"}, schema_index=index)
+        with patch.object(VisualizationRecommender, '_query_llm', return_value=self.RESPONSE) as query:
+            r.set_dataframe(self.make_frame(0))
+            r.recommend_visualizations(n=2)
+            calls = query.call_count
+            r.set_dataframe(self.make_frame(1))
+            r.recommend_visualizations(n=3)
+        assert query.call_count > calls
+
+    def test_background_refresh(self):
+        index = SchemaIndex()
+        r = VisualizationRecommender(api_keys={"groq": "x"}, schema_index=index, schema_refresh=True)
+        with patch.object(VisualizationRecommender, '_query_llm', return_value=self.RESPONSE) as query:
+            r.set_dataframe(self.make_frame(0))
+            r.recommend_visualizations(n=3)
+            calls = query.call_count
+            r.set_dataframe(self.make_frame(1))
+            hit = r.recommend_visualizations(n=3)
+            # The refresh queries the models again on the index's thread
+            deadline = time.monotonic() + 5
+            while query.call_count < 2 * calls and time.monotonic() < deadline:
+                time.sleep(0.01)
+        assert hit.attrs['schema_index'] is True
+        assert query.call_count == 2 * calls
+
+
+class TestDeltaMode:
+    BASE = """
+Plot Type: scatter
+Variables: value, count
+---
+Plot Type: hist
+Variables: value
+---
+Plot Type: boxplot
+Variables: value, category
+"""
+    DELTA = """
+Plot Type: scatter
+Variables: ratio, value
+---
+Plot Type: hist
+Variables: count
+"""
+
+    @pytest.fixture
+    def recommender(self, sample_dataframe):
+        r = VisualizationRecommender(api_keys={"groq": "x"})
+        r.set_dataframe(sample_dataframe)
+        return r
+
+    def query(self, prompts):
+        def fake(self, prompt, model):
+            prompts.append(prompt)
+            return TestDeltaMode.DELTA if "gained these columns" in prompt else TestDeltaMode.BASE
+        return patch.object(VisualizationRecommender, '_query_llm', autospec=True, side_effect=fake)
+
+    def test_new_column_asks_only_about_it(self, recommender, sample_dataframe):
+        prompts = []
+        with self.query(prompts):
+            first = recommender.recommend_visualizations(n=3, delta=True)
+            recommender.set_dataframe(sample_dataframe.assign(ratio=sample_dataframe["value"] * 2))
+            with patch.object(recommender.profiler, 'profile', side_effect=AssertionError("full profile")):
+                merged = recommender.recommend_visualizations(n=3, delta=True)
+
+        delta_prompt = prompts[-1]
+        assert "- ratio: numerical" in delta_prompt
+        assert "- value: numerical" not in delta_prompt
+        assert "at least one of the new columns: ratio" in delta_prompt
+        assert merged.attrs['delta_columns'] == ['ratio']
+        # The new column's suggestion makes the top n on a score tie; the rest
+        # are the previous results, and the delta-only "hist of count" is not added
+        assert (first['ensemble_score'] == merged['ensemble_score'].max()).all()
+        assert merged['variables'].tolist() == ['ratio, value'] + first['variables'].tolist()[:2]
+
+    def test_unchanged_frame_reuses_results(self, recommender, sample_dataframe):
+        prompts = []
+        with self.query(prompts):
+            first = recommender.recommend_visualizations(n=3, delta=True)
+            calls = len(prompts)
+            again = recommender.recommend_visualizations(n=3, delta=True)
+        assert len(prompts) == calls
+        assert again['variables'].tolist() == first['variables'].tolist()
+
+    def test_dropped_column_removes_its_suggestions(self, recommender, sample_dataframe):
+        prompts = []
+        with self.query(prompts):
+            recommender.recommend_visualizations(n=3, delta=True)
+            recommender.set_dataframe(sample_dataframe.drop(columns=["count"]))
+            results = recommender.recommend_visualizations(n=2, delta=True)
+        assert all("count" not in v for v in results['variables'])
+
+    def test_changed_rows_run_full_request(self, recommender, sample_dataframe):
+        prompts = []
+        with self.query(prompts):
+            recommender.recommend_visualizations(n=3, delta=True)
+            recommender.set_dataframe(sample_dataframe.iloc[:50])
+            results = recommender.recommend_visualizations(n=3, delta=True)
+        assert "gained these columns" not in prompts[-1]
+        assert 'delta_columns' not in results.attrs
+
+
+class TestJsonOutput:
+    def test_json_prompt_and_params(self, sample_dataframe):
+        r = VisualizationRecommender(api_keys={"groq": "x"}, output_format="json")
+        r.set_dataframe(sample_dataframe)
+        r._prepare_request(4)
+        prompt = r._build_prompt()
+        assert "JSON" in prompt
+        assert "Plot Type:" not in prompt
+        params = r._generation_params()
+        assert params['response_format'] == {"type": "json_object"}
+        assert params['max_tokens'] < r.MAX_TOKENS
+
+        text = VisualizationRecommender(api_keys={"groq": "x"})
+        text.set_dataframe(sample_dataframe)
+        text._prepare_request(4)
+        assert 'response_format' not in text._generation_params()
+        assert text._build_prompt() != prompt
+
+    def test_invalid_output_format(self):
+        with pytest.raises(ValueError):
+            VisualizationRecommender(api_keys={"groq": "x"}, output_format="xml")
+
+    def test_json_response_parsed(self, mock_recommender):
+        response = ('{"recommendations": [{"plot_type": "scatter", '
+                    '"variables": ["value", "count", "unknown"], "rationale": "r"}]}')
+        recs = VisualizationRecommender._parse_recommendations(mock_recommender, response, "m")
+        assert recs == [{'source_model': 'm', 'plot_type': 'scatter', 'variables': 'value, count'}]
+
+    def test_invalid_json_falls_back_to_text(self, mock_recommender, llm_dummy_response):
+        response = "{oops\n" + llm_dummy_response
+        recs = VisualizationRecommender._parse_recommendations(mock_recommender, response, "m")
+        assert len(recs) == len(
+            VisualizationRecommender._parse_recommendations(mock_recommender, llm_dummy_response, "m"))
+
+    def test_text_with_braces_and_brackets_parsed_as_text(self, mock_recommender, llm_dummy_response):
+        response = "Group by {value} and bin into [1, 2] ranges.\n" + llm_dummy_response
+        recs = VisualizationRecommender._parse_recommendations(mock_recommender, response, "m")
+        assert len(recs) == len(
+            VisualizationRecommender._parse_recommendations(mock_recommender, llm_dummy_response, "m"))
+        assert recs
+
+
+class TestHedging:
+    @pytest.fixture
+    def hedge_dataframe(self):
+        n = 50
+        return pd.DataFrame({
+            "value": rng.normal(0, 1, n),
+            "count": rng.integers(0, 100, n),
+            "category": rng.choice(list("ABC"), n),
+        })
+
+    def test_hedge_beats_slow_primary(self, hedge_dataframe, llm_dummy_response):
+        r = VisualizationRecommender(api_keys={"groq": "x"}, hedge=True, hedge_delay=0.1)
+        r.set_dataframe(hedge_dataframe)
+        slow_model = r.available_models[0]
+        calls = []
+
+        def fake_query(prompt, model):
+            calls.append(model)
+            # Only the first request to the slow model stalls
+            if model == slow_model and calls.count(model) == 1:
+                time.sleep(1)
+            return llm_dummy_response
+
+        with patch.object(r, '_query_llm', side_effect=fake_query):
+            start = time.monotonic()
+            responses, dropped = r._collect_recommendations("prompt")
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 1
+        assert calls.count(slow_model) == 2
+        assert dropped == {}
+        assert all(responses[m] for m in r.available_models)
+
+    def test_no_hedge_when_disabled(self, hedge_dataframe, llm_dummy_response):
+        r = VisualizationRecommender(api_keys={"groq": "x"}, hedge_delay=0.01)
+        r.set_dataframe(hedge_dataframe)
+
+        def fake_query(prompt, model):
+            time.sleep(0.05)
+            return llm_dummy_response
+
+        with patch.object(r, '_query_llm', side_effect=fake_query) as mock_query:
+            r._collect_recommendations("prompt")
+
+        assert mock_query.call_count == len(r.available_models)
+
+    def test_alternate_hedge_not_credited_to_slow_model(self, hedge_dataframe, llm_dummy_response):
+        r = VisualizationRecommender(api_keys={"groq": "x"}, hedge=True, hedge_delay=0.1,
+                                     hedge_alternate=True)
+        r.set_dataframe(hedge_dataframe)
+        slow_model, other_model = r.available_models
+
+        async def fake_query(self, prompt, model):
+            if model == slow_model:
+                await asyncio.sleep(1)
+            return llm_dummy_response
+
+        with patch.object(VisualizationRecommender, '_aquery_llm', new=fake_query):
+            responses, dropped = asyncio.run(r._acollect_recommendations("prompt"))
+
+        # The other model had already answered, so the hedge adds nothing
+        # and the slow model is not waited for
+        assert list(responses) == [other_model]
+        assert {rec['source_model'] for rec in responses[other_model]} == {other_model}
+        assert dropped == {slow_model: f"replaced by a hedge to {other_model}"}
+
+    def test_latency_recorded_on_network_calls(self, hedge_dataframe):
+        r = VisualizationRecommender(api_keys={"groq": "x"})
+        model = r.available_models[0]
+        with patch.object(r.clients['groq'].chat.completions, 'create') as mock_create:
+            mock_create.return_value.choices = [MagicMock(message=MagicMock(content="Plot type: bar"))]
+            r._query_llm("prompt", model)
+        assert r.latency.count(model) == 1
+
+
+class TestAsyncRecommendations:
+    @pytest.fixture
+    def async_dataframe(self):
+        n = 50
+        return pd.DataFrame({
+            "value": rng.normal(0, 1, n),
+            "count": rng.integers(0, 100, n),
+            "category": rng.choice(list("ABC"), n),
+        })
+
+    def test_arecommend(self, async_dataframe, llm_dummy_response):
+        r = VisualizationRecommender(api_keys={"groq": "x"})
+        r.set_dataframe(async_dataframe)
+
+        with patch.object(VisualizationRecommender, '_aquery_llm',
+                          new=AsyncMock(return_value=llm_dummy_response)) as mock_query:
+            result = asyncio.run(r.arecommend(n=2))
+
+        assert mock_query.await_count == len(r.available_models)
+        assert list(result.columns) == [
+            'plot_type', 'variables', 'ensemble_score', 'model_agreement', 'source_models']
+        assert len(result) == 2
+        assert result.iloc[0]['model_agreement'] == len(r.available_models)
+
+    def test_arecommend_model_timeout(self, async_dataframe, llm_dummy_response):
+        r = VisualizationRecommender(api_keys={"groq": "x"}, timeout=0.05)
+        r.set_dataframe(async_dataframe)
+        slow_model = r.available_models[0]
+
+        async def fake_query(self, prompt, model):
+            if model == slow_model:
+                await asyncio.sleep(1)
+            return llm_dummy_response
+
+        with patch.object(VisualizationRecommender, '_aquery_llm', new=fake_query):
+            with pytest.warns(UserWarning, match=f"Error processing models {slow_model}"):
+                all_recs = asyncio.run(r._aget_all_recommendations())
+
+        assert all_recs[slow_model] == []
+        assert all(all_recs[m] for m in r.available_models if m != slow_model)
+
+    def test_arecommender_concurrent_frames(self, async_dataframe, llm_dummy_response):
+        from plotsense.visual_suggestion import suggestions
+
+        other = async_dataframe.rename(columns={"value": "amount"})
+
+        async def run_both():
+            return await asyncio.gather(
+                suggestions.arecommender(async_dataframe, n=1, api_keys={"groq": "x"}),
+                suggestions.arecommender(other, n=1, api_keys={"groq": "x"}),
+            )
+
+        with patch.object(suggestions, '_recommender_instance', None), \
+                patch.object(VisualizationRecommender, '_aquery_llm',
+                             new=AsyncMock(return_value=llm_dummy_response)):
+            first, second = asyncio.run(run_both())
+
+        assert "value" in first.iloc[0]['variables']
+        assert "value" not in second.iloc[0]['variables']
+
+
+class TestSharedInstance:
+    def test_response_cache_true_keeps_attached_cache(self):
+        from plotsense.visual_suggestion import suggestions
+
+        with patch.object(suggestions, '_recommender_instance', None), \
+                patch.object(suggestions, 'ResponseCache') as cache_class:
+            instance = suggestions._get_recommender_instance({"groq": "x"}, False, True)
+            attached = instance.response_cache
+            assert suggestions._get_recommender_instance({"groq": "x"}, False, True).response_cache is attached
+            assert cache_class.call_count == 1
+
+            other = MagicMock(spec=ResponseCache)
+            assert suggestions._get_recommender_instance({"groq": "x"}, False, other).response_cache is other
+            assert suggestions._get_recommender_instance({"groq": "x"}, False, None).response_cache is other
+            assert suggestions._get_recommender_instance({"groq": "x"}, False, False).response_cache is None
+
+
 class TestErrorHandling:
     def test_no_dataframe_error(self, mock_recommender):
         """Test error when no DataFrame is set"""
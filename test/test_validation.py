@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# SUT
+from plotsense.visual_suggestion.profiling import DataFrameProfiler
+from plotsense.visual_suggestion.validation import PlotSpecValidator
+
+
+@pytest.fixture
+def validator():
+    n = 200
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "date": pd.date_range("2020-01-01", periods=n),
+        "category": rng.choice(list("ABC"), n),
+        "value": rng.normal(size=n),
+        "count": rng.integers(0, 1000, n),
+        "flag": rng.choice([0, 1], n),
+        "text": [f"note {i}" for i in range(n)],
+    })
+    return PlotSpecValidator.from_profile(DataFrameProfiler().profile(df))
+
+
+class TestPlotSpecValidator:
+    @pytest.mark.parametrize("plot_type, variables", [
+        ("bar", ["value", "category"]),
+        ("bar", ["category", "value"]),
+        ("scatter", ["value", "count"]),
+        ("hist", ["value"]),
+        ("boxplot", ["value"]),
+        ("boxplot", ["value", "flag"]),
+        ("pie", ["category"]),
+        ("pie", ["flag"]),
+        ("line", ["date", "value"]),
+        ("heatmap", ["value", "category", "flag"]),
+        ("pairplot", ["value", "count", "flag"]),
+        ("Scatter", [" value", "count "]),
+    ])
+    def test_valid(self, validator, plot_type, variables):
+        assert validator.validate(plot_type, variables) is None
+
+    @pytest.mark.parametrize("plot_type, variables, reason", [
+        ("pie", ["value"], "pie needs categorical"),
+        ("scatter", ["value"], "scatter needs"),
+        ("scatter", ["value", "category"], "scatter needs"),
+        ("hist", ["text"], "hist needs"),
+        ("bar", ["value", "missing"], "unknown columns"),
+        ("scatter", ["value", "value"], "repeated"),
+        ("line", ["date", "category"], "line needs"),
+    ])
+    def test_invalid(self, validator, plot_type, variables, reason):
+        assert reason in validator.validate(plot_type, variables)
+
+    def test_unknown_plot_types(self, validator):
+        assert validator.is_valid("violin3d", ["value"])
+        strict = PlotSpecValidator(validator.roles, allow_unknown=False)
+        assert not strict.is_valid("violin3d", ["value"])
+
+    def test_filter(self, validator):
+        valid, rejected = validator.filter([
+            {'plot_type': 'hist', 'variables': 'value'},
+            {'plot_type': 'pie', 'variables': 'value'},
+        ])
+        assert valid == [{'plot_type': 'hist', 'variables': 'value'}]
+        assert rejected[0][0]['plot_type'] == 'pie'